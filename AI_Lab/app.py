@@ -1,7 +1,11 @@
-from flask import Flask, render_template, request, jsonify
-import pandas as pd
+from flask import Flask, Request, Response, render_template, request, jsonify, stream_with_context
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 import io
+import json
 import logging
+import os
+import threading
+import time
 from pathlib import Path
 
 # Configure Flask Logging
@@ -9,111 +13,491 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Import backend modules
-from src.reader import read_resume
-from src.ats import ats_score
-from src.skills import category_score
+from src.reader import normalize_text, read_resume, PDF_BACKENDS
+from src.engine import ScoringEngine
 from src.improve import improve_resume
+from src.taxonomy import get_taxonomy, taxonomy_report
+from src.jd_cache import jd_cache_stats
+from src.text_cache import get_text_cache
+from src.ocr import get_ocr_engine
+from src.jobs import JobQueue, JobStore
+from src.upload import SpooledUpload, iter_zip_uploads
+from src.corpus import get_corpus
+from src.skill_index import QueryError, get_skill_index
+from src.skills import extract_skills
+from src.text_analysis import analyze_text
+import src.metrics as metrics
+
+# Batch requests carry many resumes; each file is still held to 16MB
+BATCH_MAX_CONTENT_LENGTH = int(float(os.environ.get('BATCH_MAX_CONTENT_MB', '256')) * 1024 * 1024)
+BATCH_MAX_FILES = int(os.environ.get('BATCH_MAX_FILES', '1000'))
+BATCH_WORKERS = int(os.environ.get('BATCH_WORKERS', '4'))
+
+class AppRequest(Request):
+    """Allows larger bodies on the multi-file routes only"""
+    @property
+    def max_content_length(self):
+        if self.path in ('/analyze_batch', '/corpus/resumes'):
+            return BATCH_MAX_CONTENT_LENGTH
+        return super().max_content_length
 
 app = Flask(__name__)
+app.request_class = AppRequest
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
 
-# Load skills database once at startup
-try:
-    skills_db = pd.read_csv("datasets/skills_master.csv")
-    logger.info("Skills database loaded successfully.")
-except Exception as e:
-    logger.error(f"Failed to load skills database: {e}")
-    # Create a dummy DF to prevent crash, but log error
-    skills_db = pd.DataFrame(columns=['skill', 'category'])
+# Readiness requires OCR unless explicitly turned off (e.g. text-only deployments)
+READY_REQUIRES_OCR = os.environ.get('READY_REQUIRES_OCR', '1').lower() not in ('0', 'false', 'no', 'off')
+
+# Probe Tesseract once per worker at startup instead of on every upload.
+# The probe runs `tesseract --version` in a subprocess (no pytesseract or
+# pandas import) off the start-up path; text-only deployments probe lazily
+# on their first scan.
+# OCR_PROBE_AT_STARTUP=0 skips it for tools that only import the app (benchmarks)
+OCR_PROBE_AT_STARTUP = os.environ.get('OCR_PROBE_AT_STARTUP', '1').lower() not in ('0', 'false', 'no', 'off')
+ocr_engine = get_ocr_engine()
+if READY_REQUIRES_OCR and OCR_PROBE_AT_STARTUP:
+    threading.Thread(target=ocr_engine.available, name='ocr-probe', daemon=True).start()
+
+# Build the scoring taxonomy (skills, categories, weights, equivalents) once;
+# it reloads itself when the CSV files change. The scoring engine reads every
+# category's skills from it, so no skills DataFrame (or pandas) is loaded
+taxonomy = get_taxonomy()
+logger.info(f"Skill taxonomy version {taxonomy.version} ready.")
 
 @app.route('/')
 def index():
     """Render the main page"""
     return render_template('index.html')
 
+@app.route('/healthz')
+def healthz():
+    """Liveness: the worker is up and serving requests"""
+    return jsonify({'status': 'ok'})
+
+@app.route('/readyz')
+def readyz():
+    """Readiness: taxonomy loaded and OCR capable, so scanned uploads can be served"""
+    ocr_ready = ocr_engine.available()
+    taxonomy_ready = bool(get_taxonomy().categories)
+    ready = taxonomy_ready and (ocr_ready or not READY_REQUIRES_OCR)
+    body = {
+        'status': 'ready' if ready else 'unavailable',
+        'taxonomy': taxonomy_ready,
+        'ocr': ocr_engine.status(),
+    }
+    return jsonify(body), 200 if ready else 503
+
+@app.route('/taxonomy')
+def taxonomy_info():
+    """Report taxonomy version, reload timings and skill hit rates"""
+    return jsonify(taxonomy_report())
+
+@app.route('/metrics')
+def prometheus_metrics():
+    """Stage latency histograms and OCR / file type / error counters (Prometheus text format)"""
+    return Response(metrics.render_prometheus(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/cache/stats')
+def cache_stats():
+    """Report hit/miss/eviction counters of the in-process caches"""
+    text_cache = get_text_cache()
+    return jsonify({
+        'jd_profiles': jd_cache_stats(),
+        'resume_text': text_cache.stats() if text_cache else None,
+    })
+
+def run_analysis(resume_file, jd_text, pdf_backend=None):
+    """
+    Full analysis of one resume against one job description.
+    Shared by /analyze and the background job workers; always returns a
+    valid result dict.
+    """
+    # Validate minimum length for job description (non-blocking warning)
+    warnings = []
+    if len(jd_text.strip()) < 200:
+        warnings.append(f'Job description is short ({len(jd_text.strip())} chars). For best results, provide at least 200 characters.')
+    
+    logger.info(f"Analyzing resume: {resume_file.filename}")
+    started = time.perf_counter()
+    metrics.FILES_ANALYZED.inc(metrics.file_type(resume_file.filename))
+    
+    resume_text = ""
+
+    # 1. Read resume (Robust parsing - NEVER blocks)
+    try:
+        with metrics.stage('read'):
+            resume_text, warning_msg = read_resume(resume_file, pdf_backend=pdf_backend)
+        if warning_msg:
+            warnings.append(warning_msg)
+            
+        # NEVER block analysis - even if text is empty or OCR unavailable
+        # The scoring functions will handle empty/short text gracefully
+        if not resume_text:
+            logger.warning("Resume text extraction returned empty - continuing with analysis")
+            resume_text = ""  # Empty string is fine, scoring will handle it
+            if not any('text' in w.lower() for w in warnings):
+                warnings.append("Could not extract text from resume. Results may be limited.")
+            
+    except Exception as e:
+        logger.error(f"Resume parsing error: {e}", exc_info=True)
+        metrics.ERRORS.inc('read')
+        warnings.append(f"Resume parsing encountered issues: {str(e)}. Results may be incomplete.")
+        resume_text = ""  # Continue with empty text - don't block
+    
+    # Normalize, tokenize and scan the resume once; one engine derives every
+    # score below from the same skill evidence (see src/engine.py)
+    scoring = ScoringEngine(analyze_text(resume_text), jd_text.lower())
+    try:
+        with metrics.stage('analysis'):
+            scoring.analyze()
+    except Exception as e:
+        # Each score below redoes what it needs and handles its own failure
+        logger.error(f"Resume analysis error: {e}", exc_info=True)
+        metrics.ERRORS.inc('analysis')
+    
+    # 2. Calculate ATS score (always returns valid score, never 0% incorrectly)
+    try:
+        with metrics.stage('ats'):
+            score = scoring.ats_score()
+    except Exception as e:
+        logger.error(f"ATS scoring error: {e}", exc_info=True)
+        metrics.ERRORS.inc('ats')
+        score = 15.0  # Baseline score instead of failing
+        warnings.append("ATS scoring encountered issues. Score may be approximate.")
+    
+    # 3. Calculate category scores & skills (always returns valid results)
+    try:
+        with metrics.stage('categories'):
+            cat_scores, matched_skills, missing_skills = scoring.category_scores()
+    except Exception as e:
+        logger.error(f"Category scoring error: {e}", exc_info=True)
+        metrics.ERRORS.inc('categories')
+        # Return default values instead of failing
+        cat_scores = {'AI': 0, 'Data': 0, 'Cloud': 0, 'Programming': 0, 'Tools': 0, 'Web': 0}
+        matched_skills = []
+        missing_skills = []
+        warnings.append("Category scoring encountered issues. Results may be incomplete.")
+    
+    # 4. Generate suggestions (always returns valid list)
+    try:
+        with metrics.stage('suggestions'):
+            suggestions = improve_resume(missing_skills)
+    except Exception as e:
+        logger.error(f"Suggestion generation error: {e}", exc_info=True)
+        metrics.ERRORS.inc('suggestions')
+        suggestions = []
+        warnings.append("Could not generate suggestions. Please try again.")
+    
+    metrics.observe('total', time.perf_counter() - started)
+    # Log success
+    logger.info(f"Analysis complete. Score: {score}%, Warnings: {len(warnings)}")
+    
+    return {
+        'success': True,
+        'ats_score': score,
+        'category_scores': cat_scores,
+        'matched_skills': matched_skills,
+        'missing_skills': missing_skills,
+        'suggestions': suggestions,
+        'warnings': warnings
+    }
+
+def _analysis_request():
+    """
+    Read and validate the resume_file / jd_text / pdf_backend form fields.
+    Returns (resume_file, jd_text, pdf_backend, error_response).
+    """
+    resume_file = request.files.get('resume_file')
+    jd_text = request.form.get('jd_text', '')
+    # Optional PDF text backend: 'pymupdf' (fast, default) or 'pdfplumber' (high fidelity)
+    pdf_backend = request.form.get('pdf_backend') or None
+    
+    if not resume_file or not jd_text:
+        return None, None, None, (jsonify({'error': 'Missing resume file or job description'}), 400)
+    if pdf_backend and pdf_backend.lower() not in PDF_BACKENDS:
+        return None, None, None, (jsonify({'error': f"Unknown pdf_backend '{pdf_backend}'. Choose one of: {', '.join(PDF_BACKENDS)}"}), 400)
+    return resume_file, jd_text, pdf_backend, None
+
 @app.route('/analyze', methods=['POST'])
 def analyze():
     """Handle resume analysis"""
     try:
-        # Get uploaded file
-        resume_file = request.files.get('resume_file')
-        jd_text = request.form.get('jd_text', '')
+        resume_file, jd_text, pdf_backend, error = _analysis_request()
+        if error:
+            return error
         
-        if not resume_file or not jd_text:
-            return jsonify({'error': 'Missing resume file or job description'}), 400
-        
-        # Validate minimum length for job description (non-blocking warning)
-        warnings = []
-        if len(jd_text.strip()) < 200:
-            warnings.append(f'Job description is short ({len(jd_text.strip())} chars). For best results, provide at least 200 characters.')
-        
-        logger.info(f"Analyzing resume: {resume_file.filename}")
+        # ALWAYS return valid JSON response - never fail
+        with metrics.collect() as timings:
+            response = jsonify(run_analysis(resume_file, jd_text, pdf_backend))
+        # Per-stage durations for browser devtools and proxies
+        response.headers['Server-Timing'] = metrics.server_timing(timings)
+        return response
         
-        resume_text = ""
+    except Exception as e:
+        logger.error(f"Unexpected error in /analyze: {e}", exc_info=True)
+        metrics.ERRORS.inc('request')
+        return jsonify({'error': 'An internal server error occurred. Please try again.'}), 500
 
-        # 1. Read resume (Robust parsing - NEVER blocks)
-        try:
-            resume_text, warning_msg = read_resume(resume_file)
-            if warning_msg:
-                warnings.append(warning_msg)
-                
-            # NEVER block analysis - even if text is empty or OCR unavailable
-            # The scoring functions will handle empty/short text gracefully
-            if not resume_text:
-                logger.warning("Resume text extraction returned empty - continuing with analysis")
-                resume_text = ""  # Empty string is fine, scoring will handle it
-                if not any('text' in w.lower() for w in warnings):
-                    warnings.append("Could not extract text from resume. Results may be limited.")
-                
-        except Exception as e:
-            logger.error(f"Resume parsing error: {e}", exc_info=True)
-            warnings.append(f"Resume parsing encountered issues: {str(e)}. Results may be incomplete.")
-            resume_text = ""  # Continue with empty text - don't block
-        
-        # 2. Calculate ATS score (always returns valid score, never 0% incorrectly)
+# ========== BATCH ANALYSIS ==========
+# Shared by all batch requests so concurrent batches cannot oversubscribe the worker
+batch_executor = ThreadPoolExecutor(max_workers=BATCH_WORKERS, thread_name_prefix='batch')
+
+def _iter_batch_uploads(files):
+    """
+    Yield (filename, SpooledUpload or None, error) for every uploaded
+    resume, expanding zip archives member by member.
+    """
+    count = 0
+    for storage in files:
+        name = storage.filename or ''
+        if name.lower().endswith('.zip'):
+            try:
+                for item in iter_zip_uploads(storage, BATCH_MAX_FILES - count, app.config['MAX_CONTENT_LENGTH']):
+                    count += 1
+                    yield item
+            except Exception as e:
+                logger.error(f"Could not read archive {name}: {e}")
+                yield name, None, f"Could not read zip archive: {e}"
+            continue
+        count += 1
+        if count > BATCH_MAX_FILES:
+            yield name, None, f"Batch has more than {BATCH_MAX_FILES} files"
+            return
+        yield name, SpooledUpload(storage), None
+
+def _analyze_spooled(upload, jd_text, pdf_backend):
+    try:
+        return run_analysis(upload, jd_text, pdf_backend)
+    finally:
+        upload.close()
+
+@app.route('/analyze_batch', methods=['POST'])
+def analyze_batch():
+    """
+    Score many resumes (files and/or zip archives in resume_files) against
+    one jd_text. Streams one JSON line per resume, in completion order,
+    with the /analyze result shape plus filename and index.
+    """
+    files = request.files.getlist('resume_files') + request.files.getlist('resume_file')
+    jd_text = request.form.get('jd_text', '')
+    pdf_backend = request.form.get('pdf_backend') or None
+    
+    if not files or not jd_text:
+        return jsonify({'error': 'Missing resume files or job description'}), 400
+    if pdf_backend and pdf_backend.lower() not in PDF_BACKENDS:
+        return jsonify({'error': f"Unknown pdf_backend '{pdf_backend}'. Choose one of: {', '.join(PDF_BACKENDS)}"}), 400
+    
+    def line(index, filename, result):
+        return json.dumps({'index': index, 'filename': filename, **result}) + '\n'
+    
+    def generate():
+        # At most 2 x BATCH_WORKERS resumes are spooled or in flight at once
+        window = 2 * BATCH_WORKERS
+        pending = {}
+        uploads = _iter_batch_uploads(files)
         try:
-            score = ats_score(resume_text, jd_text.lower())
-        except Exception as e:
-            logger.error(f"ATS scoring error: {e}", exc_info=True)
-            score = 15.0  # Baseline score instead of failing
-            warnings.append("ATS scoring encountered issues. Score may be approximate.")
-        
-        # 3. Calculate category scores & skills (always returns valid results)
+            for index, (filename, upload, error) in enumerate(uploads):
+                if error:
+                    yield line(index, filename, {'success': False, 'error': error})
+                    continue
+                future = batch_executor.submit(_analyze_spooled, upload, jd_text, pdf_backend)
+                pending[future] = (index, filename)
+                while len(pending) >= window:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield _batch_line(line, future, *pending.pop(future))
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield _batch_line(line, future, *pending.pop(future))
+        finally:
+            uploads.close()
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+def _batch_line(line, future, index, filename):
+    try:
+        return line(index, filename, future.result())
+    except Exception as e:
+        logger.error(f"Batch analysis of {filename} failed: {e}", exc_info=True)
+        return line(index, filename, {'success': False, 'error': 'Analysis failed for this file.'})
+
+# ========== RESUME CORPUS & RANKING ==========
+@app.route('/corpus/resumes', methods=['POST'])
+def add_corpus_resumes():
+    """
+    Extract and store resumes (resume_files, zip archives allowed) in the
+    ranking corpus. A single upload may carry its own resume_id.
+    """
+    files = request.files.getlist('resume_files') + request.files.getlist('resume_file')
+    if not files:
+        return jsonify({'error': 'Missing resume files'}), 400
+    resume_id = request.form.get('resume_id') or None
+    if resume_id and len(files) > 1:
+        return jsonify({'error': 'resume_id can only be given for a single file'}), 400
+    
+    corpus = get_corpus()
+    added = []
+    for filename, upload, error in _iter_batch_uploads(files):
+        if error:
+            added.append({'filename': filename, 'success': False, 'error': error})
+            continue
         try:
-            cat_scores, matched_skills, missing_skills = category_score(resume_text, jd_text.lower(), skills_db)
+            text, warning = read_resume(upload)
         except Exception as e:
-            logger.error(f"Category scoring error: {e}", exc_info=True)
-            # Return default values instead of failing
-            cat_scores = {'AI': 0, 'Data': 0, 'Cloud': 0, 'Programming': 0, 'Tools': 0, 'Web': 0}
-            matched_skills = []
-            missing_skills = []
-            warnings.append("Category scoring encountered issues. Results may be incomplete.")
-        
-        # 4. Generate suggestions (always returns valid list)
+            logger.error(f"Could not read {filename} for the corpus: {e}", exc_info=True)
+            added.append({'filename': filename, 'success': False, 'error': 'Could not extract text.'})
+            continue
+        finally:
+            upload.close()
+        if not text:
+            added.append({'filename': filename, 'success': False, 'error': warning or 'No text extracted.'})
+            continue
+        row_id = corpus.add(text, filename, resume_id)
+        skills = get_skill_index().index_text(row_id, text)
+        added.append({'filename': filename, 'success': True, 'id': row_id, 'chars': len(text),
+                      'skills': len(skills), 'warning': warning})
+    return jsonify({'resumes': added, 'corpus_size': len(corpus)})
+
+@app.route('/rank', methods=['POST'])
+def rank_resumes():
+    """Top-k stored resumes for jd_text (form or JSON), scored like /analyze"""
+    data = request.get_json(silent=True) or request.form
+    jd_text = data.get('jd_text', '')
+    if not jd_text:
+        return jsonify({'error': 'Missing job description'}), 400
+    try:
+        k = max(1, min(100, int(data.get('k', 10))))
+    except (TypeError, ValueError):
+        return jsonify({'error': 'k must be an integer'}), 400
+    
+    corpus = get_corpus()
+    candidates = corpus.rank(jd_text, k)
+    return jsonify({'candidates': candidates, 'corpus_size': len(corpus)})
+
+# ========== SKILL SEARCH ==========
+@app.route('/extract_skills', methods=['POST'])
+def extract_resume_skills():
+    """
+    Light path: extract a resume's taxonomy skills without scoring it.
+    Takes resume_file (or resume_text); unless index=0 the resume is also
+    stored in the corpus and the skill index so it is searchable.
+    """
+    resume_file = request.files.get('resume_file')
+    warning = None
+    if resume_file:
+        filename = resume_file.filename or ''
         try:
-            suggestions = improve_resume(missing_skills)
+            text, warning = read_resume(resume_file)
         except Exception as e:
-            logger.error(f"Suggestion generation error: {e}", exc_info=True)
-            suggestions = []
-            warnings.append("Could not generate suggestions. Please try again.")
-        
-        # Log success
-        logger.info(f"Analysis complete. Score: {score}%, Warnings: {len(warnings)}")
+            logger.error(f"Skill extraction could not read {filename}: {e}", exc_info=True)
+            return jsonify({'error': 'Could not extract text from resume.'}), 422
+    else:
+        filename = ''
+        # Normalized like extracted files, so both inputs store the same document
+        text = normalize_text(request.form.get('resume_text', ''))
+    if not text:
+        return jsonify({'error': warning or 'Missing resume file or text'}), 400
+    
+    body = {'filename': filename, 'warning': warning}
+    if request.form.get('index', '1').lower() in ('0', 'false', 'no', 'off'):
+        body['skills'] = extract_skills(text)
+    else:
+        row_id = get_corpus().add(text, filename, request.form.get('resume_id') or None)
+        body['skills'] = get_skill_index().index_text(row_id, text)
+        body['id'] = row_id
+    return jsonify(body)
+
+@app.route('/skills/search')
+def search_skills():
+    """
+    Boolean skill search over indexed resumes, e.g.
+    q=pytorch AND (aws OR gcp) NOT junior
+    """
+    query = request.args.get('q', '')
+    try:
+        limit = max(0, min(1000, int(request.args.get('limit', 50))))
+    except ValueError:
+        return jsonify({'error': 'limit must be an integer'}), 400
+    
+    start = time.perf_counter()
+    try:
+        ids = get_skill_index().search(query)
+    except QueryError as e:
+        return jsonify({'error': str(e)}), 400
+    took_ms = round((time.perf_counter() - start) * 1000, 3)
+    
+    found = get_corpus().get(ids[:limit].tolist())
+    resumes = [
+        {'id': int(i), 'resume_id': found[i][0], 'filename': found[i][1]}
+        for i in ids[:limit].tolist() if i in found
+    ]
+    return jsonify({'query': query, 'count': int(len(ids)), 'resumes': resumes, 'took_ms': took_ms})
+
+# ========== ASYNC ANALYSIS JOBS ==========
+def _run_job(filename, payload, params):
+    """Job handler: replay a stored upload through run_analysis"""
+    resume_file = io.BytesIO(payload)
+    resume_file.filename = filename
+    return run_analysis(resume_file, params['jd_text'], params.get('pdf_backend'))
+
+# The store and its worker threads start on first /jobs use, so importing the
+# app (tests, benchmarks, the debug reloader) leaves no threads or files behind
+_job_queue = None
+_job_queue_lock = threading.Lock()
+
+def get_job_queue():
+    """This process's job queue, started on first use"""
+    global _job_queue
+    if _job_queue is None:
+        with _job_queue_lock:
+            if _job_queue is None:
+                queue = JobQueue(JobStore(), _run_job)
+                queue.start()
+                _job_queue = queue
+    return _job_queue
+
+@app.route('/jobs', methods=['POST'])
+def submit_job():
+    """Queue a resume analysis and return its id right away"""
+    try:
+        resume_file, jd_text, pdf_backend, error = _analysis_request()
+        if error:
+            return error
         
-        # ALWAYS return valid JSON response - never fail
-        return jsonify({
-            'success': True,
-            'ats_score': score,
-            'category_scores': cat_scores,
-            'matched_skills': matched_skills,
-            'missing_skills': missing_skills,
-            'suggestions': suggestions,
-            'warnings': warnings
-        })
+        job_queue = get_job_queue()
+        job_id = job_queue.store.submit(
+            resume_file.filename or '',
+            resume_file.read(),
+            {'jd_text': jd_text, 'pdf_backend': pdf_backend},
+        )
+        job_queue.notify()
+        logger.info(f"Queued analysis job {job_id} for {resume_file.filename}")
+        return jsonify({'job_id': job_id, 'status': 'queued', 'status_url': f'/jobs/{job_id}'}), 202
         
     except Exception as e:
-        logger.error(f"Unexpected error in /analyze: {e}", exc_info=True)
+        logger.error(f"Unexpected error in /jobs: {e}", exc_info=True)
         return jsonify({'error': 'An internal server error occurred. Please try again.'}), 500
 
+@app.route('/jobs/<job_id>')
+def job_status(job_id):
+    """Status of a queued analysis job, with its result once done"""
+    job = get_job_queue().store.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown job'}), 404
+    return jsonify(job)
+
+@app.route('/jobs/<job_id>/retry', methods=['POST'])
+def retry_job(job_id):
+    """Queue a failed job again"""
+    job_queue = get_job_queue()
+    job = job_queue.store.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown job'}), 404
+    if not job_queue.store.retry(job_id):
+        return jsonify({'error': f"Job is {job['status']} and cannot be retried"}), 409
+    job_queue.notify()
+    return jsonify({'job_id': job_id, 'status': 'queued', 'status_url': f'/jobs/{job_id}'}), 202
+
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=5000)
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the PDF text backends used by src/reader.py
+Times the text-layer extraction (open + get text, no OCR, no cache) of every
+PDF in the corpus with each backend and reports per-document latency
+
+Usage:
+    python benchmarks/pdf_backends.py path/to/resumes [more paths...] --repeat 3
+    python benchmarks/pdf_backends.py --synthetic 50    # generated PDFs, no corpus needed
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import fitz  # PyMuPDF
+
+from src.reader import PDF_BACKENDS
+
+def load_corpus(paths):
+    """Raw bytes of every PDF under the given files/directories"""
+    documents = []
+    for root in paths:
+        root = Path(root)
+        files = [root] if root.is_file() else sorted(root.rglob('*.pdf'))
+        for path in files:
+            if path.suffix.lower() == '.pdf':
+                documents.append((str(path), path.read_bytes()))
+    return documents
+
+def synthetic_corpus(count, pages=2):
+    """Text-layer resumes built with PyMuPDF, for runs without a corpus"""
+    lines = [
+        "Senior Data Scientist - Python, SQL, scikit-learn, PyTorch",
+        "Built machine learning pipelines on AWS with Docker and Kubernetes",
+        "Feature engineering, A/B testing, Tableau and Power BI dashboards",
+        "Led a team of 4 engineers delivering REST APIs with Flask and FastAPI",
+    ]
+    documents = []
+    for i in range(count):
+        document = fitz.open()
+        for p in range(pages):
+            page = document.new_page()
+            for row in range(30):
+                page.insert_text((50, 60 + row * 22), f"{i}.{p}.{row} {lines[row % len(lines)]}", fontsize=10)
+        documents.append((f"synthetic-{i}.pdf", document.tobytes()))
+        document.close()
+    return documents
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+def run(documents, backends, repeat):
+    results = {}
+    for backend in backends:
+        extract = PDF_BACKENDS[backend]
+        timings = []
+        chars = 0
+        failures = 0
+        for _ in range(repeat):
+            for name, data in documents:
+                start = time.perf_counter()
+                try:
+                    chars += sum(len(t) for t in extract(data))
+                except Exception as e:
+                    failures += 1
+                    print(f"⚠️  {backend} failed on {name}: {e}")
+                timings.append((time.perf_counter() - start) * 1000)
+        results[backend] = {
+            'documents': len(documents),
+            'runs': len(timings),
+            'mean_ms': round(statistics.mean(timings), 3),
+            'p50_ms': round(percentile(timings, 50), 3),
+            'p95_ms': round(percentile(timings, 95), 3),
+            'total_s': round(sum(timings) / 1000, 3),
+            'chars_per_run': chars // repeat,
+            'failures': failures,
+        }
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare PDF text backend latency on a resume corpus.")
+    parser.add_argument('corpus', nargs='*', help="PDF files or directories")
+    parser.add_argument('--synthetic', type=int, default=0, help="Add N generated two-page PDFs")
+    parser.add_argument('--repeat', type=int, default=3, help="Passes over the corpus per backend")
+    parser.add_argument('--backend', action='append', choices=sorted(PDF_BACKENDS), help="Limit to these backends")
+    parser.add_argument('--json', help="Also write the results to this file")
+    args = parser.parse_args(argv)
+
+    documents = load_corpus(args.corpus) + synthetic_corpus(args.synthetic)
+    if not documents:
+        documents = synthetic_corpus(20)
+    backends = args.backend or list(PDF_BACKENDS)
+
+    print(f"📊 PDF BACKEND BENCHMARK: {len(documents)} documents x {args.repeat} runs")
+    print("=" * 70)
+    results = run(documents, backends, args.repeat)
+    print(f"{'backend':<12}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'total s':>10}{'chars':>12}")
+    for backend, r in results.items():
+        print(f"{backend:<12}{r['mean_ms']:>10}{r['p50_ms']:>10}{r['p95_ms']:>10}{r['total_s']:>10}{r['chars_per_run']:>12}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the reader, ATS and skills engines
+Times normalize_text, extract_text_from_resume per format, ats_score,
+category_score and the full /analyze route over a generated corpus of
+small, medium and large resumes. Runs offline; the text cache is bypassed so
+extraction is measured, not cache hits.
+
+Usage:
+    python benchmarks/suite.py -o results.json
+    python benchmarks/suite.py --compare benchmarks/baseline.json --threshold 0.25
+    python benchmarks/suite.py --save-baseline benchmarks/baseline.json
+Exit status is 1 when a stage's median is slower than the baseline by more
+than its threshold.
+"""
+
+import argparse
+import io
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.ats import ats_score
+from src.reader import extract_text_from_resume, normalize_text
+from src.skills import category_score
+from src.taxonomy import get_taxonomy
+import src.text_cache as text_cache
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+# Words per resume for each corpus size
+SIZES = {'small': 150, 'medium': 600, 'large': 2400}
+
+FILLER = ("led delivered improved designed built owned shipped team project customers "
+          "platform reliability latency revenue quarterly stakeholders roadmap").split()
+
+JD_TEXT = ("We are hiring a senior machine learning engineer to build data pipelines and models. "
+           "Required: Python, SQL, PyTorch or TensorFlow, scikit-learn, pandas, numpy, feature engineering, "
+           "model evaluation, REST APIs, Docker, Kubernetes and AWS. Nice to have: Spark, Airflow, "
+           "Tableau or Power BI dashboards, A/B testing and MLOps experience. ") * 2
+
+
+# ========== SYNTHETIC CORPUS ==========
+def make_resume_text(words, rng):
+    skills = list(get_taxonomy().skills)
+    tokens = []
+    while len(tokens) < words:
+        tokens.extend(rng.sample(FILLER, 6))
+        tokens.append(rng.choice(skills))
+    lines = [" ".join(tokens[i:i + 12]) for i in range(0, len(tokens), 12)]
+    return "\n".join(lines)
+
+
+def as_pdf(text):
+    import fitz  # PyMuPDF
+
+    document = fitz.open()
+    lines = text.split("\n")
+    for start in range(0, len(lines), 45):
+        page = document.new_page()
+        for row, line in enumerate(lines[start:start + 45]):
+            page.insert_text((50, 50 + row * 16), line, fontsize=9)
+    data = document.tobytes()
+    document.close()
+    return data
+
+
+def as_docx(text):
+    import docx
+
+    document = docx.Document()
+    for line in text.split("\n"):
+        document.add_paragraph(line)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def build_corpus(sizes, per_size, seed=42):
+    """{size: [(text, {'txt': bytes, 'pdf': bytes, 'docx': bytes})]}, deterministic for a seed"""
+    rng = random.Random(seed)
+    corpus = {}
+    for size in sizes:
+        corpus[size] = []
+        for _ in range(per_size):
+            text = make_resume_text(SIZES[size], rng)
+            corpus[size].append((text, {
+                'txt': text.encode('utf-8'),
+                'pdf': as_pdf(text),
+                'docx': as_docx(text),
+            }))
+    return corpus
+
+
+def upload(data, filename):
+    buffer = io.BytesIO(data)
+    buffer.name = filename
+    return buffer
+
+
+# ========== ISOLATED APP ==========
+@contextmanager
+def isolated_app():
+    """
+    The Flask app for the route benchmark, with nothing running beside it:
+    no start-up OCR probe, no job workers, and corpus, job and text cache
+    stores in a temp dir removed afterwards
+    """
+    previous = os.environ.get('OCR_PROBE_AT_STARTUP')
+    os.environ['OCR_PROBE_AT_STARTUP'] = '0'
+    try:
+        import app as app_module
+    finally:
+        if previous is None:
+            del os.environ['OCR_PROBE_AT_STARTUP']
+        else:
+            os.environ['OCR_PROBE_AT_STARTUP'] = previous
+    import src.corpus as corpus_module
+    import src.skill_index as index_module
+    from src.jobs import JobQueue, JobStore
+
+    with tempfile.TemporaryDirectory(prefix='ai_lab_bench_') as directory:
+        originals = corpus_module._corpus, index_module._index, text_cache._cache, app_module._job_queue
+        corpus_module._corpus = corpus_module.ResumeCorpus(os.path.join(directory, 'corpus'))
+        index_module._index = None
+        text_cache._cache = text_cache.TextCache(os.path.join(directory, 'text_cache'))
+        # A queue that is never started: jobs could be stored but no worker threads run
+        app_module._job_queue = JobQueue(JobStore(os.path.join(directory, 'jobs')), app_module._run_job, workers=0)
+        try:
+            yield app_module
+        finally:
+            corpus_module._corpus, index_module._index, text_cache._cache, app_module._job_queue = originals
+
+
+# ========== TIMING ==========
+def measure(fn, args_list, repeat):
+    """Wall time in ms of fn(*args) for every args tuple, `repeat` passes"""
+    timings = []
+    for _ in range(repeat):
+        for args in args_list:
+            start = time.perf_counter()
+            fn(*args)
+            timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def summarize(timings):
+    ordered = sorted(timings)
+    return {
+        'n': len(ordered),
+        'mean_ms': round(statistics.mean(ordered), 4),
+        'p50_ms': round(statistics.median(ordered), 4),
+        'p95_ms': round(ordered[min(len(ordered) - 1, int(0.95 * (len(ordered) - 1) + 0.5))], 4),
+    }
+
+
+def _run_stages(sizes, per_size, repeat, seed):
+    corpus = build_corpus(sizes, per_size, seed)
+    jd = JD_TEXT.lower()
+    # Warm imports, the taxonomy and the JD profile cache before timing
+    ats_score("warm up", jd)
+    category_score("warm up", jd)
+
+    with isolated_app() as app_module:
+        return _time_stages(corpus, sizes, jd, repeat, app_module.app.test_client())
+
+
+def _time_stages(corpus, sizes, jd, repeat, client):
+    def analyze(data, filename):
+        response = client.post('/analyze', data={'jd_text': JD_TEXT, 'resume_file': (io.BytesIO(data), filename)})
+        assert response.status_code == 200
+
+    stages = {}
+    for size in sizes:
+        docs = corpus[size]
+        raw_texts = [(text,) for text, _ in docs]
+        texts = [(normalize_text(text),) for text, _ in docs]
+        stages[f'normalize_text.{size}'] = summarize(measure(normalize_text, raw_texts, repeat))
+        for fmt in ('txt', 'pdf', 'docx'):
+            stages[f'extract.{fmt}.{size}'] = summarize(measure(
+                lambda data, name: extract_text_from_resume(upload(data, name)),
+                [(files[fmt], f'resume.{fmt}') for _, files in docs], repeat))
+        stages[f'ats_score.{size}'] = summarize(measure(lambda t: ats_score(t, jd), texts, repeat))
+        stages[f'category_score.{size}'] = summarize(measure(lambda t: category_score(t, jd), texts, repeat))
+        stages[f'analyze.pdf.{size}'] = summarize(measure(
+            analyze, [(files['pdf'], 'resume.pdf') for _, files in docs], repeat))
+    return stages
+
+
+def run_suite(sizes=tuple(SIZES), per_size=5, repeat=3, seed=42):
+    """Time every stage on a generated corpus; returns the results dict."""
+    # Measure extraction itself, not text cache hits
+    cache_enabled, text_cache.CACHE_ENABLED = text_cache.CACHE_ENABLED, False
+    try:
+        stages = _run_stages(sizes, per_size, repeat, seed)
+    finally:
+        text_cache.CACHE_ENABLED = cache_enabled
+
+    return {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'machine': platform.machine(),
+            'cpus': os.cpu_count(),
+            'sizes': list(sizes),
+            'per_size': per_size,
+            'repeat': repeat,
+            'seed': seed,
+        },
+        'stages': stages,
+    }
+
+
+# ========== REGRESSION CHECK ==========
+def compare(results, baseline, threshold=0.25, overrides=None, metric='p50_ms'):
+    """
+    Stages whose `metric` exceeds baseline * (1 + threshold). `overrides`
+    maps a stage name or prefix (e.g. 'extract.pdf') to its own threshold.
+    Returns [(stage, baseline_ms, current_ms, allowed_ratio)].
+    """
+    overrides = overrides or {}
+    regressions = []
+    for stage, current in results['stages'].items():
+        base = baseline.get('stages', {}).get(stage)
+        if not base:
+            continue
+        limit = threshold
+        for prefix, value in overrides.items():
+            if stage == prefix or stage.startswith(prefix + '.'):
+                limit = value
+        if current[metric] > base[metric] * (1 + limit):
+            regressions.append((stage, base[metric], current[metric], 1 + limit))
+    return regressions
+
+
+def parse_overrides(values):
+    overrides = {}
+    for value in values or []:
+        stage, _, limit = value.partition('=')
+        overrides[stage] = float(limit)
+    return overrides
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the reader, ATS and skills engines.")
+    parser.add_argument('-o', '--output', help="Write results JSON here")
+    parser.add_argument('--sizes', nargs='+', choices=list(SIZES), default=list(SIZES))
+    parser.add_argument('--per-size', type=int, default=5, help="Resumes generated per size")
+    parser.add_argument('--repeat', type=int, default=3, help="Timed passes over the corpus")
+    parser.add_argument('--compare', nargs='?', const=BASELINE_PATH, help="Baseline JSON to check against")
+    parser.add_argument('--threshold', type=float, default=0.25, help="Allowed slowdown of the median (0.25 = 25%%)")
+    parser.add_argument('--stage-threshold', action='append', metavar='STAGE=RATIO',
+                        help="Per-stage threshold, e.g. extract.pdf=0.5 (prefix match)")
+    parser.add_argument('--save-baseline', nargs='?', const=BASELINE_PATH, help="Store results as the baseline")
+    args = parser.parse_args(argv)
+
+    # Scoring logs (e.g. the ATS fallback path) would drown the table
+    logging.disable(logging.ERROR)
+    try:
+        results = run_suite(args.sizes, args.per_size, args.repeat)
+    finally:
+        logging.disable(logging.NOTSET)
+
+    print(f"📊 BENCHMARKS ({results['meta']['platform']}, {results['meta']['cpus']} CPUs)")
+    print("=" * 70)
+    print(f"{'stage':<32}{'n':>6}{'mean ms':>11}{'p50 ms':>11}{'p95 ms':>11}")
+    for stage, r in results['stages'].items():
+        print(f"{stage:<32}{r['n']:>6}{r['mean_ms']:>11.3f}{r['p50_ms']:>11.3f}{r['p95_ms']:>11.3f}")
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, 'w') as f:
+                json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold, parse_overrides(args.stage_threshold))
+        if regressions:
+            print(f"\n❌ {len(regressions)} stage(s) slower than {args.compare}:")
+            for stage, base, current, ratio in regressions:
+                print(f"   {stage}: {base:.3f} ms → {current:.3f} ms (allowed {base * ratio:.3f} ms)")
+            return 1
+        print(f"\n✅ No regressions against {args.compare}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,294 @@
+import argparse
+import csv
+import json
+import logging
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+
+from src.idf import CORPUS_EXTENSIONS
+from src.taxonomy import get_taxonomy
+
+# Completed resumes are flushed to the output (and recorded in the manifest) in groups of this size
+FLUSH_EVERY = 200
+# Sub-lists (skills, suggestions, warnings) are joined with this separator in the output
+LIST_SEPARATOR = '; '
+
+
+# ========== WORKERS ==========
+_jobs = None
+_pdf_backend = None
+
+
+def _init_worker(jds, pdf_backend):
+    """Pool initializer: keep the JDs and settings for this process."""
+    global _jobs, _pdf_backend
+    import src.ocr as ocr
+
+    # Parallelism comes from the batch pool; OCR inside a worker stays single-process
+    ocr.OCR_WORKERS = 1
+    _jobs = jds
+    _pdf_backend = pdf_backend
+
+
+def _score_resume(path, name):
+    """Read one resume and score it against every JD; returns (name, rows)."""
+    from src.engine import score_resume
+    from src.improve import improve_resume
+    from src.reader import read_resume
+    from src.text_analysis import analyze_text
+
+    try:
+        with open(path, 'rb') as f:
+            resume_text, warning = read_resume(f, pdf_backend=_pdf_backend)
+    except Exception as e:
+        return name, [{'resume': name, 'jd': jd_name, 'error': f"read failed: {e}"} for jd_name, _ in _jobs]
+
+    # Analyzed once (with its skill evidence), scored against every JD
+    resume = analyze_text(resume_text)
+    rows = []
+    for jd_name, jd_text in _jobs:
+        row = {'resume': name, 'jd': jd_name, 'chars': len(resume_text), 'warning': warning or ''}
+        try:
+            result = score_resume(resume, jd_text.lower())
+            row['ats_score'] = result.ats_score
+            row.update(result.category_scores)
+            row['matched_skills'] = LIST_SEPARATOR.join(sorted(result.matched_skills))
+            row['missing_skills'] = LIST_SEPARATOR.join(sorted(result.missing_skills))
+            row['suggestions'] = LIST_SEPARATOR.join(improve_resume(result.missing_skills))
+            row['error'] = ''
+        except Exception as e:
+            row['error'] = f"scoring failed: {e}"
+        rows.append(row)
+    return name, rows
+
+
+# ========== OUTPUT ==========
+class Manifest:
+    """
+    Append-only progress log next to the output. Each line records a flush:
+    the resumes it completed and where the output ended after it, so a
+    restarted run skips finished resumes and drops rows written after the
+    last recorded flush. Resumes whose rows carry an error are listed under
+    `failed` as well, so a later run can retry them (see --retry-errors).
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.done = set()
+        self.failed = set()
+        self.entries = []
+        if self.path.exists():
+            valid = 0
+            with open(self.path, 'rb') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        break
+                    if not line.endswith(b'\n'):
+                        break
+                    valid += len(line)
+                    self._add(entry)
+            # Cut a torn last line left by a crash so new entries start clean
+            with open(self.path, 'r+b') as f:
+                f.truncate(valid)
+
+    def record(self, resumes, failed=(), **position):
+        entry = {'resumes': list(resumes), 'failed': list(failed), **position, 'at': time.time()}
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        self._add(entry)
+
+    def _add(self, entry):
+        self.entries.append(entry)
+        self.done.update(entry['resumes'])
+        # The latest attempt of a resume decides whether it still failed
+        self.failed.difference_update(entry['resumes'])
+        self.failed.update(entry.get('failed', ()))
+
+
+class CsvWriter:
+    """Appends rows to one CSV file; the manifest stores its byte size after each flush."""
+
+    def __init__(self, path, columns, manifest):
+        self.path = Path(path)
+        self.columns = columns
+        offset = manifest.entries[-1]['offset'] if manifest.entries else 0
+        size = self.path.stat().st_size if self.path.exists() else 0
+        if size < offset:
+            # Rows of resumes the manifest marks done are gone; resuming would never redo them
+            raise SystemExit(f"{self.path} is missing or shorter than {manifest.path} records; "
+                             f"delete the manifest to rerun from scratch")
+        if self.path.exists():
+            # Drop anything written after the last flush the manifest knows about
+            with open(self.path, 'r+b') as f:
+                f.truncate(offset)
+        self._file = open(self.path, 'a', newline='', encoding='utf-8')
+        self._writer = csv.DictWriter(self._file, fieldnames=columns, extrasaction='ignore')
+        if offset == 0:
+            self._writer.writeheader()
+
+    def write(self, rows):
+        self._writer.writerows(rows)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        return {'offset': self._file.tell()}
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetWriter:
+    """
+    Writes each flush as a part file in the output directory (Parquet files
+    cannot be appended to). Parts not named in the manifest are removed on
+    restart. Needs pyarrow, imported only when Parquet output is asked for.
+    """
+
+    def __init__(self, path, columns, manifest):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise SystemExit("Parquet output needs pyarrow: pip install pyarrow")
+        self.path = Path(path)
+        self.columns = columns
+        self.path.mkdir(parents=True, exist_ok=True)
+        known = {entry['part'] for entry in manifest.entries}
+        missing = sorted(known - {part.name for part in self.path.glob('part-*.parquet')})
+        if missing:
+            raise SystemExit(f"{self.path} lacks {len(missing)} part(s) {manifest.path} records (e.g. {missing[0]}); "
+                             f"delete the manifest to rerun from scratch")
+        for part in self.path.glob('part-*.parquet'):
+            if part.name not in known:
+                part.unlink()
+        self._next = len(manifest.entries)
+
+    def write(self, rows):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = pa.Table.from_pylist([{c: row.get(c) for c in self.columns} for row in rows])
+        name = f"part-{self._next:05d}.parquet"
+        pq.write_table(table, self.path / (name + '.tmp'))
+        os.replace(self.path / (name + '.tmp'), self.path / name)
+        self._next += 1
+        return {'part': name}
+
+    def close(self):
+        pass
+
+
+# ========== DRIVER ==========
+def find_resumes(directory):
+    """(absolute path, name relative to `directory`) of every supported file, sorted."""
+    directory = Path(directory)
+    files = sorted(p for p in directory.rglob('*') if p.is_file() and p.suffix.lower() in CORPUS_EXTENSIONS)
+    return [(str(p), p.relative_to(directory).as_posix()) for p in files]
+
+
+def output_columns():
+    taxonomy = get_taxonomy()
+    return (['resume', 'jd', 'ats_score'] + list(taxonomy.categories) +
+            ['matched_skills', 'missing_skills', 'suggestions', 'chars', 'warning', 'error'])
+
+
+def run_batch(resume_dir, jd_paths, output, fmt=None, workers=None, manifest_path=None,
+              pdf_backend=None, flush_every=FLUSH_EVERY, retry_errors=False):
+    """
+    Score every resume under `resume_dir` against each JD file and write one
+    row per (resume, JD). Returns the number of resumes processed this run.
+    With `retry_errors`, resumes whose last rows carried an error are scored
+    again; their new rows are appended after the old error rows.
+    """
+    fmt = fmt or ('parquet' if str(output).endswith('.parquet') else 'csv')
+    manifest = Manifest(manifest_path or f"{output}.manifest")
+    jds = [(Path(p).name, Path(p).read_text(encoding='utf-8', errors='ignore')) for p in jd_paths]
+    retry = manifest.failed if retry_errors else set()
+    resumes = [(path, name) for path, name in find_resumes(resume_dir)
+               if name not in manifest.done or name in retry]
+    if manifest.done:
+        logging.info(f"Resuming: {len(manifest.done)} resumes already done, {len(resumes)} to go")
+        if manifest.failed and not retry_errors:
+            logging.info(f"{len(manifest.failed)} done resumes had errors; pass --retry-errors to score them again")
+
+    writer_cls = ParquetWriter if fmt == 'parquet' else CsvWriter
+    writer = writer_cls(output, output_columns(), manifest)
+    workers = workers or os.cpu_count() or 1
+    # Bounded number of submitted tasks keeps memory flat on 100k-file runs
+    window = workers * 4
+    pending = set()
+    buffer_rows, buffer_names, buffer_failed = [], [], []
+    processed = 0
+    started = time.time()
+
+    def flush():
+        if buffer_names:
+            position = writer.write(buffer_rows)
+            manifest.record(buffer_names, buffer_failed, **position)
+            buffer_rows.clear()
+            buffer_names.clear()
+            buffer_failed.clear()
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(jds, pdf_backend)) as pool:
+            queue = iter(resumes)
+            while True:
+                for path, name in queue:
+                    pending.add(pool.submit(_score_resume, path, name))
+                    if len(pending) >= window:
+                        break
+                if not pending:
+                    break
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name, rows = future.result()
+                    buffer_rows.extend(rows)
+                    buffer_names.append(name)
+                    if any(row['error'] for row in rows):
+                        buffer_failed.append(name)
+                    processed += 1
+                if len(buffer_names) >= flush_every:
+                    flush()
+                    elapsed = time.time() - started
+                    rate = processed / elapsed if elapsed else 0.0
+                    eta = (len(resumes) - processed) / rate if rate else 0.0
+                    logging.info(f"{processed}/{len(resumes)} resumes, {rate:.1f}/s, ETA {eta:.0f}s")
+            flush()
+    finally:
+        writer.close()
+    logging.info(f"Scored {processed} resumes against {len(jds)} JDs into {output}")
+    return processed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score a directory of resumes against one or more job descriptions.")
+    parser.add_argument('resumes', help="Directory of resumes (searched recursively)")
+    parser.add_argument('--jd', nargs='+', required=True, help="Job description text files")
+    parser.add_argument('-o', '--output', required=True, help="Output .csv file or .parquet directory")
+    parser.add_argument('--format', choices=['csv', 'parquet'], help="Output format (default: from the extension)")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--manifest', default=None, help="Progress manifest (default: <output>.manifest)")
+    parser.add_argument('--pdf-backend', default=None, help="PDF text backend: pymupdf or pdfplumber")
+    parser.add_argument('--retry-errors', action='store_true',
+                        help="When resuming, score again the resumes whose rows had an error")
+    args = parser.parse_args(argv)
+
+    # A misspelt backend would otherwise fail every resume and still mark it done
+    from src.reader import resolve_pdf_backend
+    try:
+        resolve_pdf_backend(args.pdf_backend)
+    except ValueError as e:
+        parser.error(str(e))
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    run_batch(args.resumes, args.jd, args.output, fmt=args.format, workers=args.workers,
+              manifest_path=args.manifest, pdf_backend=args.pdf_backend, retry_errors=args.retry_errors)
+
+
+if __name__ == '__main__':
+    main()
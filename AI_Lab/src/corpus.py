@@ -0,0 +1,222 @@
+import hashlib
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import Counter
+
+from src.ats import ats_score_batch
+from src.text_analysis import normalize_text_for_matching
+
+# Stored resumes (extracted text) that new job postings are ranked against
+CORPUS_DIR = os.environ.get('RESUME_CORPUS_DIR') or os.path.join(tempfile.gettempdir(), 'ai_lab_corpus')
+# BM25 candidates re-scored with ats_score per ranking request
+RANK_SHORTLIST = int(os.environ.get('RANK_SHORTLIST', '200'))
+# Most frequent JD terms used in the BM25 query
+MAX_QUERY_TERMS = 64
+
+# Same characters the skill normalizer keeps, so "c++" and "c#" stay whole
+_TOKEN_RE = re.compile(r"[a-z0-9+#]+")
+
+# The FTS index covers match_text (the text as normalize_text_for_matching
+# rewrites it, like the JD query terms), while `text` keeps what was read for
+# re-scoring
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS resumes (
+    id INTEGER PRIMARY KEY,
+    external_id TEXT NOT NULL UNIQUE,
+    filename TEXT,
+    text TEXT NOT NULL,
+    match_text TEXT NOT NULL DEFAULT '',
+    content_hash TEXT NOT NULL,
+    added_at REAL NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS resume_fts USING fts5(
+    match_text, content='resumes', content_rowid='id', tokenize="unicode61 tokenchars '+#'"
+);
+CREATE TRIGGER IF NOT EXISTS resumes_ai AFTER INSERT ON resumes BEGIN
+    INSERT INTO resume_fts (rowid, match_text) VALUES (new.id, new.match_text);
+END;
+CREATE TRIGGER IF NOT EXISTS resumes_ad AFTER DELETE ON resumes BEGIN
+    INSERT INTO resume_fts (resume_fts, rowid, match_text) VALUES ('delete', old.id, old.match_text);
+END;
+CREATE TRIGGER IF NOT EXISTS resumes_au AFTER UPDATE OF match_text ON resumes BEGIN
+    INSERT INTO resume_fts (resume_fts, rowid, match_text) VALUES ('delete', old.id, old.match_text);
+    INSERT INTO resume_fts (rowid, match_text) VALUES (new.id, new.match_text);
+END;
+"""
+
+
+def jd_query_terms(jd_text, limit=MAX_QUERY_TERMS):
+    """The JD's most frequent non-stop-word terms, most frequent first."""
+    from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+
+    tokens = _TOKEN_RE.findall(normalize_text_for_matching(jd_text))
+    counts = Counter(t for t in tokens if len(t) > 1 and t not in ENGLISH_STOP_WORDS)
+    return [term for term, _ in counts.most_common(limit)]
+
+
+class ResumeCorpus:
+    """
+    Stored resume texts with a BM25 full-text index (SQLite FTS5).
+
+    Resumes are indexed as they are added, normalized the way JD query
+    terms are (triggers keep the FTS table in step), so there is no
+    rebuild step. `rank()` pulls a BM25 shortlist for
+    a job description and re-scores only that shortlist with
+    ats_score_batch, so returned scores match /analyze.
+    """
+
+    def __init__(self, directory=CORPUS_DIR):
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, 'resumes.sqlite3')
+        self._local = threading.local()
+        conn = self._connect()
+        migrated = self._add_match_text(conn)
+        conn.executescript(_SCHEMA)
+        if migrated:
+            conn.execute("INSERT INTO resume_fts (resume_fts) VALUES ('rebuild')")
+
+    def _connect(self):
+        # Connections are per thread and never reused across a fork
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _add_match_text(self, conn):
+        """
+        Upgrade a corpus whose FTS index covered the raw text: add and fill
+        match_text and drop the old index (and its triggers) so _SCHEMA
+        recreates it over match_text. Returns whether anything changed.
+        """
+        columns = {row[1] for row in conn.execute('PRAGMA table_info(resumes)')}
+        if not columns or 'match_text' in columns:
+            return False
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            columns = {row[1] for row in conn.execute('PRAGMA table_info(resumes)')}
+            if 'match_text' in columns:
+                conn.execute('COMMIT')
+                return False
+            for trigger in ('resumes_ai', 'resumes_ad', 'resumes_au'):
+                conn.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+            conn.execute('DROP TABLE IF EXISTS resume_fts')
+            conn.execute("ALTER TABLE resumes ADD COLUMN match_text TEXT NOT NULL DEFAULT ''")
+            rows = conn.execute('SELECT id, text FROM resumes').fetchall()
+            conn.executemany('UPDATE resumes SET match_text = ? WHERE id = ?',
+                             [(normalize_text_for_matching(text), row_id) for row_id, text in rows])
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return True
+
+    def add(self, text, filename='', external_id=None):
+        """
+        Store (or replace) a resume's extracted text and return its row id.
+        Without an external_id, identical texts are stored once.
+        """
+        content_hash = hashlib.sha256(text.encode('utf-8', errors='ignore')).hexdigest()
+        external_id = external_id or content_hash
+        conn = self._connect()
+        conn.execute(
+            'INSERT INTO resumes (external_id, filename, text, match_text, content_hash, added_at) '
+            'VALUES (?, ?, ?, ?, ?, ?) '
+            'ON CONFLICT(external_id) DO UPDATE SET filename = excluded.filename, text = excluded.text, '
+            'match_text = excluded.match_text, content_hash = excluded.content_hash, added_at = excluded.added_at '
+            'WHERE content_hash != excluded.content_hash',
+            (external_id, filename, text, normalize_text_for_matching(text), content_hash, time.time()),
+        )
+        return conn.execute('SELECT id FROM resumes WHERE external_id = ?', (external_id,)).fetchone()[0]
+
+    def remove(self, external_id):
+        cursor = self._connect().execute('DELETE FROM resumes WHERE external_id = ?', (external_id,))
+        return cursor.rowcount == 1
+
+    def __len__(self):
+        return self._connect().execute('SELECT COUNT(*) FROM resumes').fetchone()[0]
+
+    def match_ids(self, phrase):
+        """Sorted ids of resumes containing `phrase` (full-text phrase match)."""
+        phrase = normalize_text_for_matching(phrase)
+        if not phrase:
+            return []
+        rows = self._connect().execute(
+            'SELECT rowid FROM resume_fts WHERE resume_fts MATCH ? ORDER BY rowid',
+            ('"' + phrase.replace('"', '""') + '"',),
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def iter_texts(self):
+        """(id, text) of every stored resume, in id order."""
+        cursor = self._connect().execute('SELECT id, text FROM resumes ORDER BY id')
+        for row in cursor:
+            yield row[0], row[1]
+
+    def get(self, ids):
+        """{id: (resume_id, filename)} for the given row ids."""
+        ids = [int(i) for i in ids]
+        found = {}
+        conn = self._connect()
+        # Stay under SQLite's bound-parameter limit
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            rows = conn.execute(
+                f'SELECT id, external_id, filename FROM resumes WHERE id IN ({",".join("?" * len(chunk))})', chunk
+            ).fetchall()
+            found.update({row[0]: (row[1], row[2]) for row in rows})
+        return found
+
+    def search(self, jd_text, limit=RANK_SHORTLIST):
+        """BM25 shortlist: [(id, external_id, filename, text, bm25)], best first."""
+        terms = jd_query_terms(jd_text)
+        if not terms:
+            return []
+        query = ' OR '.join('"' + term.replace('"', '""') + '"' for term in terms)
+        rows = self._connect().execute(
+            'SELECT r.id, r.external_id, r.filename, r.text, bm25(resume_fts) AS rank '
+            'FROM resume_fts JOIN resumes r ON r.id = resume_fts.rowid '
+            'WHERE resume_fts MATCH ? ORDER BY rank LIMIT ?',
+            (query, limit),
+        ).fetchall()
+        # FTS5 reports BM25 negated (lower is better)
+        return [(row[0], row[1], row[2], row[3], -row[4]) for row in rows]
+
+    def rank(self, jd_text, k=10, shortlist=RANK_SHORTLIST):
+        """Top-k stored resumes for a JD, by ats_score over the BM25 shortlist."""
+        candidates = self.search(jd_text, max(k, shortlist))
+        if not candidates:
+            return []
+        scores = ats_score_batch([c[3] for c in candidates], jd_text.lower())
+        ranked = sorted(zip(candidates, scores), key=lambda item: (-item[1], -item[0][4]))
+        return [
+            {
+                'id': c[0],
+                'resume_id': c[1],
+                'filename': c[2],
+                'ats_score': score,
+                'bm25': round(c[4], 4),
+            }
+            for c, score in ranked[:k]
+        ]
+
+
+_corpus = None
+_corpus_lock = threading.Lock()
+
+
+def get_corpus():
+    """Process-wide ResumeCorpus."""
+    global _corpus
+    if _corpus is None:
+        with _corpus_lock:
+            if _corpus is None:
+                _corpus = ResumeCorpus()
+    return _corpus
@@ -0,0 +1,669 @@
+import logging
+import math
+import re
+import numpy as np
+from collections import namedtuple
+from functools import lru_cache
+from src.idf import get_idf_model
+from src.jd_cache import get_jd_profile
+from src.taxonomy import get_taxonomy
+from src.text_analysis import analyze_text, jd_analysis
+
+# ats_score and category_score are both derived here from one set of skill
+# hits per document (see ScoringEngine); src/ats.py and src/skills.py keep
+# them as thin wrappers
+
+# Categories the strong-candidate safety check looks at
+CORE_CATEGORY = 'Core Skills'
+DATA_CATEGORY = 'Data & Analytics'
+
+
+# ========== SKILL BITSETS ==========
+# A skill bitset has bit i set for taxonomy.skills[i] (the skill id). One
+# document's bitsets are Python ints, counted with int.bit_count(); N
+# documents pack into an N x nbytes uint8 matrix (little-endian, byte k
+# holds skills 8k..8k+7) counted with a byte lookup table.
+_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+def bits_of(skill_ids):
+    """Bitset of the given skill ids"""
+    bits = 0
+    for i in skill_ids:
+        bits |= 1 << i
+    return bits
+
+def bit_skills(bits, taxonomy):
+    """Skills in a bitset, in taxonomy order"""
+    skills = []
+    while bits:
+        low = bits & -bits
+        skills.append(taxonomy.skills[low.bit_length() - 1])
+        bits ^= low
+    return skills
+
+@lru_cache(maxsize=4)
+def category_masks(taxonomy):
+    """Bitset of every category's skills, by category id"""
+    return tuple(bits_of(taxonomy.category_skill_ids(cat_id)) for cat_id in range(len(taxonomy.categories)))
+
+def pack_bits(bitsets, width):
+    """N bitsets of `width` skills as an N x ceil(width / 8) uint8 matrix"""
+    nbytes = (width + 7) // 8
+    data = b''.join(bits.to_bytes(nbytes, 'little') for bits in bitsets)
+    return np.frombuffer(data, dtype=np.uint8).reshape(len(bitsets), nbytes)
+
+def popcount_rows(matrix):
+    """Set bits per row of a packed bitset matrix"""
+    return _POPCOUNT[matrix].sum(axis=-1, dtype=np.int64)
+
+
+# ========== SKILL EVIDENCE ==========
+def count_matches_with_semantics(hits, keywords, semantic_map=None):
+    """Count matches with semantic equivalence support"""
+    matches = 0
+
+    for keyword in keywords:
+        keyword_lower = keyword.lower()
+
+        # Exact match check
+        if hits.has_word(keyword_lower):
+            matches += 1
+            continue
+
+        # Semantic equivalent check
+        if semantic_map and keyword_lower in semantic_map:
+            for equivalent in semantic_map[keyword_lower]:
+                if hits.has_word(equivalent.lower()):
+                    matches += 0.7  # Partial credit for semantic match
+                    break
+
+    return matches
+
+def has_skill_semantic(hits, skill, semantic_map=None):
+    """
+    Enhanced skill detection with semantic matching support.
+    Checks for exact matches and semantic equivalents against the
+    SkillHits of a text scanned by the taxonomy matcher.
+    """
+    skill = str(skill).lower().strip()
+    if not skill: return False
+
+    # Exact match check
+    if re.search(r'[^a-z0-9]', skill):
+        return hits.contains(skill)
+
+    if hits.has_word(skill):
+        return True
+
+    # Semantic equivalent check
+    if semantic_map and skill in semantic_map:
+        for equivalent in semantic_map[skill]:
+            if hits.has_word(str(equivalent).lower()):
+                return True
+
+    return False
+
+# What one scanned text says about every taxonomy skill:
+# - credit: ATS credit of each matched skill (1 for the word, 0.7 for a semantic equivalent)
+# - bits: skills the category scores count as found (has_skill_semantic)
+# - semantic_bits: skills with a semantic equivalent in the text (the category semantic boost)
+# - context_bits: skills that appear, or have an equivalent, anywhere in the text (the category safeguard)
+SkillEvidence = namedtuple('SkillEvidence', ['credit', 'bits', 'semantic_bits', 'context_bits'])
+
+# How skill_evidence decides presence (has_skill_semantic) for a skill
+_SAME_AS_CREDIT, _BY_SUBSTRING, _BY_WORD, _NEVER = range(4)
+
+@lru_cache(maxsize=4)
+def _evidence_plan(taxonomy):
+    """
+    Per taxonomy skill, in skill id order, the lookups count_matches_with_semantics,
+    has_skill_semantic and the category score checks would make, resolved once:
+    (skill, bit, word, word equivalents, presence mode, presence key,
+     presence equivalents, equivalents looked up by substring)
+    """
+    semantic_map = taxonomy.semantic_equivalents
+    plan = []
+    for i, skill in enumerate(taxonomy.skills):
+        word = skill.lower()
+        word_equivalents = tuple(e.lower() for e in semantic_map.get(word, ()))
+        key = str(skill).lower().strip()
+        key_equivalents = tuple(str(e).lower() for e in semantic_map.get(key, ()))
+        if not key:
+            mode = _NEVER
+        elif re.search(r'[^a-z0-9]', key):
+            mode = _BY_SUBSTRING
+        elif key == word and key_equivalents == word_equivalents:
+            mode = _SAME_AS_CREDIT
+        else:
+            mode = _BY_WORD
+        plan.append((skill, 1 << i, word, word_equivalents, mode, key, key_equivalents,
+                     tuple(semantic_map.get(str(skill).lower(), ()))))
+    return tuple(plan)
+
+def skill_evidence(hits, taxonomy):
+    """Check every taxonomy skill once against the SkillHits of one text"""
+    credit = {}
+    bits = semantic_bits = context_bits = 0
+    has_word = hits.has_word
+    contains = hits.contains
+    for skill, bit, word, word_equivalents, mode, key, key_equivalents, equivalents in _evidence_plan(taxonomy):
+        # ATS credit, as count_matches_with_semantics
+        if has_word(word):
+            credit[skill] = 1
+        elif word_equivalents and any(has_word(e) for e in word_equivalents):
+            credit[skill] = 0.7  # Partial credit for semantic match
+        # Presence, as has_skill_semantic
+        if mode == _SAME_AS_CREDIT:
+            if skill in credit:
+                bits |= bit
+        elif mode == _BY_SUBSTRING:
+            if contains(key):
+                bits |= bit
+        elif mode == _BY_WORD:
+            if has_word(key) or any(has_word(e) for e in key_equivalents):
+                bits |= bit
+        # Substring evidence for the category boost and safeguard
+        if equivalents and any(contains(e) for e in equivalents):
+            semantic_bits |= bit
+            context_bits |= bit
+        elif contains(word):
+            context_bits |= bit
+    return SkillEvidence(credit, bits, semantic_bits, context_bits)
+
+def _evidence(analysis, hits):
+    """SkillEvidence of one of the analysis' scans; a scan shared by both scorers is checked once"""
+    built = analysis.part('evidence', lambda a: [])
+    for scanned, evidence in built:
+        if scanned is hits:
+            return evidence
+    evidence = skill_evidence(hits, analysis.taxonomy)
+    built.append((hits, evidence))
+    return evidence
+
+def ats_evidence(analysis):
+    """SkillEvidence of the normalized text (what the ATS score matches)"""
+    return _evidence(analysis, analysis.hits)
+
+def category_evidence(analysis):
+    """SkillEvidence of the lowercased text (what the category scores match)"""
+    return _evidence(analysis, analysis.text_hits)
+
+def category_credit(evidence, taxonomy):
+    """Semantic match count of every taxonomy category, summed in keyword order"""
+    counts = {}
+    for cat in taxonomy.categories:
+        matches = 0
+        for skill in taxonomy.category_skills[cat]:
+            if skill in evidence.credit:
+                matches += evidence.credit[skill]
+        counts[cat] = matches
+    return counts
+
+
+# ========== JOB DESCRIPTION FEATURES ==========
+# What the ATS score needs from a job description, cached on its JDProfile
+ATSJobFeatures = namedtuple('ATSJobFeatures', ['norm', 'counts', 'words', 'analysis'])
+
+def ats_job_features(profile):
+    """Category counts of the analyzed JD, with its normalized text and overlap words"""
+    analysis = jd_analysis(profile)
+    counts = category_credit(ats_evidence(analysis), profile.taxonomy)
+    return ATSJobFeatures(analysis.norm, counts, analysis.overlap, analysis)
+
+def jd_tfidf_vector(profile, idf_model):
+    """TF-IDF vector of a JD against a fitted IDF model, cached on its JDProfile"""
+    terms = jd_analysis(profile).terms
+    return profile.part(('tfidf', idf_model.token), lambda p: idf_model.transform_terms([terms]))
+
+# What the category scores need from a job description, cached on its JDProfile:
+# the JD's skill bitset and, by category id, the bitset of the skills it asks for
+CategoryJobFeatures = namedtuple('CategoryJobFeatures', ['bits', 'wanted'])
+
+def category_job_features(profile):
+    """Bitsets of the taxonomy skills the analyzed JD asks for, per category"""
+    bits = category_evidence(jd_analysis(profile)).bits
+    return CategoryJobFeatures(bits, tuple(bits & mask for mask in category_masks(profile.taxonomy)))
+
+def _pretokenized(terms):
+    """Vectorizer analyzer for documents given as TextAnalysis.terms"""
+    return terms
+
+
+# ========== SCORING ==========
+# Everything run_analysis reports for one resume against one JD
+ScoreResult = namedtuple('ScoreResult', ['ats_score', 'category_scores', 'matched_skills', 'missing_skills'])
+
+class ScoringEngine:
+    """
+    Scores one resume against one job description.
+
+    The resume is analyzed and its skill evidence computed once (every
+    taxonomy skill checked a single time); the JD side comes from its
+    cached JDProfile. The ATS score, category scores and matched/missing
+    skills are all derived from that shared evidence. Nothing is computed
+    until a score is asked for, so errors surface inside ats_score() and
+    category_scores() just as they did in the standalone functions.
+
+    `resume` is the resume text or its TextAnalysis (see analyze_text).
+    """
+
+    def __init__(self, resume, jd, taxonomy=None):
+        self.resume = resume
+        self.jd = jd
+        self._taxonomy = taxonomy
+        self._analysis = None
+
+    @property
+    def taxonomy(self):
+        if self._taxonomy is None:
+            self._taxonomy = get_taxonomy()
+        return self._taxonomy
+
+    @property
+    def analysis(self):
+        if self._analysis is None:
+            self._analysis = analyze_text(self.resume, self.taxonomy)
+        return self._analysis
+
+    def analyze(self):
+        """
+        Do the resume-side work now: normalization, tokenization, TF-IDF
+        terms, both matcher scans and their skill evidence. The scores then
+        only combine it with the JD, so callers can time the two apart.
+        """
+        analysis = self.analysis
+        for part in ('norm', 'overlap', 'terms'):
+            getattr(analysis, part)
+        ats_evidence(analysis)
+        category_evidence(analysis)
+        return analysis
+
+    def score(self):
+        """ScoreResult with every score; category errors propagate (ats_score never raises)"""
+        return ScoreResult(self.ats_score(), *self.category_scores())
+
+    def ats_score(self):
+        """
+        Professional ATS scoring engine aligned with real HR practices.
+
+        Industry-standard weighted model:
+        - Core Skills (AI/ML/Programming): 45%
+        - Tools & Frameworks: 25%
+        - Data & Analytics: 20%
+        - Bonus Skills (Cloud/Extras): 10%
+
+        Key enhancements:
+        - Semantic matching with skill equivalencies
+        - Cloud skills treated as bonuses, not blockers
+        - Context-aware partial matching
+        - Realistic score ranges (70-80% for strong candidates)
+        - NEVER returns 0% incorrectly
+
+        Score bands:
+        0–29%   → Needs Improvement
+        30–49%  → Below Average
+        50–69%  → Good Match
+        70%+    → Strong Match
+        """
+        try:
+            # PROFESSIONAL CATEGORY DEFINITIONS WITH SEMANTIC MAPPING
+            # Categories, weights, keywords and equivalents come from the
+            # SkillTaxonomy shared with the category scores (see src/taxonomy.py)
+            taxonomy = self.taxonomy
+
+            # Normalize both texts for better matching; the JD is preprocessed
+            # once and cached across requests (see src/jd_cache.py)
+            jd_profile = get_jd_profile(self.jd, taxonomy)
+            jd_features = jd_profile.part('ats', ats_job_features)
+            analysis = self.analysis
+            resume_norm = analysis.norm
+            jd_norm = jd_features.norm
+
+            # Early return if either is empty
+            if not resume_norm or not jd_norm:
+                logging.warning("Empty resume or JD text")
+                return 15.0  # Baseline score instead of 0
+
+            # 1. TF-IDF Cosine Similarity (Semantic matching)
+            cosine_sim = 0.0
+            try:
+                idf_model = get_idf_model()
+                if idf_model is not None:
+                    # Transform only, against the corpus-fitted IDF model
+                    cosine_sim = idf_model.cosine_terms_to_vector([analysis.terms], jd_tfidf_vector(jd_profile, idf_model))[0]
+                else:
+                    # No fitted model: fit on the resume/JD pair (already tokenized)
+                    from sklearn.feature_extraction.text import TfidfVectorizer
+                    from sklearn.metrics.pairwise import cosine_similarity
+
+                    vectorizer = TfidfVectorizer(analyzer=_pretokenized, min_df=1)
+                    vectors = vectorizer.fit_transform([analysis.terms, jd_features.analysis.terms])
+                    cosine_sim = cosine_similarity(vectors[0], vectors[1])[0][0]
+            except (ValueError, Exception) as e:
+                logging.warning(f"TF-IDF calculation failed: {e}")
+                cosine_sim = 0.0
+
+            # 2. Enhanced Matching Logic with Semantic Awareness
+            # PROFESSIONAL WEIGHTED SCORING MODEL WITH CONDITIONAL BONUS HANDLING
+
+            # Per category: resume matches, JD matches and coverage percentage
+            # (default weights: Core 45%, Tools 25%, Data 20%, Bonus 10%)
+            cat_matches = category_credit(ats_evidence(analysis), taxonomy)
+            cat_in_jd = jd_features.counts
+            cat_pct = {
+                cat: (cat_matches[cat] / cat_in_jd[cat] * 100) if cat_in_jd[cat] > 0 else 0
+                for cat in taxonomy.categories
+            }
+
+            core_matches = cat_matches.get(CORE_CATEGORY, 0)
+            core_in_jd = cat_in_jd.get(CORE_CATEGORY, 0)
+            data_matches = cat_matches.get(DATA_CATEGORY, 0)
+            data_in_jd = cat_in_jd.get(DATA_CATEGORY, 0)
+
+            # Bonus Skills - Cloud and extras (OPTIONAL, NO PENALTY if missing)
+            bonus_matches = sum(cat_matches[cat] for cat in taxonomy.categories if cat in taxonomy.bonus_categories)
+            bonus_in_jd = sum(cat_in_jd[cat] for cat in taxonomy.categories if cat in taxonomy.bonus_categories)
+
+            # CONDITIONAL WEIGHTED CALCULATION
+            # Only include bonus skills in calculation if they are mentioned in JD
+            if bonus_in_jd > 0:
+                # JD includes bonus skills, so include them in weighted average
+                weighted_score = sum(cat_pct[cat] * taxonomy.weights[cat] for cat in taxonomy.categories)
+            else:
+                # JD does not include bonus skills, redistribute weight proportionally
+                # e.g. without the 10% bonus weight: Core 45/90, Tools 25/90, Data 20/90
+                bonus_weight = math.fsum(taxonomy.weights[cat] for cat in taxonomy.bonus_categories)
+                remaining_weight = taxonomy.total_weight - bonus_weight
+                weighted_score = sum(
+                    cat_pct[cat] * (taxonomy.weights[cat] / remaining_weight)
+                    for cat in taxonomy.categories if cat not in taxonomy.bonus_categories
+                ) if remaining_weight > 0 else 0.0
+
+            # Ensure weighted score doesn't exceed 100%
+            weighted_score = min(100.0, weighted_score)
+
+            # 3. Keyword Overlap (Jaccard-like) - improved
+            resume_words = analysis.overlap
+            jd_words = jd_features.words
+
+            overlap_score = 0.0
+            if jd_words:
+                overlap = len(resume_words.intersection(jd_words))
+                overlap_score = (overlap / len(jd_words)) * 100
+
+            # 4. ENHANCED SCORE COMBINATION WITH PROPER BONUS HANDLING
+            # Apply bonus adjustment only if bonus skills are in JD
+            bonus_addition = 0.0
+            if bonus_in_jd > 0 and bonus_matches > 0:
+                # Positive bonus for having bonus skills when they're mentioned in JD
+                bonus_ratio = bonus_matches / bonus_in_jd
+                bonus_addition = min(8.0, bonus_ratio * 15.0)  # Max 8% addition
+
+            # Combine scores with adjusted weighting
+            final_score = (weighted_score * 0.6) + (overlap_score * 0.25) + (cosine_sim * 100 * 0.15)
+            final_score += bonus_addition
+
+            # Ensure final score doesn't exceed 100%
+            final_score = min(100.0, final_score)
+
+            # 5. CRITICAL: Ensure score is NEVER 0% incorrectly
+            resume_len = len(resume_norm.strip())
+            jd_len = len(jd_norm.strip())
+
+            # If we have both resume and JD text, apply baseline logic
+            if resume_len > 0 and jd_len > 0:
+                # Check if there's ANY meaningful overlap
+                has_overlap = (
+                    overlap_score > 0 or
+                    cosine_sim > 0.01 or
+                    skills_matches > 0 or
+                    exp_matches > 0 or
+                    tools_matches > 0 or
+                    edu_matches > 0
+                )
+
+                if has_overlap:
+                    # SAFETY CHECK: If Core Skills ≥ 80% and Data ≥ 70%, final score should NOT fall below 70%
+                    if core_in_jd > 0 and data_in_jd > 0:  # Only check if both categories are in JD
+                        core_pct = (core_matches / core_in_jd * 100) if core_in_jd > 0 else 0
+                        data_pct = (data_matches / data_in_jd * 100) if data_in_jd > 0 else 0
+
+                        if core_pct >= 80 and data_pct >= 70:
+                            # Strong candidates in core areas should score well
+                            final_score = max(final_score, 70.0)
+
+                    # Boost realistic scores for strong candidates
+                    if final_score < 30:
+                        # Strong candidates shouldn't score below 30%
+                        final_score = max(final_score, 30.0)
+                    elif final_score > 65:
+                        # Top performers deserve 70%+ scores
+                        final_score = min(100.0, final_score + 5.0)  # Gentle boost
+                else:
+                    # Even with no direct overlap, recognize structured resumes
+                    resume_sections = ['experience', 'education', 'skills', 'projects', 'summary', 'objective', 'work', 'technical']
+                    section_count = sum(1 for section in resume_sections if section in resume_norm)
+                    if section_count > 0:
+                        final_score = 25.0 + min(15.0, section_count * 3.0)  # 25-40% baseline
+                    else:
+                        final_score = 20.0  # Minimum reasonable baseline
+
+                # For short resumes, cap maximum but ensure minimum
+                if resume_len < 200:
+                    final_score = min(final_score, 50.0)  # Cap at 50% for very short resumes
+                    final_score = max(final_score, 15.0)  # But never below 15%
+                elif resume_len < 600:
+                    # Short but valid resume
+                    if final_score < 25:
+                        final_score = max(final_score, 25.0)
+
+            # Round and cap at 100%
+            final_score_100 = min(round(final_score, 1), 100.0)
+
+            # Final safeguard: Never return 0% if we have both texts
+            if resume_len > 0 and jd_len > 0 and final_score_100 < 15.0:
+                final_score_100 = 15.0
+
+            logging.info(f"ATS Score calculated: {final_score_100}% (resume: {resume_len} chars, JD: {jd_len} chars)")
+            return final_score_100
+
+        except Exception as e:
+            logging.error(f"Error calculating ATS score: {e}", exc_info=True)
+            # Return baseline instead of 0
+            return 15.0
+
+    def category_scores(self):
+        """
+        Calculates match score per category and identifies matched/missing skills.
+        Uses word-boundary matching (partial & semantic-ish); coverage and the
+        matched/missing skills are popcounts and bitwise operations on the
+        skill bitsets of the resume and the JD (cached on its JDProfile).
+
+        Returns (category scores, matched skills, missing skills), skills in
+        taxonomy order.
+        """
+        taxonomy = self.taxonomy
+        analysis = self.analysis
+        resume_text = analysis.text
+        jd_text = self.jd.lower()
+
+        # PROFESSIONAL CATEGORY STRUCTURE
+        fixed_categories = taxonomy.categories
+        masks = category_masks(taxonomy)
+        cat_scores = {}
+        matched_bits = 0
+        missing_bits = 0
+
+        # Track categories that SHOULD have a score (JD has skills in them)
+        relevant_categories = []
+
+        # Every skill was checked once against each text; the JD side is
+        # cached across requests (see src/jd_cache.py)
+        resume = category_evidence(analysis)
+        jd_features = get_jd_profile(jd_text, taxonomy).part('categories', category_job_features)
+
+        for cat_id, cat in enumerate(fixed_categories):
+            # 1. Identify skills relevant to the JD (prebuilt per category)
+            jd_skills = jd_features.wanted[cat_id]
+
+            # 2. Identify which of those are in the Resume
+            resume_skills = jd_skills & resume.bits
+
+            # 3. Calculate Score with Partial Credit for Semantic Matches
+            if jd_skills:
+                jd_skills_count = jd_skills.bit_count()
+                score = int((resume_skills.bit_count() / jd_skills_count) * 100)
+                relevant_categories.append(cat)
+
+                # Conservative boost for semantic matches to prevent over-scoring
+                if cat not in taxonomy.bonus_categories and score > 0:
+                    # JD skills with a semantic equivalent somewhere in the resume
+                    semantic_matches = (jd_skills & resume.semantic_bits).bit_count()
+
+                    if semantic_matches > 0:
+                        semantic_boost = min(15, int((semantic_matches / jd_skills_count) * 75))
+                        score = min(90, score + semantic_boost)  # Cap at 90% to maintain realism
+            else:
+                # If JD doesn't mention this category, default to neutral score
+                score = 50  # Neutral baseline instead of 0
+
+            cat_scores[cat] = score
+
+            # Collect matched and missing
+            matched_bits |= resume_skills
+            missing_bits |= jd_skills & ~resume_skills
+
+        # PROFESSIONAL SCORE SAFEGUARD
+        # Ensure realistic scoring that reflects candidate strengths
+        if len(resume_text.strip()) > 0 and len(jd_text.strip()) > 0:
+            total_score = sum(cat_scores.values())
+
+            # Check if there are relevant categories in JD
+            if relevant_categories:
+                # Prevent unrealistic 0% scores for qualified candidates
+                if total_score < 60:  # Threshold for intervention
+                    for cat in relevant_categories:
+                        if cat_scores[cat] == 0:
+                            # Look for contextual evidence of skills: the category's
+                            # skills, or their equivalents, anywhere in the resume
+                            cat_id = taxonomy.category_ids[cat]
+                            contextual_matches = (masks[cat_id] & resume.context_bits).bit_count()
+
+                            if contextual_matches > 0:
+                                # Calculate reasonable partial score
+                                jd_skills_count = jd_features.wanted[cat_id].bit_count()
+                                if jd_skills_count > 0:
+                                    cat_scores[cat] = min(70, max(20, int((contextual_matches / jd_skills_count) * 100)))
+                                else:
+                                    cat_scores[cat] = min(30, contextual_matches * 10)
+
+                # Boost scores for well-matched candidates
+                avg_score = total_score / len(relevant_categories) if relevant_categories else 0
+                if avg_score > 60:
+                    # Strong candidates deserve recognition
+                    boost_amount = min(15, int(avg_score * 0.1))
+                    for cat in relevant_categories:
+                        if cat_scores[cat] > 50:
+                            cat_scores[cat] = min(100, cat_scores[cat] + boost_amount)
+
+        # BALANCED BONUS SKILLS HANDLING
+        # Ensure bonus skills enhance but don't dominate scoring
+        for bonus_cat in taxonomy.bonus_categories:
+            if bonus_cat not in cat_scores:
+                continue
+            bonus_score = cat_scores[bonus_cat]
+            # Cap bonus skills contribution to prevent over-inflation
+            if bonus_score > 80:
+                cat_scores[bonus_cat] = 80  # Reasonable maximum
+            elif bonus_score == 0:
+                # If bonus skills aren't relevant in JD, use neutral score
+                bonus_relevant = jd_features.wanted[taxonomy.category_ids[bonus_cat]] != 0
+                if not bonus_relevant:
+                    cat_scores[bonus_cat] = 50  # Neutral baseline
+
+        return cat_scores, bit_skills(matched_bits, taxonomy), bit_skills(missing_bits, taxonomy)
+
+def score_resume(resume, jd, taxonomy=None):
+    """
+    ATS score, category scores and matched/missing skills of one resume
+    against one JD, from a single pass over each (see ScoringEngine).
+    Returns a ScoreResult.
+    """
+    return ScoringEngine(resume, jd, taxonomy).score()
+
+def category_scores_batch(resumes, jd, taxonomy=None):
+    """
+    Category scores of many resumes against one job description.
+
+    Returns the same [(category scores, matched skills, missing skills)] as
+    ScoringEngine(r, jd).category_scores() for each resume (texts or
+    TextAnalysis objects), but coverage, the semantic boost, the safeguard
+    and the bonus handling run as NumPy operations on the N x nbytes matrix
+    of resume skill bitsets, one category at a time.
+    """
+    resumes = list(resumes)
+    n = len(resumes)
+    if n == 0:
+        return []
+
+    taxonomy = taxonomy or get_taxonomy()
+    jd_text = jd.lower()
+    analyses = [analyze_text(r, taxonomy) for r in resumes]
+    evidence = [category_evidence(a) for a in analyses]
+    jd_features = get_jd_profile(jd_text, taxonomy).part('categories', category_job_features)
+
+    width = len(taxonomy.skills)
+    resume_bits = pack_bits([e.bits for e in evidence], width)
+    semantic_bits = pack_bits([e.semantic_bits for e in evidence], width)
+    context_bits = pack_bits([e.context_bits for e in evidence], width)
+    wanted = pack_bits(jd_features.wanted, width)
+    masks = pack_bits(category_masks(taxonomy), width)
+    jd_counts = [w.bit_count() for w in jd_features.wanted]
+    relevant = [c for c, count in enumerate(jd_counts) if count]
+
+    # Coverage with the semantic boost, N x C
+    scores = np.full((n, len(taxonomy.categories)), 50, dtype=np.int64)
+    for c in relevant:
+        score = (popcount_rows(resume_bits & wanted[c]) / jd_counts[c] * 100).astype(np.int64)
+        if taxonomy.categories[c] not in taxonomy.bonus_categories:
+            semantic_matches = popcount_rows(semantic_bits & wanted[c])
+            boost = np.minimum(15, (semantic_matches / jd_counts[c] * 75).astype(np.int64))
+            score = np.where((score > 0) & (semantic_matches > 0), np.minimum(90, score + boost), score)
+        scores[:, c] = score
+
+    # Safeguard and strong-candidate boost, on the totals before either
+    if relevant and jd_text.strip():
+        has_text = np.array([bool(a.text.strip()) for a in analyses])
+        total = scores.sum(axis=1)
+        low = has_text & (total < 60)
+        for c in relevant:
+            zero = low & (scores[:, c] == 0)
+            if zero.any():
+                contextual_matches = popcount_rows(context_bits & masks[c])
+                partial = np.minimum(70, np.maximum(20, (contextual_matches / jd_counts[c] * 100).astype(np.int64)))
+                scores[:, c] = np.where(zero & (contextual_matches > 0), partial, scores[:, c])
+        avg_score = total / len(relevant)
+        strong = has_text & (avg_score > 60)
+        boost = np.minimum(15, (avg_score * 0.1).astype(np.int64))
+        for c in relevant:
+            scores[:, c] = np.where(strong & (scores[:, c] > 50), np.minimum(100, scores[:, c] + boost), scores[:, c])
+
+    # Bonus categories: capped at 80, neutral 50 when the JD does not ask for them
+    for c, cat in enumerate(taxonomy.categories):
+        if cat in taxonomy.bonus_categories:
+            neutral = 0 if jd_counts[c] else 50
+            scores[:, c] = np.where(scores[:, c] > 80, 80, np.where(scores[:, c] == 0, neutral, scores[:, c]))
+
+    jd_skills = 0
+    for w in jd_features.wanted:
+        jd_skills |= w
+    results = []
+    for i, e in enumerate(evidence):
+        matched = e.bits & jd_skills
+        results.append((
+            {cat: int(scores[i, c]) for c, cat in enumerate(taxonomy.categories)},
+            bit_skills(matched, taxonomy),
+            bit_skills(jd_skills & ~matched, taxonomy),
+        ))
+    logging.info(f"Category batch scored {n} resumes against JD ({len(jd_text)} chars)")
+    return results
@@ -0,0 +1,187 @@
+import argparse
+import itertools
+import logging
+import os
+import threading
+from pathlib import Path
+
+import numpy as np
+
+MODELS_DIR = Path(__file__).resolve().parent.parent / 'models'
+DEFAULT_MODEL_PATH = MODELS_DIR / 'idf_model.npz'
+
+# Resume/JD formats read when fitting over a directory
+CORPUS_EXTENSIONS = ('.txt', '.pdf', '.docx', '.png', '.jpg', '.jpeg')
+
+
+class IdfModel:
+    """
+    IDF statistics fitted once over a reference corpus.
+
+    Scoring only transforms documents against the fixed vocabulary and IDF
+    weights, so no vectorizer is fitted on the request path. Persisted as a
+    compressed .npz holding the vocabulary and float32 IDF weights.
+    """
+
+    _tokens = itertools.count()
+
+    def __init__(self, terms, idf, documents=0):
+        # Identifies this model instance in caches of transformed vectors
+        self.token = next(IdfModel._tokens)
+        self.terms = list(terms)
+        self.idf = np.asarray(idf, dtype=np.float64)
+        self.documents = int(documents)
+        self.vocabulary = {term: i for i, term in enumerate(self.terms)}
+
+    @classmethod
+    def fit(cls, documents, min_df=1, max_features=None):
+        """Fit IDF weights over raw document texts (normalized for matching first)."""
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from src.text_analysis import normalize_text_for_matching
+
+        docs = [normalize_text_for_matching(doc) for doc in documents]
+        docs = [doc for doc in docs if doc]
+        vectorizer = TfidfVectorizer(stop_words='english', min_df=min_df, max_features=max_features)
+        vectorizer.fit(docs)
+        terms = vectorizer.get_feature_names_out()
+        return cls(terms, vectorizer.idf_, documents=len(docs))
+
+    def save(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez_compressed(
+            path,
+            terms=np.frombuffer('\n'.join(self.terms).encode('utf-8'), dtype=np.uint8),
+            idf=self.idf.astype(np.float32),
+            documents=np.array([self.documents]),
+        )
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            raw = data['terms'].tobytes().decode('utf-8')
+            terms = raw.split('\n') if raw else []
+            return cls(terms, data['idf'], documents=int(data['documents'][0]))
+
+    def transform(self, texts):
+        """L2-normalized TF-IDF rows for already normalized texts."""
+        from src.text_analysis import tfidf_terms
+
+        return self.transform_terms([tfidf_terms(text.lower()) for text in texts])
+
+    def transform_terms(self, term_lists):
+        """
+        L2-normalized TF-IDF rows for documents given as term lists
+        (TextAnalysis.terms). Builds the same count matrix as a
+        vocabulary-bound CountVectorizer, so vectors are identical.
+        """
+        from scipy.sparse import csr_matrix
+        from sklearn.preprocessing import normalize
+
+        vocabulary = self.vocabulary
+        indptr, indices, values = [0], [], []
+        for terms in term_lists:
+            counts = {}
+            for term in terms:
+                index = vocabulary.get(term)
+                if index is not None:
+                    counts[index] = counts.get(index, 0) + 1
+            indices.extend(counts)
+            values.extend(counts.values())
+            indptr.append(len(indices))
+        counts = csr_matrix(
+            (np.asarray(values, dtype=np.int64), np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int32)),
+            shape=(len(term_lists), len(self.terms)),
+        )
+        counts.sort_indices()
+        return normalize(counts.astype(np.float64).multiply(self.idf).tocsr())
+
+    def cosine(self, texts, reference):
+        """Cosine similarity of each text against one reference text."""
+        return self.cosine_to_vector(texts, self.transform([reference]))
+
+    def cosine_to_vector(self, texts, reference_vector):
+        """Cosine similarity of each text against an already transformed reference."""
+        return self._cosine(self.transform(list(texts)), reference_vector)
+
+    def cosine_terms_to_vector(self, term_lists, reference_vector):
+        """cosine_to_vector for documents given as term lists."""
+        return self._cosine(self.transform_terms(list(term_lists)), reference_vector)
+
+    @staticmethod
+    def _cosine(vectors, reference_vector):
+        return np.asarray((vectors @ reference_vector.T).todense()).ravel()
+
+
+_lock = threading.Lock()
+_model = None
+_model_key = None
+
+
+def get_idf_model():
+    """
+    Return the persisted IdfModel, or None when no model has been fitted.
+
+    The path comes from ATS_IDF_MODEL (default models/idf_model.npz) and
+    the file is reloaded when it is replaced.
+    """
+    global _model, _model_key
+    path = Path(os.environ.get('ATS_IDF_MODEL') or DEFAULT_MODEL_PATH)
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+
+    key = (str(path), st.st_mtime_ns, st.st_size)
+    if key == _model_key:
+        return _model
+
+    with _lock:
+        if key != _model_key:
+            try:
+                _model = IdfModel.load(path)
+                logging.info(f"IDF model loaded from {path}: {len(_model.terms)} terms, {_model.documents} documents")
+            except Exception as e:
+                logging.error(f"Failed to load IDF model {path}: {e}")
+                _model = None
+            _model_key = key
+        return _model
+
+
+def iter_corpus(paths):
+    """Yield the text of every supported document under the given files/directories."""
+    from src.reader import extract_text_from_resume
+
+    for root in paths:
+        root = Path(root)
+        files = [root] if root.is_file() else sorted(p for p in root.rglob('*') if p.is_file())
+        for path in files:
+            if path.suffix.lower() not in CORPUS_EXTENSIONS:
+                continue
+            if path.suffix.lower() == '.txt':
+                yield path.read_text(encoding='utf-8', errors='ignore')
+                continue
+            with open(path, 'rb') as f:
+                text, warning = extract_text_from_resume(f)
+            if warning:
+                logging.warning(f"{path}: {warning}")
+            if text:
+                yield text
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fit and persist the IDF model used by ats_score.")
+    parser.add_argument('corpus', nargs='+', help="Files or directories of resumes / job descriptions")
+    parser.add_argument('-o', '--output', default=str(DEFAULT_MODEL_PATH), help="Where to write the .npz model")
+    parser.add_argument('--min-df', type=int, default=1, help="Ignore terms found in fewer documents")
+    parser.add_argument('--max-features', type=int, default=None, help="Keep only the most frequent terms")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    model = IdfModel.fit(iter_corpus(args.corpus), min_df=args.min_df, max_features=args.max_features)
+    model.save(args.output)
+    logging.info(f"IDF model with {len(model.terms)} terms from {model.documents} documents written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+# Number of distinct job descriptions kept preprocessed per process
+JD_CACHE_SIZE = int(os.environ.get('JD_PROFILE_CACHE_SIZE', '256'))
+
+
+class LRUCache:
+    """Bounded, thread-safe LRU mapping with hit/miss/eviction counters."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """Insert `value` unless another thread already did; returns the cached value."""
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                return self._data[key]
+            self._data[key] = value
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+            return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+class JDProfile:
+    """
+    Preprocessed job description shared by every scorer.
+
+    Each scorer derives what it needs from the lowercased JD once (the
+    normalized text, overlap token set and per-category hits for
+    ats_score, the per-category skills for category_score, the TF-IDF
+    vector for a fitted IDF model) via `part()`, and later requests with
+    the same JD reuse it.
+    """
+
+    __slots__ = ('key', 'text', 'taxonomy', '_parts')
+
+    def __init__(self, key, text, taxonomy):
+        self.key = key
+        self.text = text
+        self.taxonomy = taxonomy
+        self._parts = {}
+
+    def part(self, name, build):
+        """Return the derived value `name`, building it with build(profile) on first use."""
+        try:
+            return self._parts[name]
+        except KeyError:
+            value = build(self)
+            # A concurrent builder may have won; both values are identical
+            return self._parts.setdefault(name, value)
+
+
+_cache = LRUCache(JD_CACHE_SIZE)
+
+
+def jd_profile_key(jd_text, taxonomy):
+    digest = hashlib.sha256((jd_text or '').lower().encode('utf-8', errors='surrogatepass')).hexdigest()
+    return (digest, taxonomy.version)
+
+
+def get_jd_profile(jd_text, taxonomy):
+    """
+    Cached JDProfile keyed by a hash of the lowercased JD plus the taxonomy
+    version, so a taxonomy reload never serves hits computed against the
+    old skill lists.
+    """
+    key = jd_profile_key(jd_text, taxonomy)
+    profile = _cache.get(key)
+    if profile is None:
+        profile = _cache.put(key, JDProfile(key, (jd_text or '').lower(), taxonomy))
+    return profile
+
+
+def jd_cache_stats():
+    return _cache.stats()
+
+
+def clear_jd_cache():
+    _cache.clear()
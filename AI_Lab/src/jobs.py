@@ -0,0 +1,341 @@
+import json
+import logging
+import os
+import socket
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+
+# Persistent analysis jobs, shared by every worker process on the box
+JOB_STORE_DIR = os.environ.get('JOB_STORE_DIR') or os.path.join(tempfile.gettempdir(), 'ai_lab_jobs')
+JOB_WORKERS = int(os.environ.get('JOB_WORKERS', '2'))
+# Seconds an idle worker waits before polling the store again
+JOB_POLL_INTERVAL = float(os.environ.get('JOB_POLL_INTERVAL', '2'))
+# A running job whose owner has not sent a heartbeat for this long is
+# considered abandoned (crashed or killed worker) and queued again
+JOB_LEASE_SECONDS = float(os.environ.get('JOB_LEASE_SECONDS', '60'))
+# A job abandoned this many times (e.g. a file that crashes or OOM-kills its
+# worker) is marked failed instead of being queued again
+JOB_MAX_ATTEMPTS = int(os.environ.get('JOB_MAX_ATTEMPTS', '3'))
+# Finished and failed jobs are deleted this long after they finished
+JOB_RETENTION_HOURS = float(os.environ.get('JOB_RETENTION_HOURS', '168'))
+# How often idle workers requeue expired leases and prune old jobs
+JOB_SWEEP_INTERVAL = float(os.environ.get('JOB_SWEEP_INTERVAL', '60'))
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    payload BLOB,
+    params TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    owner TEXT,
+    heartbeat_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status_created ON jobs (status, created_at);
+"""
+
+# Columns added after the first release, for stores created before them
+_ADDED_COLUMNS = (('owner', 'TEXT'), ('heartbeat_at', 'REAL'))
+
+
+def worker_id():
+    """Owner recorded on claimed jobs: host and process id."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class JobStore:
+    """
+    SQLite-backed store of analysis jobs (upload bytes, parameters, status
+    and results).
+
+    Uses WAL mode and per-thread connections like the text cache, so web
+    workers and background workers in several processes share one file.
+    Claiming a job is a single IMMEDIATE transaction, so each queued job
+    runs once even with many workers polling. A claim records its owner
+    and a heartbeat; only jobs whose heartbeat is older than the lease are
+    taken back from their owner.
+    """
+
+    def __init__(self, directory=JOB_STORE_DIR):
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, 'jobs.sqlite3')
+        self._local = threading.local()
+        conn = self._connect()
+        conn.executescript(_SCHEMA)
+        columns = {row['name'] for row in conn.execute('PRAGMA table_info(jobs)')}
+        for name, kind in _ADDED_COLUMNS:
+            if name not in columns:
+                try:
+                    conn.execute(f'ALTER TABLE jobs ADD COLUMN {name} {kind}')
+                except sqlite3.OperationalError:
+                    pass  # added meanwhile by another process
+
+    def _connect(self):
+        # Connections are per thread and never reused across a fork
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def submit(self, filename, payload, params):
+        """Queue a job and return its id."""
+        job_id = uuid.uuid4().hex
+        self._connect().execute(
+            'INSERT INTO jobs (id, status, filename, payload, params, created_at) VALUES (?, ?, ?, ?, ?, ?)',
+            (job_id, QUEUED, filename, payload, json.dumps(params), time.time()),
+        )
+        return job_id
+
+    def claim(self, owner=None):
+        """Mark the oldest queued job running for `owner` and return it, or None."""
+        owner = owner or worker_id()
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute(
+                'SELECT * FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1', (QUEUED,)
+            ).fetchone()
+            if row is not None:
+                now = time.time()
+                conn.execute(
+                    'UPDATE jobs SET status = ?, attempts = attempts + 1, started_at = ?, owner = ?, '
+                    'heartbeat_at = ? WHERE id = ?',
+                    (RUNNING, now, owner, now, row['id']),
+                )
+                row = conn.execute('SELECT * FROM jobs WHERE id = ?', (row['id'],)).fetchone()
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return dict(row) if row is not None else None
+
+    def heartbeat(self, job_ids, owner):
+        """Extend the lease on jobs `owner` is still running."""
+        job_ids = list(job_ids)
+        if not job_ids:
+            return
+        self._connect().execute(
+            f'UPDATE jobs SET heartbeat_at = ? WHERE status = ? AND owner = ? '
+            f'AND id IN ({",".join("?" * len(job_ids))})',
+            (time.time(), RUNNING, owner, *job_ids),
+        )
+
+    def complete(self, job_id, result, owner=None):
+        """Record a result. With `owner`, only if that owner still holds the job."""
+        # The upload is no longer needed once the job succeeded
+        return self._finish(
+            'status = ?, result = ?, error = NULL, payload = NULL, finished_at = ?',
+            (DONE, json.dumps(result), time.time()), job_id, owner,
+        )
+
+    def fail(self, job_id, error, owner=None):
+        return self._finish('status = ?, error = ?, finished_at = ?', (FAILED, error, time.time()), job_id, owner)
+
+    def _finish(self, assignments, values, job_id, owner):
+        if owner is None:
+            cursor = self._connect().execute(f'UPDATE jobs SET {assignments} WHERE id = ?', (*values, job_id))
+        else:
+            cursor = self._connect().execute(
+                f'UPDATE jobs SET {assignments} WHERE id = ? AND status = ? AND owner = ?',
+                (*values, job_id, RUNNING, owner),
+            )
+        return cursor.rowcount == 1
+
+    def retry(self, job_id):
+        """Queue a failed job again. Returns False if it is not in a retryable state."""
+        cursor = self._connect().execute(
+            'UPDATE jobs SET status = ?, error = NULL, started_at = NULL, finished_at = NULL '
+            'WHERE id = ? AND status = ? AND payload IS NOT NULL',
+            (QUEUED, job_id, FAILED),
+        )
+        return cursor.rowcount == 1
+
+    def requeue_expired(self, lease=JOB_LEASE_SECONDS, max_attempts=JOB_MAX_ATTEMPTS):
+        """
+        Put running jobs whose owner stopped sending heartbeats for `lease`
+        seconds (crashed or killed worker) back in the queue; returns how
+        many. Jobs already claimed `max_attempts` times are marked failed
+        instead, so a file that kills its worker is not retried forever.
+        Jobs of live workers, in this or any other process, are left alone.
+        """
+        conn = self._connect()
+        expired = 'status = ? AND COALESCE(heartbeat_at, started_at, 0) < ?'
+        cutoff = time.time() - lease
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute(
+                f"UPDATE jobs SET status = ?, error = 'Worker stopped during each of ' || attempts || ' attempts', "
+                f'owner = NULL, finished_at = ? WHERE {expired} AND attempts >= ?',
+                (FAILED, time.time(), RUNNING, cutoff, max_attempts),
+            )
+            cursor = conn.execute(
+                f'UPDATE jobs SET status = ?, started_at = NULL, owner = NULL, heartbeat_at = NULL WHERE {expired}',
+                (QUEUED, RUNNING, cutoff),
+            )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return cursor.rowcount
+
+    def prune(self, retention_hours=JOB_RETENTION_HOURS):
+        """Delete done and failed jobs that finished over `retention_hours` ago; returns how many."""
+        cursor = self._connect().execute(
+            'DELETE FROM jobs WHERE status IN (?, ?) AND finished_at < ?',
+            (DONE, FAILED, time.time() - retention_hours * 3600),
+        )
+        return cursor.rowcount
+
+    def get(self, job_id):
+        """Public view of a job (no upload bytes), or None if unknown."""
+        row = self._connect().execute(
+            'SELECT id, status, filename, result, error, attempts, created_at, started_at, finished_at '
+            'FROM jobs WHERE id = ?', (job_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job['result'] = json.loads(job['result']) if job['result'] else None
+        return job
+
+    def counts(self):
+        rows = self._connect().execute('SELECT status, COUNT(*) FROM jobs GROUP BY status').fetchall()
+        return {status: count for status, count in rows}
+
+
+class JobQueue:
+    """
+    Background worker threads draining a JobStore.
+
+    `handler(filename, payload, params)` returns the JSON-serialisable
+    result; an exception marks the job failed with its message. Workers
+    sleep until `notify()` or JOB_POLL_INTERVAL, so jobs submitted by other
+    processes are picked up too. While jobs run, a heartbeat thread renews
+    their leases; idle workers periodically requeue expired leases and
+    prune old jobs (see sweep()).
+    """
+
+    def __init__(self, store, handler, workers=JOB_WORKERS, poll_interval=JOB_POLL_INTERVAL,
+                 lease=JOB_LEASE_SECONDS, sweep_interval=JOB_SWEEP_INTERVAL):
+        self.store = store
+        self.handler = handler
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.lease = lease
+        self.sweep_interval = sweep_interval
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._threads = []
+        self._active = set()
+        self._active_lock = threading.Lock()
+        self._sweep_lock = threading.Lock()
+        self._last_sweep = None
+
+    def start(self):
+        if self._threads:
+            return
+        self._last_sweep = time.monotonic()
+        self.sweep()
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"job-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        if self.workers:
+            thread = threading.Thread(target=self._heartbeat, name='job-heartbeat', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def sweep(self):
+        """Requeue jobs whose lease expired and prune old finished jobs."""
+        if not self._sweep_lock.acquire(blocking=False):
+            return
+        try:
+            self._last_sweep = time.monotonic()
+            requeued = self.store.requeue_expired(self.lease)
+            if requeued:
+                logging.info(f"Requeued {requeued} abandoned analysis jobs")
+            pruned = self.store.prune()
+            if pruned:
+                logging.info(f"Pruned {pruned} finished analysis jobs")
+        finally:
+            self._sweep_lock.release()
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+        self._stop.clear()
+
+    def notify(self):
+        """Wake idle workers after a submit."""
+        self._wake.set()
+
+    def run_one(self):
+        """Claim and process one job. Returns False when the queue is empty."""
+        owner = worker_id()
+        job = self.store.claim(owner)
+        if job is None:
+            return False
+        logging.info(f"Job {job['id']} started (attempt {job['attempts']})")
+        with self._active_lock:
+            self._active.add(job['id'])
+        try:
+            try:
+                result = self.handler(job['filename'], job['payload'], json.loads(job['params']))
+            except Exception as e:
+                logging.error(f"Job {job['id']} failed: {e}", exc_info=True)
+                recorded = self.store.fail(job['id'], str(e) or type(e).__name__, owner)
+            else:
+                recorded = self.store.complete(job['id'], result, owner)
+                if recorded:
+                    logging.info(f"Job {job['id']} done")
+            if not recorded:
+                logging.warning(f"Job {job['id']} lease lost; result discarded")
+        finally:
+            with self._active_lock:
+                self._active.discard(job['id'])
+        return True
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                if self.run_one():
+                    continue
+                if time.monotonic() - self._last_sweep >= self.sweep_interval:
+                    self.sweep()
+            except Exception as e:
+                logging.error(f"Job worker error: {e}", exc_info=True)
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+
+    def _heartbeat(self):
+        # Renew leases well before they expire
+        owner = worker_id()
+        while not self._stop.wait(self.lease / 3):
+            with self._active_lock:
+                active = list(self._active)
+            try:
+                self.store.heartbeat(active, owner)
+            except Exception as e:
+                logging.error(f"Job heartbeat error: {e}", exc_info=True)
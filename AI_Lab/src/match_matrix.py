@@ -0,0 +1,365 @@
+import logging
+import math
+import os
+
+import numpy as np
+
+from src.engine import CORE_CATEGORY, DATA_CATEGORY, ats_evidence, ats_job_features, category_credit, jd_tfidf_vector
+from src.idf import get_idf_model
+from src.jd_cache import get_jd_profile
+from src.taxonomy import get_taxonomy
+from src.text_analysis import analyze_text
+
+# Resumes x JDs are scored one block at a time; a block's intermediate
+# arrays are RESUME_CHUNK x JD_CHUNK float64 values
+RESUME_CHUNK = int(os.environ.get('MATCH_RESUME_CHUNK', '2048'))
+JD_CHUNK = int(os.environ.get('MATCH_JD_CHUNK', '64'))
+
+# A TF-IDF fitted on one resume/JD pair gives a term found in both idf 1 and
+# a term found in only one idf ln(3/2) + 1
+SINGLE_IDF_SQ = (math.log(3.0 / 2.0) + 1.0) ** 2
+
+
+class _SparseRows:
+    """CSR rows appended one document at a time."""
+
+    def __init__(self):
+        self.indptr = [0]
+        self.indices = []
+        self.values = []
+
+    def append(self, counts):
+        self.indices.extend(counts)
+        self.values.extend(counts.values())
+        self.indptr.append(len(self.indices))
+
+    def matrix(self, width):
+        from scipy.sparse import csr_matrix
+
+        matrix = csr_matrix(
+            (np.asarray(self.values, dtype=np.float64), np.asarray(self.indices, dtype=np.int32),
+             np.asarray(self.indptr, dtype=np.int32)),
+            shape=(len(self.indptr) - 1, width),
+        )
+        matrix.sort_indices()
+        return matrix
+
+
+def _term_counts(terms, vocabulary, grow):
+    counts = {}
+    for term in terms:
+        index = vocabulary.get(term)
+        if index is None:
+            if not grow:
+                continue
+            index = vocabulary[term] = len(vocabulary)
+        counts[index] = counts.get(index, 0) + 1
+    return counts
+
+
+def _square(matrix):
+    squared = matrix.copy()
+    squared.data **= 2
+    return squared
+
+
+def _mask(matrix):
+    mask = matrix.copy()
+    mask.data[:] = 1.0
+    return mask
+
+
+class ResumeSet:
+    """
+    Resumes prepared once for scoring against any number of JDs.
+
+    Each resume is analyzed, reduced to the arrays the ATS score needs and
+    dropped, so the set holds no texts:
+    - credits: N x C category match counts (as ats_score counts them)
+    - lengths: normalized text lengths
+    - words: N x W binary matrix of keyword-overlap words
+    - TF-IDF: N x V term counts over the resumes' vocabulary, or the
+      fitted IDF model's vectors when there is one
+    `resumes` may be any iterable of texts or TextAnalysis objects.
+    """
+
+    def __init__(self, resumes, taxonomy=None, idf_model=None):
+        self.taxonomy = taxonomy or get_taxonomy()
+        self.idf_model = idf_model
+        categories = self.taxonomy.categories
+        bonus = self.taxonomy.bonus_categories
+
+        credits, bonus_credits, lengths = [], [], []
+        self.word_ids, self.term_ids = {}, {}
+        words, terms = _SparseRows(), _SparseRows()
+        vectors = []
+        pending = []
+
+        for resume in resumes:
+            analysis = analyze_text(resume, self.taxonomy)
+            counts = category_credit(ats_evidence(analysis), self.taxonomy)
+            credits.append([counts[cat] for cat in categories])
+            bonus_credits.append(sum(counts[cat] for cat in categories if cat in bonus))
+            lengths.append(len(analysis.norm))
+            words.append({self.word_ids.setdefault(w, len(self.word_ids)): 1 for w in analysis.overlap})
+            if idf_model is None:
+                terms.append(_term_counts(analysis.terms, self.term_ids, grow=True))
+            else:
+                pending.append(analysis.terms)
+                if len(pending) >= RESUME_CHUNK:
+                    vectors.append(idf_model.transform_terms(pending))
+                    pending = []
+
+        self.n = len(lengths)
+        self.credits = np.array(credits, dtype=np.float64).reshape(self.n, len(categories))
+        self.bonus_credits = np.array(bonus_credits, dtype=np.float64)
+        self.lengths = np.array(lengths, dtype=np.int64)
+        self.words = words.matrix(len(self.word_ids))
+        if idf_model is None:
+            self.counts = terms.matrix(len(self.term_ids))
+            self.counts_sq = _square(self.counts)
+            self.counts_mask = _mask(self.counts)
+            self.sq_sums = np.asarray(self.counts_sq.sum(axis=1)).ravel()
+        else:
+            from scipy.sparse import csr_matrix, vstack
+
+            if pending:
+                vectors.append(idf_model.transform_terms(pending))
+            self.vectors = vstack(vectors, format='csr') if vectors else csr_matrix((0, len(idf_model.terms)))
+
+    def __len__(self):
+        return self.n
+
+
+class JDSet:
+    """
+    Job descriptions prepared against a ResumeSet: their cached ATS features
+    as arrays, overlap words and TF-IDF terms over the resumes' vocabularies.
+    """
+
+    def __init__(self, jds, resumes):
+        taxonomy = resumes.taxonomy
+        categories = taxonomy.categories
+        bonus = taxonomy.bonus_categories
+
+        counts, bonus_counts, empty, word_totals, sq_sums = [], [], [], [], []
+        words, terms = _SparseRows(), _SparseRows()
+        vectors = []
+        for jd in jds:
+            profile = get_jd_profile(jd, taxonomy)
+            features = profile.part('ats', ats_job_features)
+            counts.append([features.counts[cat] for cat in categories])
+            bonus_counts.append(sum(features.counts[cat] for cat in categories if cat in bonus))
+            empty.append(not features.norm)
+            word_totals.append(len(features.words))
+            words.append({resumes.word_ids[w]: 1 for w in features.words if w in resumes.word_ids})
+            if resumes.idf_model is None:
+                # Terms no resume has still count towards the JD's norm
+                all_counts = _term_counts(features.analysis.terms, {}, grow=True)
+                sq_sums.append(float(sum(c * c for c in all_counts.values())))
+                terms.append(_term_counts(features.analysis.terms, resumes.term_ids, grow=False))
+            else:
+                vectors.append(jd_tfidf_vector(profile, resumes.idf_model))
+
+        self.m = len(empty)
+        self.counts = np.array(counts, dtype=np.float64).reshape(self.m, len(categories))
+        self.bonus_counts = np.array(bonus_counts, dtype=np.float64)
+        self.empty = np.array(empty, dtype=bool)
+        self.word_totals = np.array(word_totals, dtype=np.float64)
+        self.words = words.matrix(len(resumes.word_ids))
+        if resumes.idf_model is None:
+            self.counts_tf = terms.matrix(len(resumes.term_ids))
+            self.counts_sq = _square(self.counts_tf)
+            self.counts_mask = _mask(self.counts_tf)
+            self.sq_sums = np.array(sq_sums, dtype=np.float64)
+        else:
+            from scipy.sparse import csr_matrix, vstack
+
+            self.vectors = vstack(vectors, format='csr') if vectors else csr_matrix((0, len(resumes.idf_model.terms)))
+
+    def __len__(self):
+        return self.m
+
+
+# ========== BLOCK SCORING ==========
+def _cosine_block(resumes, jds, rows, cols):
+    """TF-IDF cosine similarity of every resume in `rows` against every JD in `cols`."""
+    if resumes.idf_model is not None:
+        return (resumes.vectors[rows] @ jds.vectors[cols].T).toarray()
+
+    # Per pair, a TF-IDF fitted on [resume, jd] alone; shared terms have idf 1
+    # on both sides, so only they feed the dot product
+    dot = (resumes.counts[rows] @ jds.counts_tf[cols].T).toarray()
+    resume_shared_sq = (resumes.counts_sq[rows] @ jds.counts_mask[cols].T).toarray()
+    jd_shared_sq = (resumes.counts_mask[rows] @ jds.counts_sq[cols].T).toarray()
+
+    resume_norm_sq = SINGLE_IDF_SQ * (resumes.sq_sums[rows, None] - resume_shared_sq) + resume_shared_sq
+    jd_norm_sq = SINGLE_IDF_SQ * (jds.sq_sums[None, cols] - jd_shared_sq) + jd_shared_sq
+    denom = np.sqrt(resume_norm_sq * jd_norm_sq)
+
+    cosine = np.zeros_like(denom)
+    nonzero = denom > 0
+    cosine[nonzero] = dot[nonzero] / denom[nonzero]
+    return cosine
+
+
+def score_block(resumes, jds, rows=slice(None), cols=slice(None)):
+    """
+    Unrounded ATS scores of the resumes in `rows` (ResumeSet) against the JDs
+    in `cols` (JDSet), as an n x m array. Rounding each entry with
+    round(score, 1) gives exactly ats_score(resume, jd); rank on the rounded
+    block (_round_block), since distinct unrounded scores can round to a tie.
+    """
+    taxonomy = resumes.taxonomy
+    categories = taxonomy.categories
+    matches = resumes.credits[rows]
+    in_jd = jds.counts[cols]
+    n, m = len(matches), len(in_jd)
+
+    # 1. TF-IDF Cosine Similarity
+    try:
+        cosine_sim = _cosine_block(resumes, jds, rows, cols)
+    except Exception as e:
+        logging.warning(f"TF-IDF calculation failed: {e}")
+        cosine_sim = np.zeros((n, m))
+
+    # 2. Weighted category coverage, with and without the bonus categories;
+    # each JD uses one depending on whether it asks for bonus skills.
+    # Accumulated category by category, in order (same rounding as ats_score)
+    bonus_weight = math.fsum(taxonomy.weights[cat] for cat in taxonomy.bonus_categories)
+    remaining_weight = taxonomy.total_weight - bonus_weight
+    with_bonus = np.zeros((n, m))
+    without_bonus = np.zeros((n, m))
+    pct = {}
+    for c, cat in enumerate(categories):
+        present = in_jd[:, c] > 0
+        safe_in_jd = np.where(present, in_jd[:, c], 1.0)
+        pct[cat] = np.where(present[None, :], matches[:, c, None] / safe_in_jd[None, :] * 100, 0.0)
+        with_bonus = with_bonus + pct[cat] * taxonomy.weights[cat]
+        if cat not in taxonomy.bonus_categories and remaining_weight > 0:
+            without_bonus = without_bonus + pct[cat] * (taxonomy.weights[cat] / remaining_weight)
+    bonus_in_jd = jds.bonus_counts[cols]
+    weighted_score = np.minimum(100.0, np.where(bonus_in_jd[None, :] > 0, with_bonus, without_bonus))
+
+    # 3. Keyword Overlap: shared words over the JD's word count
+    overlap = (resumes.words[rows] @ jds.words[cols].T).toarray()
+    word_totals = jds.word_totals[cols]
+    overlap_score = np.where(word_totals[None, :] > 0, overlap / np.where(word_totals > 0, word_totals, 1.0)[None, :] * 100, 0.0)
+
+    # 4. Score combination with bonus addition
+    bonus_matches = resumes.bonus_credits[rows]
+    safe_bonus_in_jd = np.where(bonus_in_jd > 0, bonus_in_jd, 1.0)
+    bonus_addition = np.where(
+        (bonus_in_jd[None, :] > 0) & (bonus_matches[:, None] > 0),
+        np.minimum(8.0, (bonus_matches[:, None] / safe_bonus_in_jd[None, :]) * 15.0), 0.0,
+    )
+    final_score = (weighted_score * 0.6) + (overlap_score * 0.25) + (cosine_sim * 100 * 0.15)
+    final_score = np.minimum(100.0, final_score + bonus_addition)
+
+    # 5. Score bands and safeguards, as in ats_score
+    if CORE_CATEGORY in pct and DATA_CATEGORY in pct:
+        core, data = categories.index(CORE_CATEGORY), categories.index(DATA_CATEGORY)
+        checked = (in_jd[:, core] > 0) & (in_jd[:, data] > 0)
+        strong = checked[None, :] & (pct[CORE_CATEGORY] >= 80) & (pct[DATA_CATEGORY] >= 70)
+        final_score = np.where(strong, np.maximum(final_score, 70.0), final_score)
+
+    final_score = np.where(
+        final_score < 30, np.maximum(final_score, 30.0),
+        np.where(final_score > 65, np.minimum(100.0, final_score + 5.0), final_score)
+    )
+    resume_len = resumes.lengths[rows][:, None]
+    final_score = np.where(resume_len < 200, np.maximum(np.minimum(final_score, 50.0), 15.0), final_score)
+    final_score = np.where((resume_len >= 200) & (resume_len < 600) & (final_score < 25), 25.0, final_score)
+
+    # Without any overlap ats_score ends in its error handler and returns the
+    # 15.0 baseline; so does an empty resume or JD
+    has_overlap = (overlap_score > 0) | (cosine_sim > 0.01)
+    final_score = np.where(has_overlap, final_score, 15.0)
+    final_score = np.where((resume_len == 0) | jds.empty[cols][None, :], 15.0, final_score)
+    return np.maximum(final_score, 15.0)
+
+
+def _rounded(scores):
+    # Python's round() per score so results are bit-identical to ats_score
+    return min(round(scores, 1), 100.0)
+
+
+def _round_block(block):
+    return np.array([_rounded(s) for s in block.ravel().tolist()]).reshape(block.shape)
+
+
+# ========== MANY-TO-MANY SCORING ==========
+def ats_score_matrix(resumes, jds, taxonomy=None, resume_chunk=None, jd_chunk=None):
+    """
+    ATS scores of every resume against every JD: an N x M array where entry
+    [i, j] equals ats_score(resumes[i], jds[j]). Computed block by block
+    (resume_chunk x jd_chunk); the result itself is dense, so prefer
+    iter_top_matches for job-board sized inputs.
+    """
+    resume_set = resumes if isinstance(resumes, ResumeSet) else ResumeSet(resumes, taxonomy, get_idf_model())
+    jd_set = JDSet(jds, resume_set)
+    resume_chunk = resume_chunk or RESUME_CHUNK
+    jd_chunk = jd_chunk or JD_CHUNK
+
+    scores = np.empty((resume_set.n, jd_set.m))
+    for start in range(0, resume_set.n, resume_chunk):
+        rows = slice(start, start + resume_chunk)
+        for col in range(0, jd_set.m, jd_chunk):
+            cols = slice(col, col + jd_chunk)
+            scores[rows, cols] = _round_block(score_block(resume_set, jd_set, rows, cols))
+    return scores
+
+
+def iter_top_matches(resumes, jds, k=10, taxonomy=None, resume_chunk=None, jd_chunk=None):
+    """
+    Stream the k best resumes for each JD: yields (jd index, [(resume index,
+    ats_score), ...] best first) for every JD in order. Ties keep the lower
+    resume index first.
+
+    JDs are taken jd_chunk at a time and the resumes scored against them
+    resume_chunk at a time, keeping a running top-k per JD, so memory is
+    bounded by the block size and k rather than N x M. `resumes` may be a
+    prepared ResumeSet to reuse across calls.
+    """
+    resume_set = resumes if isinstance(resumes, ResumeSet) else ResumeSet(resumes, taxonomy, get_idf_model())
+    jds = list(jds)
+    resume_chunk = resume_chunk or RESUME_CHUNK
+    jd_chunk = jd_chunk or JD_CHUNK
+    k = min(k, resume_set.n)
+
+    for col in range(0, len(jds), jd_chunk):
+        jd_set = JDSet(jds[col:col + jd_chunk], resume_set)
+        best_scores = np.empty((jd_set.m, 0))
+        best_rows = np.empty((jd_set.m, 0), dtype=np.int64)
+        for start in range(0, resume_set.n, resume_chunk):
+            rows = slice(start, start + resume_chunk)
+            # Rank on the reported (rounded) scores so ties break by resume index
+            block = _round_block(score_block(resume_set, jd_set, rows).T)
+            block_rows = np.broadcast_to(np.arange(start, start + block.shape[1]), block.shape)
+            # Earlier (lower) resume indexes come first, so a stable sort keeps them ahead on ties
+            scores = np.concatenate([best_scores, block], axis=1)
+            indexes = np.concatenate([best_rows, block_rows], axis=1)
+            order = np.argsort(-scores, axis=1, kind='stable')[:, :k]
+            best_scores = np.take_along_axis(scores, order, axis=1)
+            best_rows = np.take_along_axis(indexes, order, axis=1)
+        for j in range(jd_set.m):
+            yield col + j, [(int(i), s) for i, s in zip(best_rows[j].tolist(), best_scores[j].tolist())]
+
+
+def top_matches_matrix(resumes, jds, k=10, taxonomy=None, resume_chunk=None, jd_chunk=None):
+    """
+    Sparse top-k score matrix: an M x N scipy CSR matrix whose row j holds
+    the ats_score of the k best resumes for JD j (see iter_top_matches).
+    """
+    from scipy.sparse import csr_matrix
+
+    resume_set = resumes if isinstance(resumes, ResumeSet) else ResumeSet(resumes, taxonomy, get_idf_model())
+    indptr, indices, values = [0], [], []
+    m = 0
+    for _, matches in iter_top_matches(resume_set, jds, k, resume_chunk=resume_chunk, jd_chunk=jd_chunk):
+        indices.extend(i for i, _ in matches)
+        values.extend(s for _, s in matches)
+        indptr.append(len(indices))
+        m += 1
+    return csr_matrix((np.asarray(values, dtype=np.float64), np.asarray(indices, dtype=np.int64),
+                       np.asarray(indptr, dtype=np.int64)), shape=(m, resume_set.n))
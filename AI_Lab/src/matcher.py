@@ -0,0 +1,137 @@
+import re
+
+
+def _is_word_char(ch):
+    """Same definition of a word character as the regex `\\w` class."""
+    return ch.isalnum() or ch == '_'
+
+
+class SkillHits:
+    """
+    Result of scanning one text with a SkillMatcher.
+
+    Answers the two questions the scorers ask about a term:
+    - contains(term): plain substring test (`term in text`)
+    - has_word(term): word-bounded test (`re.search(r'\\b' + term + r'\\b', text)`)
+
+    Terms that were not compiled into the matcher fall back to the
+    original string/regex checks so results never depend on the taxonomy.
+    """
+
+    __slots__ = ('text', '_contained', '_bounded', '_known')
+
+    def __init__(self, text, contained, bounded, known):
+        self.text = text
+        self._contained = contained
+        self._bounded = bounded
+        self._known = known
+
+    def contains(self, term):
+        if term in self._known:
+            return term in self._contained
+        return term in self.text
+
+    def has_word(self, term):
+        if term in self._known:
+            return term in self._bounded
+        return re.search(r'\b' + re.escape(term) + r'\b', self.text) is not None
+
+    @property
+    def words(self):
+        """Compiled terms found with word boundaries."""
+        return self._bounded
+
+
+class SkillMatcher:
+    """
+    Multi-pattern skill matcher (Aho-Corasick automaton).
+
+    Built once from every skill keyword and semantic equivalent, then finds
+    all of them in a single pass over the text. Per-request cost depends on
+    the text length only, not on the number of terms in the taxonomy.
+    """
+
+    def __init__(self, terms):
+        unique = []
+        seen = set()
+        for term in terms:
+            term = str(term).lower().strip()
+            if term and term not in seen:
+                seen.add(term)
+                unique.append(term)
+        self.terms = tuple(unique)
+        self.term_set = frozenset(unique)
+        self._build()
+
+    def _build(self):
+        goto = [{}]
+        out = [[]]
+        for term_id, term in enumerate(self.terms):
+            state = 0
+            for ch in term:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    out.append([])
+                state = nxt
+            out[state].append(term_id)
+
+        # Breadth-first pass to compute failure links and merge outputs
+        fail = [0] * len(goto)
+        queue = list(goto[0].values())
+        for state in queue:
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                out[nxt].extend(out[fail[nxt]])
+
+        self._goto = goto
+        self._fail = fail
+        self._out = [
+            tuple(
+                (self.terms[tid], len(self.terms[tid]),
+                 _is_word_char(self.terms[tid][0]), _is_word_char(self.terms[tid][-1]))
+                for tid in ids
+            )
+            for ids in out
+        ]
+        self._alphabet = frozenset(ch for transitions in goto for ch in transitions)
+
+    def scan(self, text):
+        """Find every compiled term in `text` in one pass. Returns SkillHits."""
+        text = text or ""
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        alphabet = self._alphabet
+        contained = set()
+        bounded = set()
+        text_len = len(text)
+        state = 0
+
+        for i, ch in enumerate(text):
+            if ch not in alphabet:
+                state = 0
+                continue
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not out[state]:
+                continue
+            for term, length, starts_word, ends_word in out[state]:
+                contained.add(term)
+                if term in bounded:
+                    continue
+                # Replicates `\b` on both ends of the term
+                start = i - length + 1
+                before = text[start - 1] if start > 0 else ''
+                after = text[i + 1] if i + 1 < text_len else ''
+                if _is_word_char(before) != starts_word and ends_word != _is_word_char(after):
+                    bounded.add(term)
+
+        return SkillHits(text, frozenset(contained), frozenset(bounded), self.term_set)
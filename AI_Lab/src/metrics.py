@@ -0,0 +1,153 @@
+import bisect
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+
+# Histogram bucket upper bounds in seconds, from a cached TXT read to a slow OCR run
+STAGE_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Stage durations of the request being served (None outside collect())
+_current = contextvars.ContextVar('stage_timings', default=None)
+
+
+def _labels(names, values):
+    return ','.join(f'{name}="{str(value)}"' for name, value in zip(names, values))
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class Counter:
+    """Monotonic counter keyed by label values."""
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def value(self, *label_values):
+        with self._lock:
+            return self._values.get(label_values, 0)
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} counter']
+        with self._lock:
+            items = sorted(self._values.items())
+        for label_values, value in items:
+            labels = _labels(self.labels, map(_escape, label_values))
+            lines.append(f'{self.name}{{{labels}}} {value}' if labels else f'{self.name} {value}')
+        return lines
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram keyed by label values. observe() is a bisect and
+    two additions under a lock, cheap enough to leave on for every request.
+    """
+
+    def __init__(self, name, help_text, labels=(), buckets=STAGE_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        # label values -> [per-bucket counts (+Inf last), sum, count]
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, *label_values):
+        with self._lock:
+            series = self._series.get(label_values)
+            return series[2] if series else 0
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            items = sorted((k, ([*v[0]], v[1], v[2])) for k, v in self._series.items())
+        for label_values, (counts, total, count) in items:
+            labels = _labels(self.labels, map(_escape, label_values))
+            prefix = labels + ',' if labels else ''
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f'{self.name}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_bucket{{{prefix}le="+Inf"}} {count}')
+            suffix = f'{{{labels}}}' if labels else ''
+            lines.append(f'{self.name}_sum{suffix} {total:.6f}')
+            lines.append(f'{self.name}_count{suffix} {count}')
+        return lines
+
+
+# ========== PROCESS-WIDE METRICS ==========
+# Metrics are per worker process; Prometheus sums them across scraped workers
+STAGE_SECONDS = Histogram('ai_lab_stage_duration_seconds', 'Time spent in each analysis stage', ('stage',))
+FILES_ANALYZED = Counter('ai_lab_resumes_analyzed_total', 'Resumes analyzed, by file type', ('file_type',))
+OCR_FALLBACKS = Counter('ai_lab_ocr_fallbacks_total', 'Extractions that used OCR text, by source', ('source',))
+ERRORS = Counter('ai_lab_errors_total', 'Errors caught during analysis, by stage', ('stage',))
+
+REGISTRY = (STAGE_SECONDS, FILES_ANALYZED, OCR_FALLBACKS, ERRORS)
+
+
+def observe(name, seconds):
+    """Record a stage duration in the histogram and in the current request's timings."""
+    STAGE_SECONDS.observe(seconds, name)
+    timings = _current.get()
+    if timings is not None:
+        timings[name] = timings.get(name, 0.0) + seconds
+
+
+@contextmanager
+def stage(name):
+    """Time the enclosed block as stage `name` (recorded even if it raises)."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - start)
+
+
+@contextmanager
+def collect():
+    """Collect {stage: seconds} for everything timed inside the block, in order."""
+    timings = {}
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        _current.reset(token)
+
+
+def server_timing(timings):
+    """Server-Timing header value, e.g. 'read;dur=12.4, ats;dur=3.1' (milliseconds)."""
+    return ', '.join(f'{name};dur={seconds * 1000:.1f}' for name, seconds in timings.items())
+
+
+def file_type(filename):
+    """Extension used as the file_type label; 'other' for anything unrecognised."""
+    extension = (filename or '').rsplit('.', 1)[-1].lower() if '.' in (filename or '') else ''
+    return extension if extension in ('pdf', 'docx', 'txt', 'png', 'jpg', 'jpeg') else 'other'
+
+
+def render_prometheus():
+    """All metrics in the Prometheus text exposition format."""
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,385 @@
+import io
+import logging
+import math
+import multiprocessing
+import os
+import platform
+import shutil
+import subprocess
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# PyMuPDF, pytesseract and Pillow are imported on first use: pytesseract
+# alone pulls in pandas, and text-only workers never need any of them
+
+# Seconds to wait before probing again after Tesseract was found missing
+RECHECK_INTERVAL = float(os.environ.get('OCR_RECHECK_INTERVAL', '60'))
+# Seconds allowed for `tesseract --version` / `--list-langs` during a probe
+PROBE_TIMEOUT = float(os.environ.get('OCR_PROBE_TIMEOUT', '10'))
+
+# Size of the process pool shared by all requests of this worker for page OCR
+OCR_WORKERS = max(1, int(os.environ.get('OCR_WORKERS') or min(4, os.cpu_count() or 1)))
+# The pool is created lazily from a request thread while other threads (OCR
+# probe, job workers, batch executor) run; forking then could copy a lock one
+# of them holds, so pool processes come from a forkserver (spawn on Windows)
+OCR_POOL_START_METHOD = os.environ.get('OCR_POOL_START_METHOD') or (
+    'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn')
+
+# Set OCR_PREPROCESS=0 to send images to Tesseract untouched
+PREPROCESS_ENABLED = os.environ.get('OCR_PREPROCESS', '1').lower() not in ('0', 'false', 'no', 'off')
+# Resolution PDF pages are rendered at for OCR. Pages are rendered at RENDER_DPI (PyMuPDF's
+# default, so OCR cost per page is unchanged) unless they are small enough to afford more detail
+# within PAGE_PIXELS (a letter page at 72 DPI), up to MAX_RENDER_DPI
+RENDER_DPI = int(os.environ.get('OCR_RENDER_DPI', '72'))
+MAX_RENDER_DPI = int(os.environ.get('OCR_MAX_RENDER_DPI', '200'))
+PAGE_PIXELS = int(os.environ.get('OCR_PAGE_PIXELS', str(612 * 792)))
+MAX_SIDE = int(os.environ.get('OCR_MAX_SIDE', '3000'))
+# Grayscale standard deviation below which a page is treated as blank
+BLANK_STDDEV = float(os.environ.get('OCR_BLANK_STDDEV', '2.5'))
+# Set OCR_BINARIZE=1 to threshold pages to 1-bit (Otsu) before Tesseract. Off by
+# default: Tesseract binarizes internally, and a hard global threshold can break
+# thin glyphs on low-resolution or low-contrast scans; no recall benchmark backs it yet
+BINARIZE_ENABLED = os.environ.get('OCR_BINARIZE', '0').lower() not in ('0', 'false', 'no', 'off')
+
+
+def settings_key():
+    """The OCR settings that shape OCR output, for extraction cache keys"""
+    return (f"preprocess={int(PREPROCESS_ENABLED)},binarize={int(BINARIZE_ENABLED)},dpi={RENDER_DPI},"
+            f"max_dpi={MAX_RENDER_DPI},pixels={PAGE_PIXELS},side={MAX_SIDE},blank={BLANK_STDDEV}")
+
+# Where Windows installers usually put Tesseract when it is not on PATH
+WINDOWS_TESSERACT_PATHS = [
+    r'C:\Program Files\Tesseract-OCR\tesseract.exe',
+    r'C:\Program Files (x86)\Tesseract-OCR\tesseract.exe',
+]
+
+
+class OcrEngine:
+    """
+    Process-wide registry of the Tesseract OCR capability.
+
+    Probes the binary, its version and installed language packs once and
+    remembers the result, so extraction no longer spawns `tesseract
+    --version` per upload. A failed probe is retried at most every
+    RECHECK_INTERVAL seconds, and an OCR call that finds the binary gone
+    marks the engine unavailable until the next successful probe.
+    """
+
+    def __init__(self, recheck_interval=RECHECK_INTERVAL):
+        self.recheck_interval = recheck_interval
+        self._lock = threading.Lock()
+        self._available = None
+        self.version = None
+        self.languages = []
+        self.command = None
+        self.last_error = None
+        self.probed_at = None
+        self.probes = 0
+
+    def probe(self):
+        """Probe Tesseract now. Returns True when it is usable."""
+        with self._lock:
+            return self._probe()
+
+    def _probe(self):
+        self.probes += 1
+        self.probed_at = time.time()
+        try:
+            command = self._find_command()
+            version = self._version(command)
+        except Exception as e:
+            self._available = False
+            self.version = None
+            self.languages = []
+            self.last_error = str(e) or type(e).__name__
+            logging.warning(f"Tesseract OCR not available: {self.last_error}")
+            return False
+
+        try:
+            languages = sorted(self._languages(command))
+        except Exception as e:
+            languages = []
+            logging.warning(f"Could not list Tesseract language packs: {e}")
+
+        self._available = True
+        self.version = version
+        self.languages = languages
+        self.command = command
+        self.last_error = None
+        logging.info(f"Tesseract OCR {self.version} ready (languages: {', '.join(languages) or 'unknown'})")
+        return True
+
+    # The probe runs the binary directly: pytesseract imports pandas, which
+    # would otherwise load in every worker shortly after start-up
+    def _find_command(self):
+        command = shutil.which('tesseract')
+        if command is None and platform.system() == 'Windows':
+            # Try to find Tesseract in common Windows locations
+            command = next((path for path in WINDOWS_TESSERACT_PATHS if os.path.exists(path)), None)
+        if command is None:
+            raise FileNotFoundError("tesseract is not installed or it's not in your PATH")
+        return command
+
+    def _run(self, command, *args):
+        """stdout and stderr of `tesseract <args>` (older versions print to stderr)"""
+        result = subprocess.run([command, *args], capture_output=True, text=True, timeout=PROBE_TIMEOUT)
+        if result.returncode != 0:
+            raise RuntimeError(f"tesseract {' '.join(args)} exited with {result.returncode}")
+        return result.stdout + result.stderr
+
+    def _version(self, command):
+        # First line is "tesseract 5.3.0" (or "tesseract v5.0.0-alpha...")
+        first_line = self._run(command, '--version').strip().splitlines()[0]
+        return first_line.split()[-1].lstrip('v')
+
+    def _languages(self, command):
+        # 'List of available languages in "<tessdata>" (N):' then one per line
+        lines = self._run(command, '--list-langs').strip().splitlines()
+        return [line.strip() for line in lines[1:] if line.strip()]
+
+    def _pytesseract(self):
+        """pytesseract, pointed at the probed binary; imported only to run OCR"""
+        import pytesseract
+
+        if self.command:
+            pytesseract.pytesseract.tesseract_cmd = self.command
+        return pytesseract
+
+    def available(self):
+        """Cached capability check; only re-probes after a failure."""
+        if self._available:
+            return True
+        with self._lock:
+            if self._available is None:
+                return self._probe()
+            if not self._available and time.time() - self.probed_at >= self.recheck_interval:
+                return self._probe()
+            return bool(self._available)
+
+    def mark_failed(self, error):
+        """Record that an OCR call could not run Tesseract."""
+        with self._lock:
+            self._available = False
+            self.last_error = str(error) or type(error).__name__
+            self.probed_at = time.time()
+        logging.error(f"Tesseract OCR failed, marking engine unavailable: {self.last_error}")
+
+    def image_to_string(self, image, **kwargs):
+        """OCR an uploaded or embedded image after preprocessing; blank images give ''."""
+        pytesseract = self._pytesseract()
+
+        image = preprocess_for_ocr(image)
+        if image is None:
+            return ""
+        try:
+            return pytesseract.image_to_string(image, **kwargs)
+        except pytesseract.TesseractNotFoundError as e:
+            self.mark_failed(e)
+            raise
+
+    def ocr_pdf_pages(self, pdf_source, page_numbers=None, document=None):
+        """
+        OCR the given pages of a PDF (all pages by default) and return their
+        texts in page order. `pdf_source` is a file path (preferred: pool
+        workers open it themselves instead of receiving pickled bytes) or
+        the PDF bytes.
+
+        Pages are split into contiguous chunks, one per pool worker; each
+        worker opens the document once, renders its pages and runs
+        Tesseract on them. Single chunks run inline without the pool,
+        reusing `document` when the caller already has it open.
+        """
+        pytesseract = self._pytesseract()
+
+        if page_numbers is None:
+            if document is not None:
+                page_numbers = list(range(document.page_count))
+            else:
+                with open_pdf(pdf_source) as opened:
+                    page_numbers = list(range(opened.page_count))
+        page_numbers = list(page_numbers)
+        if not page_numbers:
+            return []
+
+        workers = min(OCR_WORKERS, len(page_numbers))
+        size = -(-len(page_numbers) // workers)
+        chunks = [page_numbers[i:i + size] for i in range(0, len(page_numbers), size)]
+        command = pytesseract.pytesseract.tesseract_cmd
+
+        try:
+            if len(chunks) == 1:
+                if document is not None:
+                    return _ocr_document_pages(document, chunks[0])
+                return _ocr_pdf_page_range(pdf_source, chunks[0], command)
+            futures = [_get_pool().submit(_ocr_pdf_page_range, pdf_source, chunk, command) for chunk in chunks]
+            texts = []
+            for future in futures:
+                texts.extend(future.result())
+            return texts
+        except pytesseract.TesseractNotFoundError as e:
+            self.mark_failed(e)
+            raise
+        except BrokenProcessPool:
+            _reset_pool()
+            raise
+
+    def status(self):
+        return {
+            'available': bool(self._available),
+            'version': self.version,
+            'languages': self.languages,
+            'command': self.command,
+            'probed_at': self.probed_at,
+            'probes': self.probes,
+            'last_error': self.last_error,
+            'workers': OCR_WORKERS,
+        }
+
+
+def page_render_dpi(page):
+    """
+    RENDER_DPI, raised (up to MAX_RENDER_DPI) for small pages while the
+    image stays within PAGE_PIXELS, and lowered for oversized pages so the
+    long side stays within MAX_SIDE
+    """
+    width_inches, height_inches = page.rect.width / 72, page.rect.height / 72
+    if width_inches <= 0 or height_inches <= 0:
+        return RENDER_DPI
+    dpi = min(MAX_RENDER_DPI, max(RENDER_DPI, int(math.sqrt(PAGE_PIXELS / (width_inches * height_inches)))))
+    return max(1, min(dpi, int(MAX_SIDE / max(width_inches, height_inches))))
+
+
+def _otsu_threshold(histogram):
+    """Otsu's threshold from a 256-bin grayscale histogram"""
+    total = sum(histogram)
+    weighted_total = sum(i * count for i, count in enumerate(histogram))
+    background = weighted_background = 0
+    best_threshold, best_variance = 127, -1.0
+    for i, count in enumerate(histogram):
+        background += count
+        if background == 0:
+            continue
+        foreground = total - background
+        if foreground == 0:
+            break
+        weighted_background += i * count
+        mean_background = weighted_background / background
+        mean_foreground = (weighted_total - weighted_background) / foreground
+        variance = background * foreground * (mean_background - mean_foreground) ** 2
+        if variance > best_variance:
+            best_threshold, best_variance = i, variance
+    return best_threshold
+
+
+def is_blank(image):
+    """Cheap near-empty check on a reduced grayscale copy"""
+    from PIL import ImageStat
+
+    factor = max(1, max(image.size) // 512)
+    sample = image.reduce(factor) if factor > 1 else image
+    return ImageStat.Stat(sample).stddev[0] < BLANK_STDDEV
+
+
+def preprocess_for_ocr(image):
+    """
+    Prepare an image for Tesseract:
+    - Apply EXIF orientation (phone photos)
+    - Flatten transparency onto white and convert to grayscale
+    - Downscale so the long side is at most MAX_SIDE pixels
+    - Return None for near-empty pages
+    - Binarize with Otsu's threshold when OCR_BINARIZE is on (otherwise
+      Tesseract gets the grayscale image)
+    """
+    from PIL import Image, ImageOps
+
+    if not PREPROCESS_ENABLED:
+        return image
+    if image.getexif():
+        image = ImageOps.exif_transpose(image)
+    if image.mode in ('RGBA', 'LA', 'PA') or (image.mode == 'P' and 'transparency' in image.info):
+        rgba = image.convert('RGBA')
+        image = Image.new('RGBA', rgba.size, 'white')
+        image.alpha_composite(rgba)
+    if image.mode != 'L':
+        image = image.convert('L')
+    if max(image.size) > MAX_SIDE:
+        image = image.copy()
+        image.thumbnail((MAX_SIDE, MAX_SIDE), Image.LANCZOS, reducing_gap=2.0)
+    if is_blank(image):
+        return None
+    if not BINARIZE_ENABLED:
+        return image
+    threshold = _otsu_threshold(image.histogram())
+    return image.point([0 if i <= threshold else 255 for i in range(256)], '1')
+
+
+def _ocr_page(page):
+    """Render one PyMuPDF page and OCR it; blank pages are skipped"""
+    import fitz
+    import pytesseract
+    from PIL import Image
+
+    if not PREPROCESS_ENABLED:
+        pix = page.get_pixmap()
+        return pytesseract.image_to_string(Image.open(io.BytesIO(pix.tobytes("png"))))
+    # Rendered straight to grayscale at a DPI chosen from the page size
+    pix = page.get_pixmap(dpi=page_render_dpi(page), colorspace=fitz.csGRAY, alpha=False)
+    image = preprocess_for_ocr(Image.frombytes('L', (pix.width, pix.height), pix.samples))
+    if image is None:
+        return ""
+    return pytesseract.image_to_string(image)
+
+
+def _ocr_document_pages(document, page_numbers):
+    return [_ocr_page(document[page_num]) for page_num in page_numbers]
+
+
+def open_pdf(pdf_source):
+    """Open a PDF with PyMuPDF from a file path or bytes"""
+    import fitz
+
+    if isinstance(pdf_source, str):
+        return fitz.open(pdf_source, filetype="pdf")
+    return fitz.open(stream=pdf_source, filetype="pdf")
+
+
+def _ocr_pdf_page_range(pdf_source, page_numbers, tesseract_cmd):
+    """Pool task: OCR a run of pages from one opened copy of the document"""
+    import pytesseract
+
+    pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+    with open_pdf(pdf_source) as document:
+        return _ocr_document_pages(document, page_numbers)
+
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    """Bounded OCR process pool shared by every request in this process"""
+    global _pool, _pool_pid
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            _pool = ProcessPoolExecutor(max_workers=OCR_WORKERS,
+                                        mp_context=multiprocessing.get_context(OCR_POOL_START_METHOD))
+            _pool_pid = os.getpid()
+        return _pool
+
+
+def _reset_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None and _pool_pid == os.getpid():
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+_engine = OcrEngine()
+
+
+def get_ocr_engine():
+    return _engine
@@ -1,240 +1,330 @@
-import pdfplumber
-import docx
-import io
-import logging
-import re
-import os
-import platform
-from PIL import Image
-import pytesseract
-import fitz  # PyMuPDF
-
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
-
-# Detect OS and configure Tesseract path if needed
-def _check_tesseract_available():
-    """Check if Tesseract OCR is available, return True/False"""
-    try:
-        pytesseract.get_tesseract_version()
-        return True
-    except pytesseract.TesseractNotFoundError:
-        # Try to find Tesseract in common Windows locations
-        if platform.system() == 'Windows':
-            common_paths = [
-                r'C:\Program Files\Tesseract-OCR\tesseract.exe',
-                r'C:\Program Files (x86)\Tesseract-OCR\tesseract.exe',
-            ]
-            for path in common_paths:
-                if os.path.exists(path):
-                    pytesseract.pytesseract.tesseract_cmd = path
-                    try:
-                        pytesseract.get_tesseract_version()
-                        return True
-                    except:
-                        continue
-        return False
-    except Exception:
-        return False
-
-def normalize_text(text):
-    """
-    Normalizes extracted text:
-    - Lowercase
-    - Strip extra whitespace
-    - Remove null characters
-    - Strip non-readable characters
-    - Safely convert to UTF-8
-    """
-    if not text:
-        return ""
-    
-    # Ensure text is string (in case bytes slip through)
-    if isinstance(text, bytes):
-        text = text.decode('utf-8', errors='ignore')
-    
-    # Remove null characters and other control characters
-    text = re.sub(r'[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]', ' ', text)
-    
-    # Lowercase and strip
-    text = text.lower().strip()
-    
-    # Replace multiple spaces/newlines with single space
-    text = " ".join(text.split())
-    
-    return text
-
-def extract_text_from_resume(file):
-    """
-    ROBUST resume text extraction pipeline for PDF, DOCX, PNG, JPG, TXT.
-    
-    Pipeline:
-    - PDF: Try text extraction → if < 300 chars, fallback to OCR
-    - DOCX: Extract text + OCR embedded images
-    - PNG/JPG: Always use OCR
-    - TXT: Read directly
-    
-    Returns: (normalized_text, warning_message)
-    - Never returns empty text unless file is truly unreadable
-    - Warnings are non-blocking
-    - OCR errors are handled gracefully
-    """
-    filename = getattr(file, 'filename', getattr(file, 'name', '')).lower()
-    text = ""
-    warning = None
-    tesseract_available = _check_tesseract_available()
-    
-    logging.info(f"Starting text extraction for file: {filename}")
-    
-    try:
-        # Ensure we're at the start of the file
-        if hasattr(file, 'seek'):
-            file.seek(0)
-        
-        # ========== PDF HANDLING ==========
-        if filename.endswith('.pdf'):
-            text_extracted = False
-            
-            # Step 1: Try text-based extraction first
-            try:
-                file.seek(0)
-                with pdfplumber.open(file) as pdf:
-                    pages_text = []
-                    for page in pdf.pages:
-                        extracted = page.extract_text()
-                        if extracted:
-                            pages_text.append(extracted)
-                    text = "\n".join(pages_text)
-                    text_extracted = True
-                    logging.info(f"PDF text extraction: {len(text)} chars")
-            except Exception as e:
-                logging.warning(f"PDF text extraction failed: {e}")
-                text = ""
-            
-            # Step 2: If text extraction failed or too short (< 300 chars), try OCR
-            if not text_extracted or len(text.strip()) < 300:
-                if tesseract_available:
-                    try:
-                        file.seek(0)
-                        pdf_document = fitz.open(stream=file.read(), filetype="pdf")
-                        ocr_text = ""
-                        for page_num in range(pdf_document.page_count):
-                            page = pdf_document[page_num]
-                            pix = page.get_pixmap()
-                            img_data = pix.tobytes("png")
-                            img = Image.open(io.BytesIO(img_data))
-                            ocr_text += pytesseract.image_to_string(img) + "\n"
-                        pdf_document.close()
-                        
-                        # Use OCR text if it's better
-                        if len(ocr_text.strip()) > len(text.strip()):
-                            text = ocr_text
-                            logging.info(f"PDF OCR successful: {len(ocr_text)} chars")
-                            warning = "Scanned PDF detected. OCR was used - accuracy may be reduced."
-                        elif len(text.strip()) < 300:
-                            # Use OCR even if shorter, as it might be better quality
-                            text = ocr_text if ocr_text.strip() else text
-                            warning = "PDF text extraction was limited. OCR was used - accuracy may be reduced."
-                    except Exception as ocr_e:
-                        logging.warning(f"PDF OCR failed: {ocr_e}")
-                        if not text:
-                            warning = "Scanned resume detected. Please upload a text-based PDF or DOCX for best results."
-                else:
-                    # Tesseract not available
-                    if not text or len(text.strip()) < 300:
-                        warning = "Scanned resume detected. Please upload a text-based PDF or DOCX for best results."
-        
-        # ========== DOCX HANDLING ==========
-        elif filename.endswith('.docx'):
-            try:
-                file.seek(0)
-                doc = docx.Document(file)
-                text = "\n".join([p.text for p in doc.paragraphs])
-                logging.info(f"DOCX text extraction: {len(text)} chars")
-                
-                # Try OCR for embedded images (optional enhancement)
-                if tesseract_available:
-                    try:
-                        ocr_text = ""
-                        for rel in doc.part.rels.values():
-                            if "image" in rel.reltype:
-                                image_part = rel.target_part
-                                image_data = image_part.blob
-                                img = Image.open(io.BytesIO(image_data))
-                                page_text = pytesseract.image_to_string(img)
-                                ocr_text += page_text + "\n"
-                        if ocr_text.strip():
-                            text += "\n" + ocr_text
-                            logging.info(f"DOCX OCR extracted additional {len(ocr_text)} chars from images")
-                    except Exception as e:
-                        logging.warning(f"DOCX image OCR failed: {e}")
-            except Exception as e:
-                logging.error(f"DOCX extraction failed: {e}")
-                text = ""
-                warning = f"Failed to extract text from DOCX: {str(e)}"
-        
-        # ========== IMAGE HANDLING (PNG/JPG) ==========
-        elif filename.endswith(('.png', '.jpg', '.jpeg')):
-            if tesseract_available:
-                try:
-                    file.seek(0)
-                    image_bytes = file.read()
-                    image = Image.open(io.BytesIO(image_bytes))
-                    text = pytesseract.image_to_string(image)
-                    logging.info(f"Image OCR extracted {len(text)} chars")
-                    warning = "Image resume detected. OCR was used - accuracy may be reduced."
-                except Exception as e:
-                    logging.error(f"Image OCR failed: {e}")
-                    text = ""
-                    warning = f"Failed to extract text from image: {str(e)}. Please ensure it's a clear, readable image."
-            else:
-                # Tesseract not available
-                text = ""
-                warning = "Scanned resume detected. Please upload a text-based PDF or DOCX for best results."
-        
-        # ========== TXT HANDLING ==========
-        else:
-            try:
-                file.seek(0)
-                content = file.read()
-                if isinstance(content, bytes):
-                    text = content.decode("utf-8", errors="ignore")
-                else:
-                    text = str(content)
-                logging.info(f"TXT extraction: {len(text)} chars")
-            except Exception as e:
-                logging.error(f"TXT extraction failed: {e}")
-                text = ""
-                warning = f"Failed to read text file: {str(e)}"
-        
-        # ========== TEXT NORMALIZATION ==========
-        cleaned_text = normalize_text(text)
-        
-        # ========== TEXT VALIDATION (NON-BLOCKING) ==========
-        # Minimum threshold: 150 characters
-        # If text is short, show WARNING (not error) and continue
-        if len(cleaned_text) < 150:
-            if not warning:
-                warning = "Resume text is very short. ATS accuracy may be reduced."
-            logging.warning(f"Extracted text very short: {len(cleaned_text)} chars")
-        elif len(cleaned_text) < 300:
-            logging.info(f"Extracted text somewhat short: {len(cleaned_text)} chars")
-        
-        # NEVER return empty text unless file is truly unreadable
-        # If we have any text, use it (even if short)
-        if cleaned_text:
-            logging.info(f"Successfully extracted {len(cleaned_text)} chars from {filename}")
-            return cleaned_text, warning
-        else:
-            # Only return empty if we truly couldn't extract anything
-            logging.error(f"Failed to extract any text from {filename}")
-            return "", warning or "Could not extract text from resume. Please try a different file format."
-        
-    except Exception as e:
-        logging.error(f"Error parsing resume {filename}: {str(e)}", exc_info=True)
-        # Return any partial text we might have, with warning
-        partial_text = normalize_text(text) if text else ""
-        return partial_text, f"Resume parsing encountered issues: {str(e)}. Results may be incomplete."
-
-# Alias for backward compatibility with app.py
+import hashlib
+import io
+import logging
+import re
+import os
+import src.metrics as metrics
+from src.ocr import get_ocr_engine, open_pdf, settings_key as ocr_settings_key
+from src.text_cache import get_text_cache
+from src.upload import SpooledUpload
+
+# Format libraries (pdfplumber, python-docx, Pillow, PyMuPDF via src.ocr) are
+# imported by the branch that needs them, so a worker only loads what it reads
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Bump whenever extraction output changes so cached results are not reused
+EXTRACTOR_VERSION = '4'
+
+# Pages whose text layer is shorter than this are OCR'd (scans, image pages)
+PAGE_TEXT_MIN_CHARS = int(os.environ.get('PDF_PAGE_TEXT_MIN_CHARS', '50'))
+
+# File types whose extraction can involve OCR
+OCR_EXTENSIONS = ('.pdf', '.docx', '.png', '.jpg', '.jpeg')
+
+def _check_tesseract_available():
+    """Check if Tesseract OCR is available, return True/False (probed once per process)"""
+    return get_ocr_engine().available()
+
+# ========== PDF TEXT BACKENDS ==========
+# Backends take the PDF as a file path or bytes, plus the already opened
+# PyMuPDF document when there is one
+def _pymupdf_page_texts(source, document=None):
+    """Fast text layer via PyMuPDF get_text (default backend)"""
+    if document is None:
+        with open_pdf(source) as opened:
+            return [page.get_text() for page in opened]
+    return [page.get_text() for page in document]
+
+def _pdfplumber_page_texts(source, document=None):
+    """High-fidelity layout analysis via pdfplumber (slower, opt-in)"""
+    import pdfplumber
+
+    with pdfplumber.open(source if isinstance(source, str) else io.BytesIO(source)) as pdf:
+        return [page.extract_text() or "" for page in pdf.pages]
+
+PDF_BACKENDS = {
+    'pymupdf': _pymupdf_page_texts,
+    'pdfplumber': _pdfplumber_page_texts,
+}
+
+# Backend used when a request does not pick one
+PDF_BACKEND = os.environ.get('PDF_TEXT_BACKEND', 'pymupdf').lower()
+
+def resolve_pdf_backend(name=None):
+    """Validate a backend name, falling back to the configured default"""
+    backend = (name or PDF_BACKEND).lower()
+    if backend not in PDF_BACKENDS:
+        raise ValueError(f"Unknown PDF backend '{backend}'. Choose one of: {', '.join(PDF_BACKENDS)}")
+    return backend
+
+def _pages_needing_ocr(page_texts):
+    """
+    Page numbers that lack a real text layer. When the text layer could not
+    be read at all (page_texts is None), every page needs OCR.
+    """
+    if page_texts is None:
+        return None
+    return [i for i, page_text in enumerate(page_texts) if len(page_text.strip()) < PAGE_TEXT_MIN_CHARS]
+
+def normalize_text(text):
+    """
+    Normalizes extracted text:
+    - Lowercase
+    - Strip extra whitespace
+    - Remove null characters
+    - Strip non-readable characters
+    - Safely convert to UTF-8
+    """
+    if not text:
+        return ""
+    
+    # Ensure text is string (in case bytes slip through)
+    if isinstance(text, bytes):
+        text = text.decode('utf-8', errors='ignore')
+    
+    # Remove null characters and other control characters
+    text = re.sub(r'[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]', ' ', text)
+    
+    # Lowercase and strip
+    text = text.lower().strip()
+    
+    # Replace multiple spaces/newlines with single space
+    text = " ".join(text.split())
+    
+    return text
+
+def _text_cache_key(data, filename, tesseract_available, pdf_backend):
+    """
+    SHA-256 of the uploaded bytes plus everything else that shapes the
+    extraction result: extractor version, file type, PDF backend, OCR
+    availability and, when OCR can run, the OCR render/preprocess settings.
+    """
+    extension = os.path.splitext(filename)[1]
+    backend = pdf_backend if extension == '.pdf' else ''
+    ocr_settings = ocr_settings_key() if tesseract_available else ''
+    digest = hashlib.sha256()
+    digest.update(f"{EXTRACTOR_VERSION}|{extension}|{backend}|{int(tesseract_available)}|{ocr_settings}|".encode('utf-8'))
+    digest.update(data)
+    return digest.hexdigest()
+
+def extract_text_from_resume(file, pdf_backend=None):
+    """
+    Cached front end of the extraction pipeline.
+    
+    Identical uploads (same bytes, same extractor version and PDF backend)
+    are served from the disk-backed text cache instead of re-running
+    PyMuPDF/pdfplumber and OCR. `pdf_backend` picks the PDF text backend
+    (see PDF_BACKENDS); unknown names raise ValueError.
+    
+    The upload is spooled to disk once and memory-mapped; hashing and every
+    extractor read that single copy.
+    Returns: (normalized_text, warning_message)
+    """
+    pdf_backend = resolve_pdf_backend(pdf_backend)
+    if isinstance(file, SpooledUpload):
+        # Already spooled by the caller, who also closes it
+        return _extract_text_cached(file, pdf_backend)
+    with SpooledUpload(file) as upload:
+        return _extract_text_cached(upload, pdf_backend)
+
+def _extract_text_cached(upload, pdf_backend):
+    cache = get_text_cache()
+    if cache is None:
+        return _extract_text_uncached(upload, pdf_backend)
+    
+    try:
+        # OCR availability only shapes the result of formats that can be OCR'd
+        ocr_possible = upload.filename.endswith(OCR_EXTENSIONS) and _check_tesseract_available()
+        key = _text_cache_key(upload.buffer, upload.filename, ocr_possible, pdf_backend)
+        cached = cache.get(key)
+    except Exception as e:
+        logging.warning(f"Resume text cache lookup failed: {e}")
+        return _extract_text_uncached(upload, pdf_backend)
+    
+    if cached is not None:
+        logging.info(f"Text cache hit for {upload.filename} ({len(cached[0])} chars)")
+        return cached
+    
+    text, warning = _extract_text_uncached(upload, pdf_backend)
+    # Only successful extractions are cached; failures may be transient
+    if text and not (warning and warning.startswith(('Resume parsing encountered issues', 'Failed to'))):
+        try:
+            cache.put(key, text, warning)
+        except Exception as e:
+            logging.warning(f"Resume text cache store failed: {e}")
+    return text, warning
+
+def _extract_text_uncached(upload, pdf_backend=None):
+    """
+    ROBUST resume text extraction pipeline for PDF, DOCX, PNG, JPG, TXT.
+    
+    Pipeline:
+    - PDF: Text layer per page (PyMuPDF or pdfplumber) → OCR only the pages without one
+    - DOCX: Extract text + OCR embedded images
+    - PNG/JPG: Always use OCR
+    - TXT: Read directly
+    
+    Returns: (normalized_text, warning_message)
+    - Never returns empty text unless file is truly unreadable
+    - Warnings are non-blocking
+    - OCR errors are handled gracefully
+    
+    `upload` is a SpooledUpload; extractors open its path directly.
+    """
+    filename = upload.filename
+    text = ""
+    warning = None
+    logging.info(f"Starting text extraction for file: {filename}")
+    
+    try:
+        # ========== PDF HANDLING ==========
+        if filename.endswith('.pdf'):
+            backend = resolve_pdf_backend(pdf_backend)
+            # Opened once from the spool file, shared by the text backend and OCR
+            try:
+                document = open_pdf(upload.path)
+            except Exception as e:
+                logging.warning(f"PDF could not be opened with PyMuPDF: {e}")
+                document = None
+            
+            try:
+                # Step 1: Text layer of every page
+                try:
+                    page_texts = PDF_BACKENDS[backend](upload.path, document)
+                    logging.info(f"PDF text extraction ({backend}): {sum(len(t) for t in page_texts)} chars over {len(page_texts)} pages")
+                except Exception as e:
+                    logging.warning(f"PDF text extraction ({backend}) failed: {e}")
+                    page_texts = None
+                
+                # Step 2: OCR only the pages without a usable text layer
+                ocr_pages = _pages_needing_ocr(page_texts)
+                needs_ocr = ocr_pages is None or bool(ocr_pages)
+                if needs_ocr and _check_tesseract_available():
+                    try:
+                        # Pages are rendered and OCR'd in parallel, results in page order
+                        with metrics.stage('ocr'):
+                            ocr_texts = get_ocr_engine().ocr_pdf_pages(upload.path, ocr_pages, document=document)
+                        if ocr_pages is None:
+                            ocr_pages = list(range(len(ocr_texts)))
+                            page_texts = [""] * len(ocr_texts)
+                        used = 0
+                        for page_num, ocr_text in zip(ocr_pages, ocr_texts):
+                            # Keep whichever is longer, the text layer may still be better
+                            if len(ocr_text.strip()) > len(page_texts[page_num].strip()):
+                                page_texts[page_num] = ocr_text
+                                used += 1
+                        if used:
+                            metrics.OCR_FALLBACKS.inc('pdf')
+                            logging.info(f"PDF OCR used for {used} of {len(page_texts)} pages")
+                            if used == len(page_texts):
+                                warning = "Scanned PDF detected. OCR was used - accuracy may be reduced."
+                            else:
+                                warning = f"Scanned pages detected. OCR was used for {used} of {len(page_texts)} pages - accuracy may be reduced."
+                    except Exception as ocr_e:
+                        logging.warning(f"PDF OCR failed: {ocr_e}")
+            finally:
+                if document is not None:
+                    document.close()
+            
+            text = "\n".join(t for t in (page_texts or []) if t.strip())
+            if needs_ocr and not warning and len(text.strip()) < 300:
+                warning = "Scanned resume detected. Please upload a text-based PDF or DOCX for best results."
+        
+        # ========== DOCX HANDLING ==========
+        elif filename.endswith('.docx'):
+            try:
+                import docx
+
+                doc = docx.Document(upload.path)
+                text = "\n".join([p.text for p in doc.paragraphs])
+                logging.info(f"DOCX text extraction: {len(text)} chars")
+                
+                # Try OCR for embedded images (optional enhancement)
+                image_rels = [rel for rel in doc.part.rels.values() if "image" in rel.reltype]
+                if image_rels and _check_tesseract_available():
+                    try:
+                        from PIL import Image
+
+                        ocr_text = ""
+                        for rel in image_rels:
+                            image_part = rel.target_part
+                            image_data = image_part.blob
+                            img = Image.open(io.BytesIO(image_data))
+                            with metrics.stage('ocr'):
+                                page_text = get_ocr_engine().image_to_string(img)
+                            ocr_text += page_text + "\n"
+                        if ocr_text.strip():
+                            metrics.OCR_FALLBACKS.inc('docx_image')
+                            text += "\n" + ocr_text
+                            logging.info(f"DOCX OCR extracted additional {len(ocr_text)} chars from images")
+                    except Exception as e:
+                        logging.warning(f"DOCX image OCR failed: {e}")
+            except Exception as e:
+                logging.error(f"DOCX extraction failed: {e}")
+                text = ""
+                warning = f"Failed to extract text from DOCX: {str(e)}"
+        
+        # ========== IMAGE HANDLING (PNG/JPG) ==========
+        elif filename.endswith(('.png', '.jpg', '.jpeg')):
+            if _check_tesseract_available():
+                try:
+                    from PIL import Image
+
+                    with Image.open(upload.path) as image, metrics.stage('ocr'):
+                        text = get_ocr_engine().image_to_string(image)
+                    metrics.OCR_FALLBACKS.inc('image')
+                    logging.info(f"Image OCR extracted {len(text)} chars")
+                    warning = "Image resume detected. OCR was used - accuracy may be reduced."
+                except Exception as e:
+                    logging.error(f"Image OCR failed: {e}")
+                    text = ""
+                    warning = f"Failed to extract text from image: {str(e)}. Please ensure it's a clear, readable image."
+            else:
+                # Tesseract not available
+                text = ""
+                warning = "Scanned resume detected. Please upload a text-based PDF or DOCX for best results."
+        
+        # ========== TXT HANDLING ==========
+        else:
+            try:
+                # Decoded straight from the mapped upload
+                text = str(upload.buffer, "utf-8", errors="ignore")
+                logging.info(f"TXT extraction: {len(text)} chars")
+            except Exception as e:
+                logging.error(f"TXT extraction failed: {e}")
+                text = ""
+                warning = f"Failed to read text file: {str(e)}"
+        
+        # ========== TEXT NORMALIZATION ==========
+        cleaned_text = normalize_text(text)
+        
+        # ========== TEXT VALIDATION (NON-BLOCKING) ==========
+        # Minimum threshold: 150 characters
+        # If text is short, show WARNING (not error) and continue
+        if len(cleaned_text) < 150:
+            if not warning:
+                warning = "Resume text is very short. ATS accuracy may be reduced."
+            logging.warning(f"Extracted text very short: {len(cleaned_text)} chars")
+        elif len(cleaned_text) < 300:
+            logging.info(f"Extracted text somewhat short: {len(cleaned_text)} chars")
+        
+        # NEVER return empty text unless file is truly unreadable
+        # If we have any text, use it (even if short)
+        if cleaned_text:
+            logging.info(f"Successfully extracted {len(cleaned_text)} chars from {filename}")
+            return cleaned_text, warning
+        else:
+            # Only return empty if we truly couldn't extract anything
+            logging.error(f"Failed to extract any text from {filename}")
+            return "", warning or "Could not extract text from resume. Please try a different file format."
+        
+    except Exception as e:
+        logging.error(f"Error parsing resume {filename}: {str(e)}", exc_info=True)
+        # Return any partial text we might have, with warning
+        partial_text = normalize_text(text) if text else ""
+        return partial_text, f"Resume parsing encountered issues: {str(e)}. Results may be incomplete."
+
+# Alias for backward compatibility with app.py
 read_resume = extract_text_from_resume
\ No newline at end of file
@@ -0,0 +1,423 @@
+import argparse
+import logging
+import os
+import re
+import sqlite3
+import threading
+
+import numpy as np
+
+from src.skills import extract_skills
+from src.taxonomy import get_taxonomy
+
+# Pseudo-skill whose posting list holds every indexed resume (the NOT universe)
+ALL_RESUMES = ''
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS skill_postings (
+    skill TEXT PRIMARY KEY,
+    count INTEGER NOT NULL,
+    last_id INTEGER NOT NULL,
+    postings BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS resume_skills (
+    resume_id INTEGER PRIMARY KEY,
+    skills TEXT NOT NULL
+);
+"""
+
+
+# ========== POSTING LIST CODEC ==========
+def encode_postings(ids):
+    """
+    Sorted resume ids → bytes: gaps between consecutive ids as LEB128
+    varints (7 bits per byte, high bit = more bytes follow).
+    """
+    ids = np.asarray(ids, dtype=np.int64)
+    if len(ids) == 0:
+        return b''
+    gaps = np.diff(ids, prepend=0).astype(np.uint64)
+    nbytes = np.ones(len(gaps), dtype=np.int64)
+    rest = gaps >> np.uint64(7)
+    while rest.any():
+        nbytes += rest > 0
+        rest >>= np.uint64(7)
+    offsets = np.cumsum(nbytes) - nbytes
+    out = np.empty(int(nbytes.sum()), dtype=np.uint8)
+    for k in range(int(nbytes.max())):
+        mask = nbytes > k
+        chunk = (gaps[mask] >> np.uint64(7 * k)) & np.uint64(0x7F)
+        more = (nbytes[mask] > k + 1).astype(np.uint64) << np.uint64(7)
+        out[offsets[mask] + k] = (chunk | more).astype(np.uint8)
+    return out.tobytes()
+
+
+def decode_postings(data):
+    """Inverse of encode_postings, vectorized: bytes → sorted int64 ids."""
+    raw = np.frombuffer(data, dtype=np.uint8)
+    if len(raw) == 0:
+        return np.empty(0, dtype=np.int64)
+    is_last = raw < 0x80
+    starts = np.flatnonzero(np.concatenate(([True], is_last[:-1])))
+    group = np.cumsum(np.concatenate(([0], is_last[:-1].astype(np.int64))))
+    shifts = ((np.arange(len(raw)) - starts[group]) * 7).astype(np.uint64)
+    values = (raw & 0x7F).astype(np.uint64) << shifts
+    return np.cumsum(np.add.reduceat(values, starts)).astype(np.int64)
+
+
+# ========== BOOLEAN QUERIES ==========
+class QueryError(ValueError):
+    """Malformed boolean skill query."""
+
+
+_TOKEN_RE = re.compile(r'\s*(?:(\()|(\))|"([^"]*)"|([^\s()"]+))')
+_OPERATORS = ('AND', 'OR', 'NOT')
+
+
+def tokenize_query(query):
+    """
+    Split a query into '(' ')' 'AND' 'OR' 'NOT' and terms. Operators are
+    case-insensitive; consecutive bare words form one term ("machine
+    learning AND aws"); quotes keep a term together as well.
+    """
+    tokens = []
+    words = []
+
+    def flush():
+        if words:
+            tokens.append(('TERM', ' '.join(words).lower()))
+            words.clear()
+
+    pos = 0
+    query = query.strip()
+    while pos < len(query):
+        match = _TOKEN_RE.match(query, pos)
+        if not match or match.end() == pos:
+            raise QueryError(f"Cannot parse query near: {query[pos:]!r}")
+        pos = match.end()
+        open_paren, close_paren, quoted, word = match.groups()
+        if word is not None and word.upper() not in _OPERATORS:
+            words.append(word)
+            continue
+        flush()
+        if open_paren:
+            tokens.append(('(', '('))
+        elif close_paren:
+            tokens.append((')', ')'))
+        elif quoted is not None:
+            tokens.append(('TERM', ' '.join(quoted.lower().split())))
+        else:
+            tokens.append((word.upper(), word.upper()))
+    flush()
+    return tokens
+
+
+def parse_query(query):
+    """
+    Parse into a tree of ('term', name) / ('and', [...], [negated...]) /
+    ('or', [...]) / ('not', node). Precedence: NOT > AND > OR; "a NOT b"
+    means a AND NOT b.
+    """
+    tokens = tokenize_query(query)
+    if not tokens:
+        raise QueryError("Empty query")
+    pos = 0
+
+    def peek():
+        return tokens[pos][0] if pos < len(tokens) else None
+
+    def take(kind):
+        nonlocal pos
+        if peek() != kind:
+            found = tokens[pos][1] if pos < len(tokens) else 'end of query'
+            raise QueryError(f"Expected {kind}, found {found!r}")
+        pos += 1
+        return tokens[pos - 1]
+
+    def parse_or():
+        nodes = [parse_and()]
+        while peek() == 'OR':
+            take('OR')
+            nodes.append(parse_and())
+        return nodes[0] if len(nodes) == 1 else ('or', nodes)
+
+    def parse_and():
+        include, exclude = [], []
+        node = parse_unary()
+        (exclude if node[0] == 'not' else include).append(node[1] if node[0] == 'not' else node)
+        while peek() in ('AND', 'NOT', 'TERM', '('):
+            if peek() == 'AND':
+                take('AND')
+            node = parse_unary()
+            (exclude if node[0] == 'not' else include).append(node[1] if node[0] == 'not' else node)
+        if not exclude and len(include) == 1:
+            return include[0]
+        return ('and', include, exclude)
+
+    def parse_unary():
+        kind = peek()
+        if kind == 'NOT':
+            take('NOT')
+            return ('not', parse_unary())
+        if kind == '(':
+            take('(')
+            node = parse_or()
+            take(')')
+            return node
+        return ('term', take('TERM')[1])
+
+    tree = parse_or()
+    if pos != len(tokens):
+        raise QueryError(f"Unexpected {tokens[pos][1]!r}")
+    return tree
+
+
+def query_terms(tree):
+    """Every term name in a parsed query."""
+    kind = tree[0]
+    if kind == 'term':
+        return [tree[1]]
+    if kind == 'not':
+        return query_terms(tree[1])
+    if kind == 'or':
+        return [t for node in tree[1] for t in query_terms(node)]
+    return [t for node in tree[1] + tree[2] for t in query_terms(node)]
+
+
+# ========== INDEX ==========
+class SkillIndex:
+    """
+    Inverted index from taxonomy skill to a compressed posting list of
+    resume ids (the ResumeCorpus row ids), stored in SQLite.
+
+    New resumes get increasing ids, so indexing one appends a single varint
+    per skill. Queries load only the posting lists they name and evaluate
+    AND/OR/NOT with sorted-array intersection, union and difference. Terms
+    that are not taxonomy skills (e.g. "junior") fall back to
+    `term_lookup(term)`, typically the corpus full-text index.
+    """
+
+    def __init__(self, path, taxonomy=None, term_lookup=None):
+        self.path = path
+        self.taxonomy = taxonomy
+        self.term_lookup = term_lookup
+        self._local = threading.local()
+        self._connect().executescript(_SCHEMA)
+
+    def _connect(self):
+        # Connections are per thread and never reused across a fork
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _taxonomy(self):
+        return self.taxonomy or get_taxonomy()
+
+    def index_text(self, resume_id, text):
+        """Detect the taxonomy skills in `text` and index them; returns the skills."""
+        skills = extract_skills(text, self._taxonomy())
+        self.add(resume_id, skills)
+        return skills
+
+    def add(self, resume_id, skills):
+        """Index (or re-index) one resume under the given skills."""
+        resume_id = int(resume_id)
+        skills = sorted(set(skills))
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute('SELECT skills FROM resume_skills WHERE resume_id = ?', (resume_id,)).fetchone()
+            old = set(row[0].split('\n')) - {''} if row else set()
+            for skill in old - set(skills):
+                self._remove_id(conn, skill, resume_id)
+            for skill in set(skills) - old:
+                self._add_id(conn, skill, resume_id)
+            if row is None:
+                self._add_id(conn, ALL_RESUMES, resume_id)
+            conn.execute(
+                'INSERT OR REPLACE INTO resume_skills (resume_id, skills) VALUES (?, ?)',
+                (resume_id, '\n'.join(skills)),
+            )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+    def remove(self, resume_id):
+        resume_id = int(resume_id)
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute('SELECT skills FROM resume_skills WHERE resume_id = ?', (resume_id,)).fetchone()
+            if row is not None:
+                for skill in set(row[0].split('\n')) - {''}:
+                    self._remove_id(conn, skill, resume_id)
+                self._remove_id(conn, ALL_RESUMES, resume_id)
+                conn.execute('DELETE FROM resume_skills WHERE resume_id = ?', (resume_id,))
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return row is not None
+
+    def _add_id(self, conn, skill, resume_id):
+        row = conn.execute('SELECT count, last_id, postings FROM skill_postings WHERE skill = ?', (skill,)).fetchone()
+        if row is None:
+            conn.execute(
+                'INSERT INTO skill_postings (skill, count, last_id, postings) VALUES (?, 1, ?, ?)',
+                (skill, resume_id, encode_postings([resume_id])),
+            )
+            return
+        count, last_id, postings = row
+        if resume_id > last_id:
+            # Fast path: append the gap to the last id
+            postings = bytes(postings) + encode_postings([resume_id - last_id])
+            conn.execute(
+                'UPDATE skill_postings SET count = ?, last_id = ?, postings = ? WHERE skill = ?',
+                (count + 1, resume_id, postings, skill),
+            )
+            return
+        ids = decode_postings(postings)
+        if resume_id in ids:
+            return
+        ids = np.insert(ids, np.searchsorted(ids, resume_id), resume_id)
+        conn.execute(
+            'UPDATE skill_postings SET count = ?, postings = ? WHERE skill = ?',
+            (len(ids), encode_postings(ids), skill),
+        )
+
+    def _remove_id(self, conn, skill, resume_id):
+        row = conn.execute('SELECT postings FROM skill_postings WHERE skill = ?', (skill,)).fetchone()
+        if row is None:
+            return
+        ids = decode_postings(row[0])
+        ids = ids[ids != resume_id]
+        if len(ids) == 0:
+            conn.execute('DELETE FROM skill_postings WHERE skill = ?', (skill,))
+        else:
+            conn.execute(
+                'UPDATE skill_postings SET count = ?, last_id = ?, postings = ? WHERE skill = ?',
+                (len(ids), int(ids[-1]), encode_postings(ids), skill),
+            )
+
+    def postings(self, skill):
+        row = self._connect().execute('SELECT postings FROM skill_postings WHERE skill = ?', (skill,)).fetchone()
+        return decode_postings(row[0]) if row else np.empty(0, dtype=np.int64)
+
+    def __len__(self):
+        row = self._connect().execute('SELECT count FROM skill_postings WHERE skill = ?', (ALL_RESUMES,)).fetchone()
+        return row[0] if row else 0
+
+    def skill_counts(self):
+        """Indexed resumes per skill, most common first."""
+        rows = self._connect().execute(
+            'SELECT skill, count FROM skill_postings WHERE skill != ? ORDER BY count DESC, skill', (ALL_RESUMES,)
+        ).fetchall()
+        return dict(rows)
+
+    def _resolve_terms(self, terms):
+        """
+        Posting list per query term. Taxonomy skills use the index; a
+        semantic equivalent (e.g. "gcp") resolves to the skills it stands
+        for; anything else goes to term_lookup.
+        """
+        taxonomy = self._taxonomy()
+        skills = set(taxonomy.skills)
+        aliases = {}
+        for skill, equivalents in taxonomy.semantic_equivalents.items():
+            for equivalent in (skill,) + equivalents:
+                if skill in skills:
+                    aliases.setdefault(equivalent, set()).add(skill)
+
+        resolved = {}
+        for term in set(terms):
+            if term in skills:
+                resolved[term] = self.postings(term)
+            elif term in aliases:
+                lists = [self.postings(s) for s in sorted(aliases[term])]
+                resolved[term] = np.unique(np.concatenate(lists)) if lists else np.empty(0, dtype=np.int64)
+            elif self.term_lookup is not None:
+                resolved[term] = np.asarray(self.term_lookup(term), dtype=np.int64)
+            else:
+                raise QueryError(f"'{term}' is not an indexed skill")
+        return resolved
+
+    def search(self, query):
+        """Sorted int64 array of resume ids matching a boolean skill query."""
+        tree = parse_query(query)
+        lists = self._resolve_terms(query_terms(tree))
+        universe = None
+
+        def everything():
+            nonlocal universe
+            if universe is None:
+                universe = self.postings(ALL_RESUMES)
+            return universe
+
+        def evaluate(node):
+            kind = node[0]
+            if kind == 'term':
+                return lists[node[1]]
+            if kind == 'not':
+                return np.setdiff1d(everything(), evaluate(node[1]), assume_unique=True)
+            if kind == 'or':
+                result = evaluate(node[1][0])
+                for child in node[1][1:]:
+                    result = np.union1d(result, evaluate(child))
+                return result
+            # AND: intersect the shortest lists first, then subtract exclusions
+            included = sorted((evaluate(child) for child in node[1]), key=len)
+            result = included[0] if included else everything()
+            for ids in included[1:]:
+                if len(result) == 0:
+                    break
+                result = np.intersect1d(result, ids, assume_unique=True)
+            for child in node[2]:
+                if len(result) == 0:
+                    break
+                result = np.setdiff1d(result, evaluate(child), assume_unique=True)
+            return result
+
+        return evaluate(tree)
+
+    def reindex(self, rows):
+        """(Re)index (resume_id, text) pairs, e.g. a whole ResumeCorpus."""
+        count = 0
+        for resume_id, text in rows:
+            self.index_text(resume_id, text)
+            count += 1
+        return count
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_skill_index():
+    """Process-wide SkillIndex over the resume corpus database."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                from src.corpus import get_corpus
+                corpus = get_corpus()
+                _index = SkillIndex(corpus.path, term_lookup=corpus.match_ids)
+    return _index
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rebuild the skill posting-list index from the resume corpus.")
+    parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    from src.corpus import get_corpus
+    count = get_skill_index().reindex(get_corpus().iter_texts())
+    logging.info(f"Indexed skills of {count} resumes")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,281 @@
+import csv
+import hashlib
+import logging
+import math
+import os
+import sys
+import threading
+import time
+from array import array
+from collections import Counter
+from pathlib import Path
+from types import MappingProxyType
+
+from src.matcher import SkillMatcher
+
+DATASETS_DIR = Path(__file__).resolve().parent.parent / 'datasets'
+
+# Taxonomy source files (override the directory with SKILL_TAXONOMY_DIR)
+SKILLS_FILE = 'skills_master.csv'          # skill,category
+CATEGORIES_FILE = 'skill_categories.csv'   # category,weight,bonus
+EQUIVALENTS_FILE = 'skill_equivalents.csv' # skill,equivalent
+
+# Seconds between checks of the source files for changes
+RELOAD_CHECK_INTERVAL = float(os.environ.get('SKILL_TAXONOMY_RELOAD_INTERVAL', '5'))
+
+
+def _read_rows(path):
+    # utf-8-sig tolerates the BOM spreadsheet tools like to add
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        return [
+            {k.strip(): (v or '').strip() for k, v in row.items() if k}
+            for row in csv.DictReader(f)
+        ]
+
+
+class SkillTaxonomy:
+    """
+    Immutable skill taxonomy used by ats_score and category_score.
+
+    Holds the ordered scoring categories with their weights, the skills of
+    each category, the semantic equivalence map and the compiled
+    SkillMatcher. `version` is a content hash of the source files, so
+    anything cached against a taxonomy can be keyed on it.
+
+    Everything is built once and read-only afterwards:
+    - Skill and category strings are interned
+    - Categories have integer ids (their position in `categories`)
+    - `skills` is the table of distinct skills; each category's skills are
+      a range of `category_members` (skill ids) given by `category_offsets`
+    - `category_skills` holds the prebuilt per-category tuples
+    """
+
+    def __init__(self, categories, weights, bonus_categories, category_skills,
+                 semantic_equivalents, version='builtin', sources=()):
+        intern = sys.intern
+        self.categories = tuple(intern(str(cat)) for cat in categories)
+        self.category_ids = MappingProxyType({cat: i for i, cat in enumerate(self.categories)})
+        self.weights = MappingProxyType({intern(str(cat)): weight for cat, weight in weights.items()})
+        self.bonus_categories = frozenset(intern(str(cat)) for cat in bonus_categories)
+
+        skill_ids = {}
+        self.category_offsets = array('I', [0])
+        self.category_members = array('I')
+        for cat in self.categories:
+            for skill in category_skills.get(cat, ()):
+                skill = intern(str(skill))
+                self.category_members.append(skill_ids.setdefault(skill, len(skill_ids)))
+            self.category_offsets.append(len(self.category_members))
+        self.skills = tuple(skill_ids)
+        self.skill_ids = MappingProxyType(skill_ids)
+        self.category_skills = MappingProxyType({
+            cat: tuple(self.skills[i] for i in self.category_skill_ids(cat_id))
+            for cat_id, cat in enumerate(self.categories)
+        })
+        self.semantic_equivalents = MappingProxyType({
+            intern(str(k)): tuple(intern(str(e)) for e in v) for k, v in semantic_equivalents.items()
+        })
+        self.version = version
+        self.sources = tuple(sources)
+        self.matcher = SkillMatcher(
+            [skill for cat in self.categories for skill in self.category_skills[cat]] +
+            [term for key, equivalents in self.semantic_equivalents.items() for term in (key,) + equivalents]
+        )
+        self.stats = TaxonomyStats()
+
+    @classmethod
+    def from_csv(cls, directory=None):
+        """Build a taxonomy from the skills, categories and equivalents CSV files."""
+        directory = Path(directory or os.environ.get('SKILL_TAXONOMY_DIR') or DATASETS_DIR)
+        sources = [directory / SKILLS_FILE, directory / CATEGORIES_FILE, directory / EQUIVALENTS_FILE]
+
+        digest = hashlib.sha256()
+        for path in sources:
+            digest.update(path.name.encode('utf-8'))
+            digest.update(path.read_bytes())
+
+        categories = []
+        weights = {}
+        bonus_categories = set()
+        for row in _read_rows(sources[1]):
+            cat = row['category']
+            if not cat or cat in weights:
+                continue
+            categories.append(cat)
+            weights[cat] = float(row['weight'])
+            if row.get('bonus', '').lower() in ('1', 'true', 'yes'):
+                bonus_categories.add(cat)
+
+        category_skills = {cat: [] for cat in categories}
+        for row in _read_rows(sources[0]):
+            skill = row['skill'].lower()
+            cat = row['category']
+            if skill and cat in category_skills and skill not in category_skills[cat]:
+                category_skills[cat].append(skill)
+
+        semantic_equivalents = {}
+        for row in _read_rows(sources[2]):
+            skill = row['skill'].lower()
+            equivalent = row['equivalent'].lower()
+            if skill and equivalent:
+                semantic_equivalents.setdefault(skill, []).append(equivalent)
+
+        return cls(categories, weights, bonus_categories, category_skills,
+                   semantic_equivalents, version=digest.hexdigest()[:16], sources=sources)
+
+    @classmethod
+    def empty(cls):
+        return cls([], {}, [], {}, {}, version='empty')
+
+    @property
+    def total_weight(self):
+        return math.fsum(self.weights.values())
+
+    def category_skill_ids(self, category_id):
+        """Skill ids (indexes into `skills`) of one category, as an array slice."""
+        return self.category_members[self.category_offsets[category_id]:self.category_offsets[category_id + 1]]
+
+    def scan(self, text):
+        """Scan `text` with the compiled matcher and record hit statistics."""
+        hits = self.matcher.scan(text)
+        self.stats.record(hits)
+        return hits
+
+    def describe(self):
+        """Summary used by the /taxonomy endpoint and reload logging."""
+        return {
+            'version': self.version,
+            'categories': {
+                cat: {
+                    'weight': self.weights[cat],
+                    'bonus': cat in self.bonus_categories,
+                    'skills': len(self.category_skills[cat]),
+                }
+                for cat in self.categories
+            },
+            'terms': len(self.matcher.terms),
+            'sources': [str(p) for p in self.sources],
+        }
+
+
+class TaxonomyStats:
+    """Thread-safe counters of how often taxonomy terms are hit in scanned texts."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.scans = 0
+        self.scans_with_hits = 0
+        self.term_hits = Counter()
+
+    def record(self, hits):
+        found = hits.words
+        with self._lock:
+            self.scans += 1
+            if found:
+                self.scans_with_hits += 1
+                self.term_hits.update(found)
+
+    def snapshot(self, top=20):
+        with self._lock:
+            scans = self.scans
+            return {
+                'scans': scans,
+                'hit_rate': round(self.scans_with_hits / scans, 4) if scans else 0.0,
+                'distinct_terms_hit': len(self.term_hits),
+                'top_terms': [
+                    {'term': term, 'hits': count, 'rate': round(count / scans, 4)}
+                    for term, count in self.term_hits.most_common(top)
+                ],
+            }
+
+
+# ========== PROCESS-WIDE TAXONOMY WITH HOT RELOAD ==========
+
+_lock = threading.Lock()
+_current = None
+_signature = None
+_last_check = 0.0
+_reload_info = {'reloads': 0, 'last_reload_seconds': None, 'last_reload_at': None, 'last_error': None}
+
+
+def _source_signature(directory=None):
+    directory = Path(directory or os.environ.get('SKILL_TAXONOMY_DIR') or DATASETS_DIR)
+    signature = []
+    for name in (SKILLS_FILE, CATEGORIES_FILE, EQUIVALENTS_FILE):
+        try:
+            st = os.stat(directory / name)
+            signature.append((name, st.st_mtime_ns, st.st_size))
+        except OSError:
+            signature.append((name, None, None))
+    return tuple(signature)
+
+
+def _load(signature):
+    global _current, _signature
+    start = time.perf_counter()
+    try:
+        taxonomy = SkillTaxonomy.from_csv()
+    except Exception as e:
+        _reload_info['last_error'] = str(e)
+        if _current is None:
+            logging.error(f"Failed to load skill taxonomy: {e}")
+            _current = SkillTaxonomy.empty()
+        else:
+            logging.error(f"Skill taxonomy reload failed, keeping version {_current.version}: {e}")
+        _signature = signature
+        return
+
+    elapsed = time.perf_counter() - start
+    previous = _current
+    # Swap in the fully built object; readers see either the old or the new taxonomy
+    _current = taxonomy
+    _signature = signature
+    _reload_info['reloads'] += 1
+    _reload_info['last_reload_seconds'] = round(elapsed, 6)
+    _reload_info['last_reload_at'] = time.time()
+    _reload_info['last_error'] = None
+    if previous is None:
+        logging.info(f"Skill taxonomy {taxonomy.version} loaded: {len(taxonomy.matcher.terms)} terms in {elapsed * 1000:.1f} ms")
+    elif previous.version != taxonomy.version:
+        logging.info(f"Skill taxonomy reloaded {previous.version} -> {taxonomy.version} in {elapsed * 1000:.1f} ms")
+
+
+def get_taxonomy():
+    """
+    Return the current process-wide SkillTaxonomy.
+
+    Source files are re-checked at most every RELOAD_CHECK_INTERVAL seconds;
+    when they change, a new taxonomy is built and swapped in atomically so
+    running workers pick up edits without a restart.
+    """
+    global _last_check
+    now = time.monotonic()
+    taxonomy = _current
+    if taxonomy is not None and now - _last_check < RELOAD_CHECK_INTERVAL:
+        return taxonomy
+
+    with _lock:
+        if _current is None or time.monotonic() - _last_check >= RELOAD_CHECK_INTERVAL:
+            signature = _source_signature()
+            if _current is None or signature != _signature:
+                _load(signature)
+            _last_check = time.monotonic()
+        return _current
+
+
+def reload_taxonomy():
+    """Force a reload of the taxonomy from disk. Returns the new taxonomy."""
+    global _last_check
+    with _lock:
+        _load(_source_signature())
+        _last_check = time.monotonic()
+        return _current
+
+
+def taxonomy_report():
+    """Version, reload timings and hit statistics of the current taxonomy."""
+    taxonomy = get_taxonomy()
+    report = taxonomy.describe()
+    report['reload'] = dict(_reload_info)
+    report['stats'] = taxonomy.stats.snapshot()
+    return report
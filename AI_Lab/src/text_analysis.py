@@ -0,0 +1,168 @@
+import re
+from array import array
+
+from src.taxonomy import get_taxonomy
+
+# Same token pattern as scikit-learn's vectorizers, so precomputed terms
+# produce the same TF-IDF vectors as passing the raw text
+TOKEN_RE = re.compile(r"(?u)\b\w\w+\b")
+
+OVERLAP_STOP_WORDS = {'and', 'the', 'is', 'in', 'at', 'of', 'for', 'to', 'a', 'an', 'with', 'by', 'on', 'or', 'but'}
+
+# Common skill spelling variations, applied in order. Each rewrite only runs
+# when its guard substring is present (the pattern cannot match otherwise)
+_VARIATIONS = (
+    ('num', re.compile(r'\bnum\s*py\b'), 'numpy'),
+    ('torch', re.compile(r'\bpy\s*torch\b'), 'pytorch'),
+    ('node', re.compile(r'\bnode\s*\.?\s*js\b'), 'nodejs'),
+    ('+', re.compile(r'\bc\s*\+\s*\+\b'), 'c++'),
+    ('#', re.compile(r'\bc\s*#\b'), 'c#'),
+)
+
+
+def _normalize_lowered(text):
+    for guard, pattern, replacement in _VARIATIONS:
+        if guard in text:
+            text = pattern.sub(replacement, text)
+    return " ".join(text.split())
+
+
+def normalize_text_for_matching(text):
+    """
+    Normalize text for better matching:
+    - Lowercase
+    - Remove special characters (keep alphanumeric and spaces)
+    - Normalize whitespace
+    - Handle common variations (NumPy vs numpy, etc.)
+    """
+    if not text:
+        return ""
+    return _normalize_lowered(text.lower())
+
+
+def overlap_words(text):
+    """Word set used for the keyword overlap score"""
+    return {w for w in text.split() if w not in OVERLAP_STOP_WORDS and len(w) > 2}
+
+
+def tfidf_terms(norm):
+    """TF-IDF terms of a normalized text: vectorizer tokens without English stop words"""
+    from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+
+    return [t for t in TOKEN_RE.findall(norm) if t not in ENGLISH_STOP_WORDS]
+
+
+class TextAnalysis:
+    """
+    One document (resume or JD) analyzed once and shared by every scorer.
+
+    - text: the lowercased document (what category_score scans)
+    - norm: normalize_text_for_matching(text) (what ats_score and TF-IDF use)
+    - overlap: keyword-overlap word set of norm
+    - tokens / offsets: vectorizer tokens of norm and their start offsets
+    - terms: tokens without English stop words, fed to the TF-IDF vectorizers
+    - hits / text_hits: taxonomy matcher scans of norm and text; one scan
+      serves both when they are equal (the usual case for extracted resumes)
+
+    Built for one taxonomy and never modified; every field but `text` is
+    computed on first use. Scorers keep what they derive from it (e.g. the
+    per-skill evidence of src/engine.py) via `part()`, like JDProfile.
+    """
+
+    __slots__ = ('text', 'taxonomy', '_norm', '_overlap', '_tokens', '_offsets', '_terms', '_hits', '_text_hits', '_parts')
+
+    def __init__(self, text, taxonomy):
+        self.text = (text or "").lower()
+        self.taxonomy = taxonomy
+        self._norm = None
+        self._overlap = None
+        self._tokens = None
+        self._offsets = None
+        self._terms = None
+        self._hits = None
+        self._text_hits = None
+        self._parts = {}
+
+    @property
+    def norm(self):
+        if self._norm is None:
+            self._norm = _normalize_lowered(self.text) if self.text else ""
+        return self._norm
+
+    @property
+    def overlap(self):
+        if self._overlap is None:
+            self._overlap = frozenset(overlap_words(self.norm))
+        return self._overlap
+
+    def _tokenize(self):
+        tokens = []
+        offsets = array('I')
+        for match in TOKEN_RE.finditer(self.norm):
+            tokens.append(match.group())
+            offsets.append(match.start())
+        self._offsets = offsets
+        self._tokens = tuple(tokens)
+
+    @property
+    def tokens(self):
+        if self._tokens is None:
+            self._tokenize()
+        return self._tokens
+
+    @property
+    def offsets(self):
+        if self._tokens is None:
+            self._tokenize()
+        return self._offsets
+
+    @property
+    def terms(self):
+        if self._terms is None:
+            from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+
+            self._terms = tuple(t for t in self.tokens if t not in ENGLISH_STOP_WORDS)
+        return self._terms
+
+    @property
+    def hits(self):
+        if self._hits is None:
+            if self._text_hits is not None and self.norm == self.text:
+                self._hits = self._text_hits
+            else:
+                self._hits = self.taxonomy.scan(self.norm)
+        return self._hits
+
+    @property
+    def text_hits(self):
+        if self._text_hits is None:
+            if self._hits is not None and self.norm == self.text:
+                self._text_hits = self._hits
+            else:
+                self._text_hits = self.taxonomy.scan(self.text)
+        return self._text_hits
+
+    def part(self, name, build):
+        """Return the derived value `name`, building it with build(analysis) on first use."""
+        try:
+            return self._parts[name]
+        except KeyError:
+            return self._parts.setdefault(name, build(self))
+
+
+def jd_analysis(profile):
+    """TextAnalysis of a JD, cached on its JDProfile and shared by every scorer"""
+    return profile.part('analysis', lambda p: TextAnalysis(p.text, p.taxonomy))
+
+
+def analyze_text(document, taxonomy=None):
+    """
+    TextAnalysis of a document for `taxonomy` (the current one by default).
+    An analysis built for the same taxonomy is returned as is.
+    """
+    taxonomy = taxonomy or get_taxonomy()
+    if isinstance(document, TextAnalysis):
+        if document.taxonomy is taxonomy:
+            return document
+        document = document.text
+    return TextAnalysis(document, taxonomy)
@@ -0,0 +1,180 @@
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+# Disk cache of extracted resume text, shared by every worker process on the box
+CACHE_DIR = os.environ.get('RESUME_TEXT_CACHE_DIR') or os.path.join(tempfile.gettempdir(), 'ai_lab_text_cache')
+CACHE_MAX_BYTES = int(float(os.environ.get('RESUME_TEXT_CACHE_MAX_MB', '256')) * 1024 * 1024)
+CACHE_ENABLED = os.environ.get('RESUME_TEXT_CACHE', '1').lower() not in ('0', 'false', 'no', 'off')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS extracted_text (
+    key TEXT PRIMARY KEY,
+    text TEXT NOT NULL,
+    warning TEXT,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_extracted_text_last_access ON extracted_text (last_access);
+-- Running total of `size`, kept in step by triggers so writes never sum the table
+CREATE TABLE IF NOT EXISTS cache_meta (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    total_bytes INTEGER NOT NULL
+);
+CREATE TRIGGER IF NOT EXISTS extracted_text_ai AFTER INSERT ON extracted_text BEGIN
+    UPDATE cache_meta SET total_bytes = total_bytes + new.size WHERE id = 1;
+END;
+CREATE TRIGGER IF NOT EXISTS extracted_text_ad AFTER DELETE ON extracted_text BEGIN
+    UPDATE cache_meta SET total_bytes = total_bytes - old.size WHERE id = 1;
+END;
+CREATE TRIGGER IF NOT EXISTS extracted_text_au AFTER UPDATE OF size ON extracted_text BEGIN
+    UPDATE cache_meta SET total_bytes = total_bytes + new.size - old.size WHERE id = 1;
+END;
+-- Caches created before the running total get it seeded once
+INSERT OR IGNORE INTO cache_meta (id, total_bytes)
+    SELECT 1, COALESCE(SUM(size), 0) FROM extracted_text WHERE NOT EXISTS (SELECT 1 FROM cache_meta);
+"""
+
+# Least recently used entries read per eviction query
+EVICT_BATCH = 64
+
+
+class TextCache:
+    """
+    Content-addressed, size-bounded LRU cache of (text, warning) results.
+
+    Backed by SQLite in WAL mode so several worker processes can read and
+    write the same cache file concurrently; each thread uses its own
+    connection. Entries are evicted least-recently-used first once the
+    stored text exceeds `max_bytes`; the stored size is a running total, so
+    writes stay constant-time as the cache grows.
+    """
+
+    def __init__(self, directory=CACHE_DIR, max_bytes=CACHE_MAX_BYTES):
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, 'extracted_text.sqlite3')
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._connect().executescript(f'BEGIN IMMEDIATE; {_SCHEMA} COMMIT;')
+
+    def _connect(self):
+        # Connections are per thread and never reused across a fork
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key):
+        """Return (text, warning) for `key`, or None on a miss."""
+        conn = self._connect()
+        row = conn.execute('SELECT text, warning FROM extracted_text WHERE key = ?', (key,)).fetchone()
+        with self._stats_lock:
+            if row is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        if row is None:
+            return None
+        try:
+            conn.execute('UPDATE extracted_text SET last_access = ? WHERE key = ?', (time.time(), key))
+        except sqlite3.OperationalError as e:
+            # A busy writer elsewhere only costs us LRU precision
+            logging.debug(f"Text cache access update skipped: {e}")
+        return row[0], row[1]
+
+    def put(self, key, text, warning):
+        conn = self._connect()
+        size = len(text.encode('utf-8', errors='ignore')) + len((warning or '').encode('utf-8', errors='ignore'))
+        if size > self.max_bytes:
+            return
+        now = time.time()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            # An upsert (not INSERT OR REPLACE) so the update trigger adjusts the total
+            conn.execute(
+                'INSERT INTO extracted_text (key, text, warning, size, created_at, last_access) '
+                'VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (key) DO UPDATE SET text = excluded.text, '
+                'warning = excluded.warning, size = excluded.size, created_at = excluded.created_at, '
+                'last_access = excluded.last_access',
+                (key, text, warning, size, now, now),
+            )
+            evicted = self._evict(conn)
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        if evicted:
+            with self._stats_lock:
+                self.evictions += evicted
+
+    def _total_bytes(self, conn):
+        return conn.execute('SELECT total_bytes FROM cache_meta WHERE id = 1').fetchone()[0]
+
+    def _evict(self, conn):
+        total = self._total_bytes(conn)
+        evicted = 0
+        while total > self.max_bytes:
+            oldest = conn.execute(
+                'SELECT key, size FROM extracted_text ORDER BY last_access LIMIT ?', (EVICT_BATCH,)
+            ).fetchall()
+            if not oldest:
+                break
+            for key, size in oldest:
+                if total <= self.max_bytes:
+                    break
+                conn.execute('DELETE FROM extracted_text WHERE key = ?', (key,))
+                total -= size
+                evicted += 1
+        return evicted
+
+    def clear(self):
+        self._connect().execute('DELETE FROM extracted_text')
+
+    def stats(self):
+        conn = self._connect()
+        entries = conn.execute('SELECT COUNT(*) FROM extracted_text').fetchone()[0]
+        total = self._total_bytes(conn)
+        with self._stats_lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': entries,
+                'bytes': total,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_text_cache():
+    """Process-wide TextCache, or None when disabled or unavailable."""
+    global _cache, CACHE_ENABLED
+    if not CACHE_ENABLED:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                try:
+                    _cache = TextCache()
+                except Exception as e:
+                    logging.error(f"Resume text cache disabled: {e}")
+                    CACHE_ENABLED = False
+                    return None
+    return _cache
@@ -0,0 +1,132 @@
+import io
+import mmap
+import os
+import shutil
+import tempfile
+import zipfile
+
+# Where uploads are spooled before extraction (default: the system temp dir)
+SPOOL_DIR = os.environ.get('UPLOAD_SPOOL_DIR') or None
+# Chunk size used when copying an upload stream to its spool file
+COPY_CHUNK_SIZE = 1024 * 1024
+
+
+def _is_disk_file(source):
+    """True when `source` is an open regular file whose name is its path"""
+    name = getattr(source, 'name', None)
+    if not isinstance(name, str):
+        return False
+    try:
+        return os.path.samestat(os.fstat(source.fileno()), os.stat(name))
+    except (AttributeError, OSError, ValueError, io.UnsupportedOperation):
+        return False
+
+
+class SpooledUpload:
+    """
+    An uploaded file spooled to disk once and memory-mapped read-only.
+
+    Every extraction step works from the same bytes without copying them
+    into Python: PyMuPDF, pdfplumber, python-docx and PIL open `path`, OCR
+    pool workers receive `path` instead of pickled bytes, and hashing reads
+    `buffer` (a memoryview over the mapping). Files that already live on
+    disk are mapped in place instead of being copied.
+
+    Use as a context manager; the spool file is removed on close.
+    """
+
+    def __init__(self, file):
+        self.filename = (getattr(file, 'filename', None) or getattr(file, 'name', None) or '').lower()
+        self.path = None
+        self.size = 0
+        self._owned = False
+        self._file = None
+        self._mmap = None
+        self.buffer = memoryview(b'')
+
+        source = getattr(file, 'stream', file)
+        if _is_disk_file(source):
+            self.path = source.name
+        else:
+            self._spool(source)
+        self._map()
+
+    def _spool(self, source):
+        if hasattr(source, 'seek'):
+            source.seek(0)
+        suffix = os.path.splitext(self.filename)[1]
+        spool = tempfile.NamedTemporaryFile(prefix='upload_', suffix=suffix, dir=SPOOL_DIR, delete=False)
+        self.path = spool.name
+        self._owned = True
+        try:
+            with spool:
+                probe = source.read(0)
+                if isinstance(probe, str):
+                    # Text streams are rare (tests, CLI); encode them chunk by chunk
+                    while True:
+                        chunk = source.read(COPY_CHUNK_SIZE)
+                        if not chunk:
+                            break
+                        spool.write(chunk.encode('utf-8', errors='ignore'))
+                else:
+                    shutil.copyfileobj(source, spool, COPY_CHUNK_SIZE)
+        except Exception:
+            self.close()
+            raise
+
+    def _map(self):
+        self.size = os.path.getsize(self.path)
+        if self.size == 0:
+            # mmap cannot map empty files
+            return
+        self._file = open(self.path, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.buffer = memoryview(self._mmap)
+
+    def close(self):
+        self.buffer.release()
+        self.buffer = memoryview(b'')
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._owned and self.path:
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+            self._owned = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def iter_zip_uploads(file, max_files, max_member_bytes):
+    """
+    Yield (member_name, SpooledUpload or None, error) for each resume in a
+    zip archive, spooling one member at a time so memory stays bounded.
+    Directories, hidden files and macOS metadata are skipped; members over
+    `max_member_bytes` or past `max_files` are reported with an error.
+    The caller closes each upload.
+    """
+    with zipfile.ZipFile(getattr(file, 'stream', file)) as archive:
+        count = 0
+        for info in archive.infolist():
+            base = os.path.basename(info.filename)
+            if info.is_dir() or not base or base.startswith('.') or info.filename.startswith('__MACOSX/'):
+                continue
+            count += 1
+            if count > max_files:
+                yield info.filename, None, f"Archive has more than {max_files} files"
+                return
+            if info.file_size > max_member_bytes:
+                yield info.filename, None, f"File is larger than {max_member_bytes // (1024 * 1024)} MB"
+                continue
+            with archive.open(info) as member:
+                upload = SpooledUpload(member)
+            yield info.filename, upload, None
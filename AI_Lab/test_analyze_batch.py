@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Test script for the /analyze_batch endpoint
+Validates NDJSON streaming over zip archives and plain files against /analyze
+"""
+
+import sys
+import os
+import io
+import json
+import zipfile
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+JD = "We need a data scientist skilled in Python, SQL, machine learning, TensorFlow and AWS. " * 3
+RESUMES = {
+    'alice.txt': b"Data scientist with Python, SQL, machine learning and TensorFlow experience. " * 5,
+    'bob.txt': b"Frontend developer building React and TypeScript apps with CSS and HTML. " * 5,
+    'carol.txt': b"Cloud engineer running AWS, Docker and Kubernetes with Python automation. " * 5,
+}
+
+def make_zip():
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        for name, data in RESUMES.items():
+            archive.writestr(f"resumes/{name}", data)
+        archive.writestr("__MACOSX/resumes/._alice.txt", b"metadata")
+        archive.writestr("resumes/", b"")
+    buffer.seek(0)
+    return buffer
+
+def test_batch_matches_analyze():
+    """Test that every streamed line equals the single-file /analyze result"""
+    print("🧪 TESTING /analyze_batch NDJSON STREAM")
+    print("=" * 50)
+
+    import app as app_module
+    client = app_module.app.test_client()
+
+    response = client.post('/analyze_batch', data={
+        'jd_text': JD,
+        'resume_files': [(make_zip(), 'resumes.zip'), (io.BytesIO(RESUMES['alice.txt']), 'alice_direct.txt')],
+    })
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    lines = [json.loads(l) for l in response.get_data(as_text=True).splitlines()]
+    assert len(lines) == 4, lines
+    assert sorted(l['index'] for l in lines) == [0, 1, 2, 3]
+
+    for result in lines:
+        name = os.path.basename(result.pop('filename')).replace('_direct', '')
+        result.pop('index')
+        expected = client.post('/analyze', data={
+            'jd_text': JD, 'resume_file': (io.BytesIO(RESUMES[name]), name),
+        }).get_json()
+        assert result == expected, name
+    print(f"✅ PASS: {len(lines)} streamed results match /analyze")
+
+def test_batch_errors():
+    """Test request validation and per-file errors"""
+    print("\n⚠️ TESTING BATCH ERRORS")
+    print("-" * 35)
+
+    import app as app_module
+    client = app_module.app.test_client()
+    assert client.post('/analyze_batch', data={'jd_text': JD}).status_code == 400
+
+    response = client.post('/analyze_batch', data={
+        'jd_text': JD, 'resume_files': [(io.BytesIO(b"not a zip"), 'broken.zip')],
+    })
+    lines = [json.loads(l) for l in response.get_data(as_text=True).splitlines()]
+    assert len(lines) == 1 and lines[0]['success'] is False and lines[0]['filename'] == 'broken.zip'
+    print("✅ PASS: missing fields rejected, broken archive reported in-stream")
+
+if __name__ == "__main__":
+    test_batch_matches_analyze()
+    test_batch_errors()
+
+    print(f"\n🏁 VALIDATION COMPLETE")
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Test script for vectorized batch ATS scoring
+Validates that ats_score_batch returns exactly what ats_score returns per resume
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.ats import ats_score, ats_score_batch
+
+JD = """
+Seeking Senior Machine Learning Engineer with expertise in:
+- Python programming and machine learning frameworks (TensorFlow, PyTorch)
+- Feature engineering and data preprocessing pipelines
+- Model evaluation and optimization techniques
+- Data analysis with pandas/numpy
+- Flask or FastAPI for ML service deployment
+- Docker and container orchestration
+- Cloud platforms (AWS/GCP) preferred but not required
+"""
+
+RESUMES = [
+    """
+    Experienced Machine Learning Engineer with 5 years in AI development.
+    Proficient in Python, TensorFlow, PyTorch, and scikit-learn.
+    Expertise in feature engineering, data preprocessing, and model evaluation.
+    Strong background in data analysis using pandas and numpy.
+    Experience with Flask web frameworks and REST API development.
+    Skilled in Docker containerization and Git version control.
+    """,
+    "Python developer. Flask, Docker, AWS EC2 and S3.",
+    "Pastry chef with ten years of experience in French bakeries and catering.",
+    "",
+    "the and of",
+    """
+    Senior Data Scientist with PhD in Machine Learning.
+    8 years experience in Python, R, and statistical modeling.
+    Expert in feature engineering, predictive analytics, and data visualization.
+    Published researcher in neural networks and deep learning.
+    Strong software engineering background with Git and Docker.
+    Additional cloud experience with AWS EC2 and S3 on GCP too.
+    """ * 3,
+]
+
+def load_dataset_resume():
+    with open(os.path.join(os.path.dirname(__file__), 'datasets', 'resume.txt'), encoding='utf-8') as f:
+        return f.read()
+
+def test_batch_matches_loop():
+    """Test that batch scores equal per-resume ats_score calls"""
+    print("🧪 TESTING BATCH ATS SCORING PARITY")
+    print("=" * 50)
+
+    resumes = RESUMES + [load_dataset_resume()]
+    for jd in (JD, JD.lower(), "python", "no skills mentioned here at all", ""):
+        expected = [ats_score(r, jd) for r in resumes]
+        actual = ats_score_batch(resumes, jd)
+        print(f"  JD {jd[:30]!r}: {actual}")
+        assert actual == expected, (jd, expected, actual)
+
+    assert ats_score_batch([], JD) == []
+    print("✅ PASS: batch scores identical to ats_score")
+
+if __name__ == "__main__":
+    test_batch_matches_loop()
+
+    print(f"\n🏁 VALIDATION COMPLETE")
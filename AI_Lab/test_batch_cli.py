@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Test script for the offline batch scorer (python -m src.batch)
+Validates output rows against ats_score and resuming from the manifest
+"""
+
+import sys
+import os
+import csv
+import tempfile
+from pathlib import Path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.ats import ats_score
+from src.batch import main, run_batch
+
+JD = "Looking for a data scientist with Python, SQL, machine learning, TensorFlow and AWS experience. " * 3
+SKILLS = ["python sql", "react typescript css", "aws docker kubernetes", "tableau excel", "pytorch tensorflow"]
+
+def make_corpus(root):
+    resumes = root / 'resumes'
+    (resumes / 'nested').mkdir(parents=True)
+    texts = {}
+    for i in range(10):
+        name = f"nested/r{i:02d}.txt" if i % 3 == 0 else f"r{i:02d}.txt"
+        text = f"candidate {i} with {SKILLS[i % len(SKILLS)]} and machine learning projects. " * 4
+        (resumes / name).write_text(text)
+        texts[name] = text
+    (resumes / 'notes.md').write_text("ignored")
+    jd = root / 'data_scientist.txt'
+    jd.write_text(JD)
+    return resumes, jd, texts
+
+def read_rows(path):
+    with open(path, newline='') as f:
+        return list(csv.DictReader(f))
+
+def test_batch_csv():
+    """Test one row per resume with the same ATS score as ats_score"""
+    print("🧪 TESTING BATCH CSV OUTPUT")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        resumes, jd, texts = make_corpus(root)
+        output = root / 'scores.csv'
+        assert run_batch(resumes, [jd], output, workers=2, flush_every=3) == 10
+
+        rows = read_rows(output)
+        assert sorted(r['resume'] for r in rows) == sorted(texts)
+        for row in rows:
+            assert row['jd'] == 'data_scientist.txt' and not row['error']
+            assert float(row['ats_score']) == ats_score(texts[row['resume']].lower(), JD.lower())
+            assert 'Core Skills' in row
+        print(f"✅ PASS: {len(rows)} rows match ats_score")
+
+def test_batch_resume():
+    """Test that a crashed run resumes without redoing or duplicating work"""
+    print("\n🔁 TESTING RESUME FROM MANIFEST")
+    print("-" * 35)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        resumes, jd, texts = make_corpus(root)
+        output = root / 'scores.csv'
+        manifest = Path(f"{output}.manifest")
+        run_batch(resumes, [jd], output, workers=2, flush_every=4)
+
+        # Simulate a crash: only the first flush made it into the manifest,
+        # later rows were written but never recorded, and the last line is torn
+        first = manifest.read_text().splitlines()[0]
+        manifest.write_text(first + "\n{\"resumes\": [\"r0")
+        done_first = len(__import__('json').loads(first)['resumes'])
+
+        processed = run_batch(resumes, [jd], output, workers=2, flush_every=4)
+        assert processed == 10 - done_first, processed
+        rows = read_rows(output)
+        assert sorted(r['resume'] for r in rows) == sorted(texts), "no duplicates, nothing lost"
+        assert run_batch(resumes, [jd], output, workers=2) == 0
+        print(f"✅ PASS: resumed after {done_first} resumes, {processed} scored on restart")
+
+        # Output cut short or deleted while the manifest marks resumes done: refuse
+        # to resume instead of silently losing their rows
+        size = output.stat().st_size
+        with open(output, 'r+b') as f:
+            f.truncate(size // 2)
+        for remove in (True, False):
+            try:
+                run_batch(resumes, [jd], output, workers=1)
+            except SystemExit as e:
+                assert 'delete the manifest' in str(e)
+            else:
+                raise AssertionError("resumed over lost rows")
+            if remove:
+                output.unlink()
+        print("✅ PASS: truncated or missing output refused on resume")
+
+def test_retry_errors():
+    """Test that resumes with error rows are retried only with retry_errors"""
+    print("\n🔂 TESTING --retry-errors")
+    print("-" * 35)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        resumes, jd, texts = make_corpus(root)
+        output = root / 'scores.csv'
+        # An unknown backend makes every read fail (main() would reject it up front)
+        assert run_batch(resumes, [jd], output, workers=2, pdf_backend='nope') == 10
+        assert all(r['error'].startswith('read failed') for r in read_rows(output))
+        assert run_batch(resumes, [jd], output, workers=2) == 0, "done resumes are not redone by default"
+
+        assert run_batch(resumes, [jd], output, workers=2, retry_errors=True) == 10
+        rows = read_rows(output)
+        assert sorted(r['resume'] for r in rows if not r['error']) == sorted(texts)
+        assert run_batch(resumes, [jd], output, workers=2, retry_errors=True) == 0, "nothing left to retry"
+        print("✅ PASS: failed resumes retried once with retry_errors")
+
+def test_bad_pdf_backend():
+    """Test that an unknown --pdf-backend is rejected before any work"""
+    print("\n🚫 TESTING --pdf-backend VALIDATION")
+    print("-" * 35)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        resumes, jd, _ = make_corpus(root)
+        output = root / 'scores.csv'
+        try:
+            main([str(resumes), '--jd', str(jd), '-o', str(output), '--pdf-backend', 'pymupfd'])
+        except SystemExit as e:
+            assert e.code == 2
+        else:
+            raise AssertionError("unknown backend accepted")
+        assert not output.exists() and not Path(f"{output}.manifest").exists()
+        print("✅ PASS: unknown backend rejected, nothing written")
+
+if __name__ == "__main__":
+    test_batch_csv()
+    test_batch_resume()
+    test_retry_errors()
+    test_bad_pdf_backend()
+
+    print(f"\n🏁 VALIDATION COMPLETE")
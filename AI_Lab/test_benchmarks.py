@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Test script for the benchmark suite (benchmarks/suite.py)
+Validates a minimal run and the regression check against a baseline
+"""
+
+import sys
+import os
+import json
+import subprocess
+import tempfile
+import threading
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+sys.path.append(os.path.join(os.path.dirname(__file__), 'benchmarks'))
+
+import suite
+
+def test_suite_run():
+    print("🧪 TESTING BENCHMARK SUITE")
+    print("=" * 50)
+
+    threads = set(threading.enumerate())
+    results = suite.run_suite(sizes=('small',), per_size=1, repeat=1)
+    expected = {'normalize_text.small', 'extract.txt.small', 'extract.pdf.small', 'extract.docx.small',
+                'ats_score.small', 'category_score.small', 'analyze.pdf.small'}
+    assert set(results['stages']) == expected, sorted(results['stages'])
+    for stage, r in results['stages'].items():
+        assert r['n'] == 1 and r['p50_ms'] >= 0, (stage, r)
+    json.dumps(results)
+    print(f"✅ PASS: {len(expected)} stages timed")
+
+    started = [t.name for t in set(threading.enumerate()) - threads if t.name.startswith(('job-', 'ocr-probe'))]
+    assert not started, started
+    # --help needs neither PyMuPDF nor python-docx
+    loaded = subprocess.run(
+        [sys.executable, '-c', "import sys; sys.path.insert(0, 'benchmarks'); import suite; "
+                               "print(sorted(m for m in ('fitz', 'docx') if m in sys.modules))"],
+        cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True, check=True,
+    ).stdout.strip()
+    assert loaded == '[]', loaded
+    print("✅ PASS: route benchmark ran without job workers; extraction libraries load on use")
+
+    corpus = suite.build_corpus(('small',), 2, seed=7)
+    again = suite.build_corpus(('small',), 2, seed=7)
+    assert [t for t, _ in corpus['small']] == [t for t, _ in again['small']], "corpus is deterministic"
+    print("✅ PASS: corpus is deterministic for a seed")
+
+def test_compare():
+    print("\n🔍 TESTING REGRESSION CHECK")
+    print("-" * 35)
+
+    baseline = {'stages': {'ats_score.small': {'p50_ms': 10.0}, 'extract.pdf.small': {'p50_ms': 10.0}}}
+    results = {'stages': {'ats_score.small': {'p50_ms': 12.0}, 'extract.pdf.small': {'p50_ms': 14.0},
+                          'new_stage.small': {'p50_ms': 99.0}}}
+
+    regressions = suite.compare(results, baseline, threshold=0.25)
+    assert [r[0] for r in regressions] == ['extract.pdf.small'], regressions
+    print("✅ PASS: only the stage past the threshold fails; stages without a baseline are skipped")
+
+    overrides = suite.parse_overrides(['extract.pdf=0.5', 'ats_score.small=0.1'])
+    regressions = suite.compare(results, baseline, threshold=0.25, overrides=overrides)
+    assert [r[0] for r in regressions] == ['ats_score.small'], regressions
+    print("✅ PASS: per-stage thresholds match by prefix")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'baseline.json')
+        assert suite.main(['--sizes', 'small', '--per-size', '1', '--repeat', '1', '--save-baseline', path]) == 0
+        with open(path) as f:
+            saved = json.load(f)
+        for stage in saved['stages'].values():
+            stage['p50_ms'] = 0.0
+        with open(path, 'w') as f:
+            json.dump(saved, f)
+        assert suite.main(['--sizes', 'small', '--per-size', '1', '--repeat', '1', '--compare', path]) == 1
+    print("✅ PASS: CLI exits 1 on regression")
+
+if __name__ == "__main__":
+    test_suite_run()
+    test_compare()
+
+    print(f"\n🏁 VALIDATION COMPLETE")
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Test script for the unified scoring engine
+Validates that one ScoringEngine pass gives the same ATS score, category
+scores and matched/missing skills as the standalone scorers, and that each
+document's skills are checked only once
+"""
+
+import sys
+import os
+import io
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+import src.engine as engine
+from src.ats import ats_score, category_match_counts
+from src.engine import (ScoringEngine, ats_evidence, bit_skills, category_credit, category_evidence,
+                        has_skill_semantic, score_resume)
+from src.skills import category_score
+from src.taxonomy import get_taxonomy
+from src.text_analysis import analyze_text
+
+RESUMES = [
+    "Machine learning engineer: Python, PyTorch, scikit-learn, pandas, numpy, SQL, Docker and AWS. "
+    "Built REST APIs, feature engineering pipelines and model evaluation dashboards in Tableau. " * 4,
+    "Data analyst with Excel, Power BI, SQL and statistics; A/B testing, ETL and reporting experience.",
+    "Frontend developer.  React,   Node . JS and C # work\nwith Git, CI/CD and Kubernetes",
+    "experience education skills projects",
+    "",
+]
+JD = ("We are hiring a machine learning engineer. Required: Python, SQL, PyTorch or TensorFlow, "
+      "scikit-learn, pandas, Docker, Kubernetes and AWS. Nice to have: Spark, Airflow and Tableau. ") * 2
+
+def test_engine_matches_scorers():
+    print("🧪 TESTING SCORING ENGINE")
+    print("=" * 50)
+
+    for resume in RESUMES:
+        result = score_resume(resume, JD.lower())
+        cat_scores, matched, missing = category_score(resume, JD.lower())
+        assert result.ats_score == ats_score(resume, JD.lower()), resume
+        assert result.category_scores == cat_scores, resume
+        assert sorted(result.matched_skills) == sorted(matched)
+        assert sorted(result.missing_skills) == sorted(missing)
+    print("✅ PASS: score_resume equals ats_score + category_score")
+
+    engine_scores = ScoringEngine(RESUMES[0], JD).score()
+    assert engine_scores == score_resume(analyze_text(RESUMES[0]), JD.lower())
+    print("✅ PASS: raw JD text and resume analyses give the same result")
+
+def test_skill_evidence():
+    print("\n🔎 TESTING SKILL EVIDENCE")
+    print("-" * 35)
+
+    taxonomy = get_taxonomy()
+    for resume in RESUMES:
+        analysis = analyze_text(resume, taxonomy)
+        # Same counts, in the same summation order, as the per-category keyword loops
+        assert category_credit(ats_evidence(analysis), taxonomy) == category_match_counts(analysis.hits, taxonomy)
+        expected = [s for s in taxonomy.skills if has_skill_semantic(analysis.text_hits, s, taxonomy.semantic_equivalents)]
+        assert bit_skills(category_evidence(analysis).bits, taxonomy) == expected
+    print("✅ PASS: evidence reproduces the per-category keyword checks")
+
+    analysis = analyze_text(" ".join(RESUMES[0].lower().split()), taxonomy)
+    assert category_evidence(analysis) is ats_evidence(analysis)
+    print("✅ PASS: one evidence serves both scores when text and norm agree")
+
+def test_single_pass():
+    print("\n⚡ TESTING ONE PASS PER DOCUMENT")
+    print("-" * 35)
+
+    taxonomy = get_taxonomy()
+    score_resume("warm up", JD.lower())  # warm the JD profile
+
+    built = []
+    original = engine.skill_evidence
+    engine.skill_evidence = lambda hits, taxonomy: built.append(hits) or original(hits, taxonomy)
+    try:
+        resume = analyze_text(" ".join(RESUMES[1].lower().split()), taxonomy)
+        scans = taxonomy.stats.scans
+        score_resume(resume, JD.lower())
+        score_resume(resume, JD.lower())
+    finally:
+        engine.skill_evidence = original
+    assert len(built) == 1, len(built)
+    assert taxonomy.stats.scans - scans == 1, taxonomy.stats.scans - scans
+    print("✅ PASS: resume scanned and its skills checked once; JD evidence reused")
+
+    # analyze() front-loads the resume work, so the scores only combine it with the JD
+    expected = score_resume(RESUMES[0], JD.lower())
+    scoring = ScoringEngine(analyze_text(RESUMES[0], taxonomy), JD.lower())
+    scoring.analyze()
+    built.clear()
+    scans = taxonomy.stats.scans
+    engine.skill_evidence = lambda hits, taxonomy: built.append(hits) or original(hits, taxonomy)
+    try:
+        assert scoring.score() == expected
+    finally:
+        engine.skill_evidence = original
+    assert not built and taxonomy.stats.scans == scans, (len(built), taxonomy.stats.scans - scans)
+    print("✅ PASS: analyze() leaves no resume work to the score stages")
+
+def test_analyze_route():
+    print("\n🌐 TESTING /analyze ON THE ENGINE")
+    print("-" * 35)
+
+    import app as app_module
+    client = app_module.app.test_client()
+    response = client.post('/analyze', data={
+        'jd_text': JD,
+        'resume_file': (io.BytesIO(RESUMES[0].encode('utf-8')), 'resume.txt'),
+    })
+    assert response.status_code == 200
+    data = response.get_json()
+    expected = score_resume(RESUMES[0], JD.lower())
+    assert data['ats_score'] == expected.ats_score
+    assert sorted(data['matched_skills']) == sorted(expected.matched_skills)
+    assert sorted(data['missing_skills']) == sorted(expected.missing_skills)
+    print(f"✅ PASS: /analyze reports the engine result (ATS {data['ats_score']}%)")
+
+if __name__ == "__main__":
+    test_engine_matches_scorers()
+    test_skill_evidence()
+    test_single_pass()
+    test_analyze_route()
+
+    print(f"\n🏁 VALIDATION COMPLETE")
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Test script for the corpus-fitted IDF model
+Validates fitting, persistence and its use by ats_score / ats_score_batch
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.idf import IdfModel, iter_corpus
+from src.ats import ats_score, ats_score_batch
+
+DATASETS = os.path.join(os.path.dirname(__file__), 'datasets')
+
+CORPUS = [
+    "Machine learning engineer with Python, TensorFlow and PyTorch experience.",
+    "Data analyst skilled in SQL, Excel, Tableau and statistics.",
+    "Backend developer building REST APIs with Flask, Docker and PostgreSQL.",
+    "Cloud engineer with AWS, Terraform and Kubernetes in production.",
+    "Pastry chef with ten years of experience in French bakeries.",
+]
+
+def test_idf_model_roundtrip():
+    """Test that a fitted model survives save/load unchanged"""
+    print("🧪 TESTING IDF MODEL PERSISTENCE")
+    print("=" * 50)
+
+    model = IdfModel.fit(CORPUS + list(iter_corpus([DATASETS])))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'idf_model.npz')
+        model.save(path)
+        loaded = IdfModel.load(path)
+        print(f"  {len(loaded.terms)} terms, {os.path.getsize(path)} bytes on disk")
+
+    assert loaded.terms == model.terms
+    assert loaded.documents == model.documents
+    assert abs(loaded.idf - model.idf).max() < 1e-6
+    # Rare terms weigh more than common ones
+    vocab = {t: i for i, t in enumerate(model.terms)}
+    assert model.idf[vocab['pastry']] > model.idf[vocab['python']]
+    print("✅ PASS: IDF model persisted and reloaded")
+
+def test_ats_uses_fitted_model():
+    """Test that scoring transforms against the persisted model when present"""
+    print("\n📐 TESTING ATS SCORING WITH FITTED IDF")
+    print("-" * 35)
+
+    resumes = CORPUS + ["", "python python python flask docker aws"]
+    jd = "Looking for a Python machine learning engineer with Flask, Docker and AWS."
+    model = IdfModel.fit(CORPUS)
+
+    old_path = os.environ.get('ATS_IDF_MODEL')
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'idf_model.npz')
+        model.save(path)
+        os.environ['ATS_IDF_MODEL'] = path
+        try:
+            expected = [ats_score(r, jd) for r in resumes]
+            assert ats_score_batch(resumes, jd) == expected
+            print(f"  scores with fitted IDF: {expected}")
+        finally:
+            if old_path is None:
+                os.environ.pop('ATS_IDF_MODEL', None)
+            else:
+                os.environ['ATS_IDF_MODEL'] = old_path
+    print("✅ PASS: single and batch scoring agree with the fitted model")
+
+if __name__ == "__main__":
+    test_idf_model_roundtrip()
+    test_ats_uses_fitted_model()
+
+    print(f"\n🏁 VALIDATION COMPLETE")
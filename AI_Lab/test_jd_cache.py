@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Test script for the JD profile cache
+Validates reuse of preprocessed job descriptions and LRU bookkeeping
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.jd_cache import LRUCache, get_jd_profile, jd_cache_stats, clear_jd_cache
+from src.taxonomy import get_taxonomy
+from src.ats import ats_score
+from src.skills import category_score
+
+RESUME = """
+Experienced Machine Learning Engineer. Python, TensorFlow, PyTorch, pandas, numpy.
+Feature engineering, data preprocessing and model evaluation. Flask, Docker, Git.
+"""
+
+JD = """
+Seeking Machine Learning Engineer: Python, PyTorch, feature engineering,
+model evaluation, pandas/numpy, Flask or FastAPI, Docker, AWS/GCP a plus.
+"""
+
+def test_lru_cache_bookkeeping():
+    """Test hit/miss/eviction counters of the bounded LRU"""
+    print("🧪 TESTING LRU CACHE BOOKKEEPING")
+    print("=" * 50)
+
+    cache = LRUCache(2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1      # 'a' becomes most recent
+    cache.put('c', 3)               # evicts 'b'
+    assert cache.get('b') is None
+    assert cache.get('c') == 3
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['evictions'], stats['size']) == (2, 1, 1, 2)
+    print(f"✅ PASS: {stats}")
+
+def test_jd_profile_reuse():
+    """Test that repeated JDs reuse one profile without changing scores"""
+    print("\n♻️  TESTING JD PROFILE REUSE")
+    print("-" * 35)
+
+    clear_jd_cache()
+    taxonomy = get_taxonomy()
+    first_score = ats_score(RESUME, JD)
+    first_cats = category_score(RESUME, JD.lower(), None)
+    before = jd_cache_stats()
+
+    # Same JD, different casing: same profile
+    assert ats_score(RESUME, JD.upper()) == first_score
+    assert category_score(RESUME, JD.lower(), None)[0] == first_cats[0]
+    after = jd_cache_stats()
+    assert after['hits'] >= before['hits'] + 2
+    assert after['size'] == before['size']
+
+    assert get_jd_profile(JD, taxonomy) is get_jd_profile(JD.lower(), taxonomy)
+    assert get_jd_profile(JD + " kubernetes", taxonomy) is not get_jd_profile(JD, taxonomy)
+    print(f"✅ PASS: {after}")
+
+if __name__ == "__main__":
+    test_lru_cache_bookkeeping()
+    test_jd_profile_reuse()
+
+    print(f"\n🏁 VALIDATION COMPLETE")
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Test script for the asynchronous analysis job queue
+Validates the persistent store, worker processing, retries and the /jobs API
+"""
+
+import sys
+import os
+import io
+import tempfile
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.jobs import JobQueue, JobStore
+
+def test_store_and_queue():
+    """Test submit/claim/complete, failure, retry, lease expiry and pruning"""
+    print("🧪 TESTING JOB STORE AND WORKERS")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = JobStore(directory)
+        calls = []
+
+        def handler(filename, payload, params):
+            calls.append((filename, payload, params))
+            # Jobs flagged to fail only fail on their first attempt
+            if params.get('fail') and sum(c[0] == filename for c in calls) == 1:
+                raise RuntimeError("boom")
+            return {'size': len(payload)}
+
+        queue = JobQueue(store, handler, workers=0)
+        ok_id = store.submit('a.txt', b'hello', {'jd_text': 'jd'})
+        bad_id = store.submit('b.txt', b'world!', {'jd_text': 'jd', 'fail': True})
+        assert store.get(ok_id)['status'] == 'queued'
+
+        assert queue.run_one() and queue.run_one() and not queue.run_one()
+        assert store.get(ok_id)['status'] == 'done'
+        assert store.get(ok_id)['result'] == {'size': 5}
+        failed = store.get(bad_id)
+        assert failed['status'] == 'failed' and failed['error'] == 'boom'
+        print("✅ PASS: jobs processed in order, failure recorded")
+
+        assert not store.retry(ok_id), "finished jobs are not retryable"
+        assert store.retry(bad_id)
+        assert queue.run_one()
+        retried = store.get(bad_id)
+        assert retried['status'] == 'done' and retried['attempts'] == 2
+        print("✅ PASS: failed job retried")
+
+        # Starting another worker process leaves a live job alone; a job whose
+        # owner stopped sending heartbeats is queued again
+        crash_id = store.submit('c.txt', b'x', {'jd_text': 'jd'})
+        claimed = store.claim('other-host:1234')
+        assert claimed['owner'] == 'other-host:1234' and claimed['heartbeat_at']
+        restarted = JobStore(directory)
+        JobQueue(restarted, handler, workers=0).start()
+        assert restarted.get(crash_id)['status'] == 'running'
+        print("✅ PASS: a new worker does not requeue jobs with a live lease")
+
+        assert restarted.requeue_expired(lease=60) == 0
+        assert restarted.requeue_expired(lease=-1) == 1
+        assert restarted.get(crash_id)['status'] == 'queued'
+        assert not store.complete(crash_id, {'size': 1}, 'other-host:1234'), "lease lost"
+        print("✅ PASS: expired lease requeued; the old owner cannot complete it")
+
+        # A job that keeps killing its worker fails once it reaches the attempt cap
+        for attempt in (2, 3):
+            assert store.claim('other-host:1234')['attempts'] == attempt
+            restarted.requeue_expired(lease=-1, max_attempts=3)
+        poisoned = store.get(crash_id)
+        assert poisoned['status'] == 'failed' and '3 attempts' in poisoned['error'], poisoned
+        assert store.retry(crash_id), "still retryable by hand"
+        print("✅ PASS: abandoned jobs fail after the attempt cap")
+
+        assert queue.run_one() and restarted.get(crash_id)['status'] == 'done'
+        assert store.prune(retention_hours=1) == 0
+        assert store.prune(retention_hours=-1) == 3
+        assert store.get(ok_id) is None and store.counts() == {}
+        print("✅ PASS: finished jobs pruned after the retention period")
+
+        # Heartbeats keep a long job's lease alive while it runs
+        def slow(filename, payload, params):
+            time.sleep(1.0)
+            return {}
+
+        live = JobQueue(store, slow, workers=1, poll_interval=0.05, lease=0.3)
+        slow_id = store.submit('d.txt', b'x', {'jd_text': 'jd'})
+        live.start()
+        try:
+            deadline = time.time() + 5
+            while store.get(slow_id)['status'] == 'queued' and time.time() < deadline:
+                time.sleep(0.02)
+            for _ in range(4):
+                time.sleep(0.2)
+                assert restarted.requeue_expired(lease=0.3) == 0
+            while store.get(slow_id)['status'] == 'running' and time.time() < deadline:
+                time.sleep(0.05)
+        finally:
+            live.stop()
+        assert store.get(slow_id)['status'] == 'done' and store.get(slow_id)['attempts'] == 1
+        print("✅ PASS: heartbeats renew the lease of a running job")
+
+        # Idle workers sweep on their own schedule, even when the sweep at start was skipped
+        sweeps = []
+        idle = JobQueue(store, handler, workers=1, poll_interval=0.01, sweep_interval=0.05)
+        idle.sweep = lambda: sweeps.append(time.monotonic())
+        idle.start()
+        time.sleep(0.3)
+        idle.stop()
+        assert len(sweeps) >= 3, sweeps
+        print(f"✅ PASS: idle worker swept {len(sweeps) - 1} times after start")
+
+def test_jobs_api():
+    """Test POST /jobs then polling GET /jobs/<id> until the result is ready"""
+    print("\n🌐 TESTING /jobs API")
+    print("-" * 35)
+
+    import app as app_module
+    assert app_module._job_queue is None, "importing the app must not start job workers"
+    client = app_module.app.test_client()
+    resume = b"Data scientist with Python, SQL, machine learning and TensorFlow experience. " * 5
+    jd = "We need a data scientist skilled in Python, SQL, machine learning, TensorFlow and AWS. " * 3
+
+    response = client.post('/jobs', data={'jd_text': jd, 'resume_file': (io.BytesIO(resume), 'resume.txt')})
+    assert response.status_code == 202, response.get_json()
+    job_id = response.get_json()['job_id']
+
+    deadline = time.time() + 30
+    job = client.get(f'/jobs/{job_id}').get_json()
+    while job['status'] in ('queued', 'running') and time.time() < deadline:
+        time.sleep(0.1)
+        job = client.get(f'/jobs/{job_id}').get_json()
+    assert job['status'] == 'done', job
+
+    expected = client.post('/analyze', data={'jd_text': jd, 'resume_file': (io.BytesIO(resume), 'resume.txt')}).get_json()
+    assert job['result'] == expected
+    assert client.get('/jobs/does-not-exist').status_code == 404
+    assert client.post(f'/jobs/{job_id}/retry').status_code == 409
+    print(f"✅ PASS: job {job_id[:8]} returned the same result as /analyze (ATS {expected['ats_score']}%)")
+
+if __name__ == "__main__":
+    test_store_and_queue()
+    test_jobs_api()
+
+    print(f"\n🏁 VALIDATION COMPLETE")
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Test script for many-to-many resume x JD scoring
+Validates that ats_score_matrix equals ats_score for every pair and that the
+streamed top-k per JD matches a full sort, whatever the chunk sizes
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+import numpy as np
+
+import src.match_matrix as match_matrix
+from src.ats import ats_score
+from src.match_matrix import ResumeSet, ats_score_matrix, iter_top_matches, top_matches_matrix
+from src.idf import get_idf_model
+
+RESUMES = [
+    "Machine learning engineer: Python, PyTorch, scikit-learn, pandas, numpy, SQL, Docker and AWS. "
+    "Built REST APIs, feature engineering pipelines and model evaluation dashboards in Tableau. " * 4,
+    "Data analyst with Excel, Power BI, SQL and statistics; A/B testing, ETL and reporting experience.",
+    "Frontend developer.  React,   Node . JS and C # work\nwith Git, CI/CD and Kubernetes",
+    "Python developer. Flask, Docker, AWS EC2 and S3.",
+    "Pastry chef with ten years of experience in French bakeries and catering.",
+    "experience education skills projects",
+    "the and of",
+    "",
+] * 2
+JDS = [
+    ("We are hiring a machine learning engineer. Required: Python, SQL, PyTorch or TensorFlow, "
+     "scikit-learn, pandas, Docker, Kubernetes and AWS. Nice to have: Spark, Airflow and Tableau. ") * 2,
+    "Data analyst: SQL, Excel, Power BI, statistics and dashboards. " * 4,
+    "Frontend engineer with React and JavaScript",
+    "python",
+    "",
+]
+
+def test_matrix_matches_ats_score():
+    print("🧪 TESTING RESUME x JD SCORE MATRIX")
+    print("=" * 50)
+
+    expected = np.array([[ats_score(r, jd) for jd in JDS] for r in RESUMES])
+    for resume_chunk, jd_chunk in ((None, None), (3, 2), (1, 1)):
+        actual = ats_score_matrix(RESUMES, JDS, resume_chunk=resume_chunk, jd_chunk=jd_chunk)
+        assert actual.shape == (len(RESUMES), len(JDS))
+        assert np.array_equal(actual, expected), (resume_chunk, jd_chunk)
+    print(f"✅ PASS: {len(RESUMES)} x {len(JDS)} matrix identical to ats_score, for any chunking")
+
+def test_streamed_top_k():
+    print("\n🏆 TESTING STREAMED TOP-K PER JD")
+    print("-" * 35)
+
+    expected = ats_score_matrix(RESUMES, JDS)
+    resumes = ResumeSet(RESUMES, idf_model=get_idf_model())
+    for k in (1, 4, len(RESUMES) + 5):
+        streamed = list(iter_top_matches(resumes, JDS, k, resume_chunk=5, jd_chunk=2))
+        assert [j for j, _ in streamed] == list(range(len(JDS)))
+        for j, top in streamed:
+            best = sorted(range(len(RESUMES)), key=lambda i: (-expected[i, j], i))[:k]
+            assert [i for i, _ in top] == best, (k, j, top)
+            assert [s for _, s in top] == [expected[i, j] for i in best]
+    print("✅ PASS: top-k equals a full sort (ties by resume order), across chunk boundaries")
+
+    sparse = top_matches_matrix(resumes, JDS, k=3)
+    assert sparse.shape == (len(JDS), len(RESUMES)) and sparse.nnz == 3 * len(JDS)
+    for j in range(len(JDS)):
+        row = sparse.getrow(j)
+        assert all(expected[i, j] == s for i, s in zip(row.indices, row.data))
+    print("✅ PASS: sparse top-k matrix holds the same scores")
+
+def test_rounded_ties_at_k_boundary():
+    print("\n⚖️ TESTING ROUNDED TIES AT THE TOP-K BOUNDARY")
+    print("-" * 35)
+
+    # Resumes 1-3 all report 90.9; a higher unrounded score must not push a
+    # lower resume index out of the top k
+    unrounded = np.array([[60.0], [90.9], [90.91], [90.94], [40.0]])
+    resumes = ResumeSet(["python"] * len(unrounded), idf_model=get_idf_model())
+    original = match_matrix.score_block
+    match_matrix.score_block = lambda resumes, jds, rows=slice(None), cols=slice(None): unrounded[rows][:, cols]
+    try:
+        for resume_chunk in (None, 1, 2):
+            top = dict(iter_top_matches(resumes, ["python"], k=2, resume_chunk=resume_chunk))[0]
+            assert top == [(1, 90.9), (2, 90.9)], (resume_chunk, top)
+            top = dict(iter_top_matches(resumes, ["python"], k=3, resume_chunk=resume_chunk))[0]
+            assert top == [(1, 90.9), (2, 90.9), (3, 90.9)], (resume_chunk, top)
+    finally:
+        match_matrix.score_block = original
+    print("✅ PASS: tied rounded scores keep the lower resume index, for any chunking")
+
+if __name__ == "__main__":
+    test_matrix_matches_ats_score()
+    test_streamed_top_k()
+    test_rounded_ties_at_k_boundary()
+
+    print(f"\n🏁 VALIDATION COMPLETE")
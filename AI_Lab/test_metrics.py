@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Test script for per-stage timings, the Server-Timing header and /metrics
+Validates histogram buckets, the exposition format and the instrumentation overhead
+"""
+
+import sys
+import os
+import io
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+import src.metrics as metrics
+from src.metrics import Counter, Histogram
+
+JD = "We need a data scientist with Python, SQL, machine learning, pandas and AWS experience. " * 4
+RESUME = b"Data scientist with 5 years of Python, SQL and machine learning. Built pandas pipelines on AWS. " * 5
+
+def test_primitives():
+    print("🧪 TESTING METRIC PRIMITIVES")
+    print("=" * 50)
+
+    hist = Histogram('t_seconds', 'test', ('stage',), buckets=(0.01, 0.1, 1.0))
+    for value in (0.005, 0.01, 0.05, 0.5, 3.0):
+        hist.observe(value, 'read')
+    lines = hist.render()
+    assert 't_seconds_bucket{stage="read",le="0.01"} 2' in lines, lines
+    assert 't_seconds_bucket{stage="read",le="0.1"} 3' in lines, lines
+    assert 't_seconds_bucket{stage="read",le="1.0"} 4' in lines, lines
+    assert 't_seconds_bucket{stage="read",le="+Inf"} 5' in lines, lines
+    assert 't_seconds_count{stage="read"} 5' in lines, lines
+    print("✅ PASS: histogram buckets are cumulative, bounds inclusive")
+
+    counter = Counter('t_total', 'test', ('kind',))
+    counter.inc('a"b')
+    counter.inc('a"b', amount=2)
+    assert counter.value('a"b') == 3
+    assert 't_total{kind="a\\"b"} 3' in counter.render()
+    print("✅ PASS: counters accumulate and escape label values")
+
+    with metrics.collect() as timings:
+        with metrics.stage('read'):
+            pass
+        with metrics.stage('ocr'):
+            pass
+        with metrics.stage('ocr'):
+            pass
+    assert list(timings) == ['read', 'ocr'], timings
+    header = metrics.server_timing({'read': 0.0124, 'ats': 0.003})
+    assert header == 'read;dur=12.4, ats;dur=3.0', header
+    print("✅ PASS: per-request timings merge repeated stages; Server-Timing is in ms")
+
+    n = 20000
+    start = time.perf_counter()
+    with metrics.collect():
+        for _ in range(n):
+            with metrics.stage('overhead'):
+                pass
+    per_stage_us = (time.perf_counter() - start) / n * 1e6
+    assert per_stage_us < 50, per_stage_us
+    print(f"✅ PASS: {per_stage_us:.1f}µs per timed stage")
+
+def test_endpoints():
+    print("\n🌐 TESTING SERVER-TIMING AND /metrics")
+    print("-" * 35)
+
+    import app as app_module
+    client = app_module.app.test_client()
+    before = metrics.FILES_ANALYZED.value('txt')
+    read_before = metrics.STAGE_SECONDS.count('read')
+
+    response = client.post('/analyze', data={'jd_text': JD, 'resume_file': (io.BytesIO(RESUME), 'resume.txt')})
+    assert response.status_code == 200
+    header = response.headers['Server-Timing']
+    stages = [part.split(';')[0] for part in header.split(', ')]
+    for name in ('read', 'analysis', 'ats', 'categories', 'suggestions', 'total'):
+        assert name in stages, header
+    print(f"✅ PASS: Server-Timing: {header}")
+
+    assert metrics.FILES_ANALYZED.value('txt') == before + 1
+    assert metrics.STAGE_SECONDS.count('read') == read_before + 1
+    body = client.get('/metrics')
+    assert body.status_code == 200 and body.mimetype == 'text/plain'
+    text = body.get_data(as_text=True)
+    for needle in ('# TYPE ai_lab_stage_duration_seconds histogram',
+                   'ai_lab_stage_duration_seconds_bucket{stage="total",le="+Inf"}',
+                   'ai_lab_resumes_analyzed_total{file_type="txt"}',
+                   '# TYPE ai_lab_ocr_fallbacks_total counter',
+                   '# TYPE ai_lab_errors_total counter'):
+        assert needle in text, needle
+    print("✅ PASS: /metrics exposes stage histograms and counters")
+
+if __name__ == "__main__":
+    test_primitives()
+    test_endpoints()
+
+    print(f"\n🏁 VALIDATION COMPLETE")
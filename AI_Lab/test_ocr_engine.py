@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Test script for the OCR engine registry and readiness endpoints
+Validates one-time probing, re-checks after failure and /healthz, /readyz
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.ocr import OcrEngine
+
+class FakeTesseract:
+    """Stands in for the tesseract binary and counts version probes"""
+    def __init__(self, installed):
+        self.installed = installed
+        self.version_calls = 0
+
+    def find_command(self):
+        if not self.installed:
+            raise FileNotFoundError("tesseract is not installed or it's not in your PATH")
+        return '/usr/bin/tesseract'
+
+    def run(self, command, *args):
+        if args == ('--version',):
+            self.version_calls += 1
+            return "tesseract 5.3.0\n leptonica-1.82.0\n"
+        return 'List of available languages in "/usr/share/tessdata/" (2):\nosd\neng\n'
+
+def with_fake(fake, fn, engine):
+    engine._find_command, engine._run = fake.find_command, fake.run
+    return fn()
+
+def test_probe_once_when_available():
+    """Test that a healthy engine is probed once and then served from memory"""
+    print("🧪 TESTING OCR ENGINE PROBE CACHING")
+    print("=" * 50)
+
+    fake = FakeTesseract(installed=True)
+    engine = OcrEngine()
+
+    def run():
+        assert all(engine.available() for _ in range(50))
+        return engine.status()
+
+    status = with_fake(fake, run, engine)
+    assert fake.version_calls == 1
+    assert status['version'] == '5.3.0' and status['languages'] == ['eng', 'osd']
+    assert status['command'] == '/usr/bin/tesseract'
+    print(f"✅ PASS: 50 checks, {fake.version_calls} probe")
+
+    # A stand-in `tesseract` script on PATH: the probe runs it directly and
+    # never imports pytesseract (or pandas)
+    import subprocess
+    import tempfile
+    with tempfile.TemporaryDirectory() as directory:
+        script = os.path.join(directory, 'tesseract')
+        with open(script, 'w') as f:
+            f.write('#!/bin/sh\n'
+                    'if [ "$1" = "--version" ]; then echo "tesseract v5.3.0"; echo " leptonica-1.82.0"; '
+                    'else echo "List of available languages (2):"; echo eng; echo fra; fi\n')
+        os.chmod(script, 0o755)
+        code = ("import sys; from src.ocr import OcrEngine; engine = OcrEngine(); engine.probe(); "
+                "status = engine.status(); print(status['version'], ','.join(status['languages']), "
+                "sorted(m for m in ('pytesseract', 'pandas', 'PIL') if m in sys.modules))")
+        env = dict(os.environ, PATH=directory + os.pathsep + os.environ.get('PATH', ''))
+        output = subprocess.run([sys.executable, '-c', code], cwd=os.path.dirname(os.path.abspath(__file__)),
+                                env=env, capture_output=True, text=True, check=True).stdout.strip()
+    assert output == "5.3.0 eng,fra []", output
+    print("✅ PASS: probing runs the binary without importing pytesseract")
+
+def test_recheck_only_after_failure():
+    """Test that a missing binary is re-probed only after the recheck interval"""
+    print("\n🔁 TESTING OCR ENGINE RECHECK")
+    print("-" * 35)
+
+    fake = FakeTesseract(installed=False)
+    engine = OcrEngine(recheck_interval=3600)
+
+    def run():
+        assert not any(engine.available() for _ in range(20))
+        assert fake.version_calls == 0 and engine.probes == 1
+        # Installed later: picked up on the next allowed probe
+        fake.installed = True
+        engine.recheck_interval = 0
+        assert engine.available()
+        assert engine.available()
+        assert fake.version_calls == 1 and engine.probes == 2
+        # A failing OCR call marks the engine down again
+        engine.recheck_interval = 3600
+        engine.mark_failed(RuntimeError("tesseract is not installed"))
+        assert not engine.available()
+
+    with_fake(fake, run, engine)
+    print("✅ PASS: re-probed only after failure")
+
+def test_health_endpoints():
+    """Test /healthz and /readyz responses"""
+    print("\n🩺 TESTING HEALTH ENDPOINTS")
+    print("-" * 35)
+
+    import app as app_module
+    client = app_module.app.test_client()
+    assert client.get('/healthz').status_code == 200
+
+    response = client.get('/readyz')
+    body = response.get_json()
+    assert response.status_code == (200 if body['ocr']['available'] else 503)
+
+    original = app_module.READY_REQUIRES_OCR
+    app_module.READY_REQUIRES_OCR = False
+    try:
+        assert client.get('/readyz').status_code == 200
+    finally:
+        app_module.READY_REQUIRES_OCR = original
+    print(f"✅ PASS: readyz {response.status_code}, ocr available={body['ocr']['available']}")
+
+if __name__ == "__main__":
+    test_probe_once_when_available()
+    test_recheck_only_after_failure()
+    test_health_endpoints()
+
+    print(f"\n🏁 VALIDATION COMPLETE")
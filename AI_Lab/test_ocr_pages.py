@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test script for parallel per-page OCR of scanned PDFs
+Validates that pages fanned out across the OCR pool come back in page order
+and that only pages without a text layer are OCR'd
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+import io
+
+import fitz  # PyMuPDF
+
+import src.ocr as ocr
+from src.reader import _extract_text_uncached
+from src.upload import SpooledUpload
+
+def make_pdf(pages):
+    document = fitz.open()
+    for i in range(pages):
+        document.new_page().insert_text((72, 72), f"page {i}")
+    data = document.tobytes()
+    document.close()
+    return data
+
+def fake_ocr_page(page):
+    """Stand-in for Tesseract: read the text layer back"""
+    return page.get_text().strip()
+
+def test_page_order():
+    """Test that chunked, pooled OCR reassembles pages in order"""
+    print("🧪 TESTING PARALLEL PAGE OCR ORDER")
+    print("=" * 50)
+
+    original_page, original_workers, original_method = ocr._ocr_page, ocr.OCR_WORKERS, ocr.OCR_POOL_START_METHOD
+    ocr._ocr_page = fake_ocr_page
+    # The stand-in is patched into this process only, so pool workers are forked from it here
+    ocr.OCR_POOL_START_METHOD = 'fork'
+    try:
+        pdf_bytes = make_pdf(7)
+        engine = ocr.OcrEngine()
+        for workers in (1, 3):
+            ocr.OCR_WORKERS = workers
+            ocr._reset_pool()
+            texts = engine.ocr_pdf_pages(pdf_bytes)
+            assert texts == [f"page {i}" for i in range(7)], (workers, texts)
+            print(f"✅ PASS: {workers} worker(s) returned 7 pages in order")
+
+        texts = engine.ocr_pdf_pages(pdf_bytes, page_numbers=[5, 1, 3])
+        assert texts == ["page 5", "page 1", "page 3"], texts
+        assert engine.ocr_pdf_pages(pdf_bytes, page_numbers=[]) == []
+        print("✅ PASS: explicit page selections keep the requested order")
+    finally:
+        ocr._reset_pool()
+        ocr._ocr_page, ocr.OCR_WORKERS, ocr.OCR_POOL_START_METHOD = original_page, original_workers, original_method
+
+    # By default workers come from a forkserver (spawn on Windows), never a fork
+    # of this multithreaded process; they import src.ocr themselves
+    try:
+        pool = ocr._get_pool()
+        assert pool._mp_context.get_start_method() in ('forkserver', 'spawn')
+        assert pool.submit(ocr._ocr_pdf_page_range, make_pdf(1), [], None).result(timeout=60) == []
+        print(f"✅ PASS: pool processes started with {pool._mp_context.get_start_method()}")
+    finally:
+        ocr._reset_pool()
+
+def test_selective_page_ocr():
+    """Test that a scanned page appended to a text resume is the only page OCR'd"""
+    print("\n📄 TESTING SELECTIVE PAGE OCR")
+    print("-" * 35)
+
+    document = fitz.open()
+    for i in range(2):
+        document.new_page().insert_text((72, 72), f"text layer page {i} " + "python machine learning " * 4)
+    document.new_page()  # no text layer, stands in for a scanned certificate
+    pdf = io.BytesIO(document.tobytes())
+    pdf.name = "mixed.pdf"
+    document.close()
+
+    engine = ocr.get_ocr_engine()
+    original_page, original_available = ocr._ocr_page, engine._available
+    ocr._ocr_page = lambda page: f"ocr page {page.number} certified scrum master"
+    engine._available = True
+    try:
+        with SpooledUpload(pdf) as upload:
+            text, warning = _extract_text_uncached(upload)
+    finally:
+        ocr._ocr_page, engine._available = original_page, original_available
+
+    assert "text layer page 0" in text and "text layer page 1" in text
+    assert "ocr page 2 certified scrum master" in text
+    assert "ocr page 0" not in text and "ocr page 1" not in text
+    assert text.index("text layer page 1") < text.index("ocr page 2")
+    assert "1 of 3 pages" in warning, warning
+    print(f"✅ PASS: only the image page was OCR'd ({warning})")
+
+if __name__ == "__main__":
+    test_page_order()
+    test_selective_page_ocr()
+
+    print(f"\n🏁 VALIDATION COMPLETE")
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Test script for the OCR image preprocessing stage
+Validates adaptive render DPI, downscaling, binarization and blank-page skipping
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+import fitz  # PyMuPDF
+from PIL import Image, ImageDraw
+
+import src.ocr as ocr
+
+def text_image(size, lines=10):
+    """White page with dark bars standing in for lines of text"""
+    image = Image.new('RGB', size, 'white')
+    draw = ImageDraw.Draw(image)
+    width, height = size
+    line_height = max(2, height // 60)
+    for row in range(lines):
+        top = height // 10 + row * line_height * 3
+        draw.rectangle((width // 10, top, width * 9 // 10, top + line_height), fill='black')
+    return image
+
+def test_render_dpi():
+    """Test that render DPI follows page size"""
+    print("🧪 TESTING ADAPTIVE RENDER DPI")
+    print("=" * 50)
+
+    document = fitz.open()
+    document.new_page(width=612, height=792)
+    document.new_page(width=216, height=360)  # 3x5in card
+    document.new_page(width=2000, height=4000)
+    letter, card, banner = document[0], document[1], document[2]
+    assert ocr.page_render_dpi(letter) == ocr.RENDER_DPI == 72
+    card_dpi = ocr.page_render_dpi(card)
+    assert ocr.RENDER_DPI < card_dpi <= ocr.MAX_RENDER_DPI
+    assert (card.rect.width / 72 * card_dpi) * (card.rect.height / 72 * card_dpi) <= ocr.PAGE_PIXELS
+    banner_dpi = ocr.page_render_dpi(banner)
+    assert banner_dpi <= ocr.RENDER_DPI
+    assert banner.rect.height / 72 * banner_dpi <= ocr.MAX_SIDE
+    document.close()
+    print(f"✅ PASS: letter page at {ocr.RENDER_DPI} DPI, small card at {card_dpi} DPI, banner at {banner_dpi} DPI")
+
+def test_preprocess():
+    """Test grayscale/binarize, downscaling and blank detection"""
+    print("\n🖼️ TESTING IMAGE PREPROCESSING")
+    print("-" * 35)
+
+    processed = ocr.preprocess_for_ocr(text_image((800, 400)))
+    assert processed.mode == 'L'
+    print("✅ PASS: text image sent to Tesseract as grayscale")
+
+    original = ocr.BINARIZE_ENABLED
+    ocr.BINARIZE_ENABLED = True
+    try:
+        processed = ocr.preprocess_for_ocr(text_image((800, 400)))
+    finally:
+        ocr.BINARIZE_ENABLED = original
+    assert processed.mode == '1'
+    assert set(processed.convert('L').getdata()) == {0, 255}
+    print("✅ PASS: text image binarized with OCR_BINARIZE")
+
+    photo = text_image((ocr.MAX_SIDE * 2, ocr.MAX_SIDE))
+    assert max(ocr.preprocess_for_ocr(photo).size) == ocr.MAX_SIDE
+    print("✅ PASS: oversized photo downscaled")
+
+    # A single line of text on a full page is not blank
+    assert ocr.preprocess_for_ocr(text_image((1700, 2200), lines=1)) is not None
+    assert ocr.preprocess_for_ocr(Image.new('RGB', (1700, 2200), 'white')) is None
+    assert ocr.preprocess_for_ocr(Image.new('RGBA', (600, 600), (0, 0, 0, 0))) is None
+    print("✅ PASS: blank and transparent pages skipped")
+
+if __name__ == "__main__":
+    test_render_dpi()
+    test_preprocess()
+
+    print(f"\n🏁 VALIDATION COMPLETE")
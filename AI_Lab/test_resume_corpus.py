@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Test script for the stored resume corpus and BM25 ranking
+Validates incremental indexing, shortlist re-scoring and the /rank endpoint
+"""
+
+import sys
+import os
+import io
+import sqlite3
+import tempfile
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.ats import ats_score
+from src.corpus import ResumeCorpus, jd_query_terms
+
+JD = ("Hiring a machine learning engineer with Python, PyTorch, TensorFlow, SQL and AWS. "
+      "Experience with Docker, Kubernetes and MLOps is a plus.").lower()
+RESUMES = {
+    'ml': "machine learning engineer: python, pytorch, tensorflow, sql, aws, docker, kubernetes, mlops pipelines",
+    'data': "data analyst with sql, excel, tableau and some python scripting for reports",
+    'web': "frontend developer using react, typescript, css and html for web apps",
+    'chef': "head chef managing kitchen staff, menus and food safety",
+}
+
+def test_rank_matches_ats_score():
+    """Test that ranking returns ats_score values in descending order"""
+    print("🧪 TESTING CORPUS RANKING")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as directory:
+        corpus = ResumeCorpus(directory)
+        for name, text in RESUMES.items():
+            corpus.add(text, f"{name}.txt", name)
+        assert len(corpus) == 4
+
+        assert 'pytorch' in jd_query_terms(JD) and 'with' not in jd_query_terms(JD)
+        ranked = corpus.rank(JD, k=3)
+        assert ranked[0]['resume_id'] == 'ml'
+        assert all(r['resume_id'] != 'chef' for r in ranked), "no shared terms, never shortlisted"
+        for r in ranked:
+            assert r['ats_score'] == ats_score(RESUMES[r['resume_id']], JD)
+        assert [r['ats_score'] for r in ranked] == sorted((r['ats_score'] for r in ranked), reverse=True)
+        print(f"✅ PASS: top candidate {ranked[0]['resume_id']} at {ranked[0]['ats_score']}%")
+
+        # Incremental: replacing and removing resumes updates the index immediately
+        corpus.add("pastry chef baking bread", "chef.txt", "chef")
+        corpus.add("senior ml engineer: python pytorch tensorflow aws docker kubernetes mlops sql", "ml2.txt", "ml2")
+        assert len(corpus) == 5
+        assert {r['resume_id'] for r in corpus.rank(JD, k=2)} == {'ml', 'ml2'}
+        assert corpus.remove('ml2') and not corpus.remove('ml2')
+        assert corpus.rank(JD, k=1)[0]['resume_id'] == 'ml'
+        # Same text without an id is stored once
+        first = corpus.add("duplicate resume text")
+        assert corpus.add("duplicate resume text") == first
+        print("✅ PASS: incremental updates, removals and dedup reflected in ranking")
+
+def test_normalized_index():
+    """Test that the index and the JD query share one normalization"""
+    print("\n🔤 TESTING NORMALIZED FULL-TEXT INDEX")
+    print("-" * 35)
+
+    jd = "Backend engineer: Node.js services and PyTorch models"
+    resume = "built node . js apis and trained py torch networks"
+    with tempfile.TemporaryDirectory() as directory:
+        corpus = ResumeCorpus(directory)
+        corpus.add(resume, "variants.txt", "variants")
+        corpus.add("head chef managing kitchen staff", "chef.txt", "chef")
+        assert {'nodejs', 'pytorch'} <= set(jd_query_terms(jd))
+        ranked = corpus.rank(jd, k=5)
+        assert [r['resume_id'] for r in ranked] == ['variants'], ranked
+        assert ranked[0]['ats_score'] == ats_score(resume, jd.lower())
+        assert corpus.match_ids("Py Torch") == corpus.match_ids("pytorch") == [ranked[0]['id']]
+        print("✅ PASS: 'node . js' and 'py torch' resumes found by a Node.js/PyTorch JD")
+
+    # A corpus written before match_text existed is upgraded and reindexed in place
+    with tempfile.TemporaryDirectory() as directory:
+        conn = sqlite3.connect(os.path.join(directory, 'resumes.sqlite3'))
+        conn.executescript("""
+            CREATE TABLE resumes (id INTEGER PRIMARY KEY, external_id TEXT NOT NULL UNIQUE, filename TEXT,
+                                  text TEXT NOT NULL, content_hash TEXT NOT NULL, added_at REAL NOT NULL);
+            CREATE VIRTUAL TABLE resume_fts USING fts5(text, content='resumes', content_rowid='id');
+            CREATE TRIGGER resumes_ai AFTER INSERT ON resumes BEGIN
+                INSERT INTO resume_fts (rowid, text) VALUES (new.id, new.text);
+            END;
+        """)
+        conn.execute("INSERT INTO resumes VALUES (1, 'variants', 'variants.txt', ?, 'hash', 0)", (resume,))
+        conn.commit()
+        conn.close()
+        corpus = ResumeCorpus(directory)
+        assert [r['resume_id'] for r in corpus.rank(jd, k=5)] == ['variants']
+        corpus.remove('variants')
+        assert len(corpus) == 0 and corpus.match_ids("pytorch") == []
+        print("✅ PASS: old corpus upgraded and reindexed on open")
+
+def test_rank_endpoint():
+    """Test adding resumes over HTTP and ranking them"""
+    print("\n🌐 TESTING /corpus/resumes AND /rank")
+    print("-" * 35)
+
+    import app as app_module
+    import src.corpus as corpus_module
+
+    with tempfile.TemporaryDirectory() as directory:
+        original = corpus_module._corpus
+        corpus_module._corpus = ResumeCorpus(directory)
+        try:
+            client = app_module.app.test_client()
+            files = [(io.BytesIO(text.encode() * 3), f"{name}.txt") for name, text in RESUMES.items()]
+            response = client.post('/corpus/resumes', data={'resume_files': files})
+            body = response.get_json()
+            assert response.status_code == 200 and body['corpus_size'] == 4, body
+
+            response = client.post('/rank', json={'jd_text': JD, 'k': 2})
+            candidates = response.get_json()['candidates']
+            assert len(candidates) == 2 and candidates[0]['filename'] == 'ml.txt', candidates
+            assert client.post('/rank', json={}).status_code == 400
+            print(f"✅ PASS: {body['corpus_size']} resumes indexed, top match {candidates[0]['filename']}")
+        finally:
+            corpus_module._corpus = original
+
+if __name__ == "__main__":
+    test_rank_matches_ats_score()
+    test_normalized_index()
+    test_rank_endpoint()
+
+    print(f"\n🏁 VALIDATION COMPLETE")
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Test script for skill bitsets and vectorized category scoring
+Validates the bit layout, the popcount table, and that category_score_batch
+returns exactly what category_score returns for every resume
+"""
+
+import sys
+import os
+import random
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+import numpy as np
+
+from src.engine import bit_skills, bits_of, category_masks, pack_bits, popcount_rows
+from src.skills import category_score, category_score_batch
+from src.taxonomy import get_taxonomy
+
+RESUMES = [
+    "Machine learning engineer: Python, PyTorch, scikit-learn, pandas, numpy, SQL, Docker and AWS. "
+    "Built REST APIs, feature engineering pipelines and model evaluation dashboards in Tableau. " * 4,
+    "Data analyst with Excel, Power BI, SQL and statistics; A/B testing, ETL and reporting experience.",
+    "Frontend developer.  React,   Node . JS and C # work\nwith Git, CI/CD and Kubernetes",
+    "Deep learning researcher (tensorflow, keras, nlp, computer vision) on gcp and azure",
+    "experience education skills projects",
+    "",
+]
+JDS = [
+    ("We are hiring a machine learning engineer. Required: Python, SQL, PyTorch or TensorFlow, "
+     "scikit-learn, pandas, Docker, Kubernetes and AWS. Nice to have: Spark, Airflow and Tableau. ") * 2,
+    "Data analyst: SQL, Excel, Power BI, statistics and dashboards. " * 4,
+    "Frontend engineer with React and JavaScript",
+    "",
+]
+
+def test_bit_layout():
+    print("🧪 TESTING SKILL BITSETS")
+    print("=" * 50)
+
+    rng = random.Random(7)
+    taxonomy = get_taxonomy()
+    width = len(taxonomy.skills)
+    bitsets = [rng.getrandbits(width) for _ in range(50)] + [0, (1 << width) - 1]
+    packed = pack_bits(bitsets, width)
+    assert packed.shape == (len(bitsets), (width + 7) // 8) and packed.dtype == np.uint8
+    assert popcount_rows(packed).tolist() == [b.bit_count() for b in bitsets]
+    for bits, row in zip(bitsets, packed):
+        assert int.from_bytes(row.tobytes(), 'little') == bits
+    assert np.array_equal(np.unpackbits(packed[:1], bitorder='little')[:width],
+                          [(bitsets[0] >> i) & 1 for i in range(width)])
+    print("✅ PASS: bit i is skill id i; packed rows and popcounts agree with Python ints")
+
+    for cat_id, cat in enumerate(taxonomy.categories):
+        mask = category_masks(taxonomy)[cat_id]
+        assert bit_skills(mask, taxonomy) == sorted(taxonomy.category_skills[cat], key=taxonomy.skill_ids.get)
+        assert mask == bits_of(taxonomy.skill_ids[s] for s in taxonomy.category_skills[cat])
+    print(f"✅ PASS: {len(taxonomy.categories)} category masks over {width} skills")
+
+def test_batch_matches_category_score():
+    print("\n📊 TESTING VECTORIZED CATEGORY SCORES")
+    print("-" * 35)
+
+    taxonomy = get_taxonomy()
+    for jd in JDS:
+        batch = category_score_batch(RESUMES, jd)
+        for resume, result in zip(RESUMES, batch):
+            assert result == category_score(resume, jd), (resume, jd)
+            cat_scores, matched, missing = result
+            assert all(type(score) is int for score in cat_scores.values())
+            assert matched == sorted(matched, key=taxonomy.skill_ids.get)
+            assert not set(matched) & set(missing)
+    assert category_score_batch([], JDS[0]) == []
+    print(f"✅ PASS: category_score_batch equals category_score for {len(RESUMES)} resumes x {len(JDS)} JDs")
+
+if __name__ == "__main__":
+    test_bit_layout()
+    test_batch_matches_category_score()
+
+    print(f"\n🏁 VALIDATION COMPLETE")
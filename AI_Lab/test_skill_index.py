@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Test script for the skill posting-list index
+Validates the varint codec, the boolean query parser and search against
+per-resume skill detection
+"""
+
+import sys
+import os
+import io
+import tempfile
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+import numpy as np
+
+from src.corpus import ResumeCorpus
+from src.skill_index import QueryError, SkillIndex, decode_postings, encode_postings, parse_query
+from src.skills import extract_skills
+
+RESUMES = [
+    "senior machine learning engineer: pytorch, python, aws, docker",
+    "junior data scientist with pytorch, python and google cloud",
+    "data analyst: sql, tableau, excel, python",
+    "ml engineer using tensorflow and azure, some pytorch",
+    "backend developer: java, spring, aws, kubernetes",
+]
+
+def test_codec():
+    """Test that posting lists round-trip through the varint encoding"""
+    print("🧪 TESTING POSTING LIST CODEC")
+    print("=" * 50)
+
+    rng = np.random.default_rng(7)
+    for ids in ([], [0], [1, 2, 3], [127, 128, 16383, 16384, 2 ** 40],
+                np.unique(rng.integers(1, 300000, 50000))):
+        ids = np.asarray(ids, dtype=np.int64)
+        assert np.array_equal(decode_postings(encode_postings(ids)), ids)
+    dense = np.arange(1, 200001)
+    assert len(encode_postings(dense)) == len(dense), "consecutive ids cost one byte each"
+    print("✅ PASS: codec round-trips, dense lists take 1 byte per id")
+
+def test_parser():
+    """Test precedence and implicit AND / binary NOT"""
+    print("\n🔣 TESTING QUERY PARSER")
+    print("-" * 35)
+
+    tree = parse_query("pytorch AND (aws OR gcp) NOT junior")
+    assert tree == ('and', [('term', 'pytorch'), ('or', [('term', 'aws'), ('term', 'gcp')])], [('term', 'junior')])
+    assert parse_query("machine learning or sql") == ('or', [('term', 'machine learning'), ('term', 'sql')])
+    assert parse_query('"power bi"') == ('term', 'power bi')
+    for bad in ("", "aws AND", "(aws OR gcp", "aws )"):
+        try:
+            parse_query(bad)
+            assert False, bad
+        except QueryError:
+            pass
+    print("✅ PASS: queries parsed, malformed queries rejected")
+
+def test_search():
+    """Test boolean search against brute-force evaluation of extract_skills"""
+    print("\n🔍 TESTING SKILL SEARCH")
+    print("-" * 35)
+
+    with tempfile.TemporaryDirectory() as directory:
+        corpus = ResumeCorpus(directory)
+        index = SkillIndex(corpus.path, term_lookup=corpus.match_ids)
+        ids = []
+        for text in RESUMES:
+            row_id = corpus.add(text)
+            index.index_text(row_id, text)
+            ids.append(row_id)
+        skills = {row_id: set(extract_skills(text)) for row_id, text in zip(ids, RESUMES)}
+
+        def brute(predicate):
+            return [row_id for row_id in ids if predicate(skills[row_id], RESUMES[ids.index(row_id)])]
+
+        checks = {
+            "pytorch": lambda s, t: 'pytorch' in s,
+            "pytorch AND (aws OR azure)": lambda s, t: 'pytorch' in s and ('aws' in s or 'azure' in s),
+            "pytorch NOT junior": lambda s, t: 'pytorch' in s and 'junior' not in t,
+            "NOT python": lambda s, t: 'python' not in s,
+            "sql OR docker": lambda s, t: 'sql' in s or 'docker' in s,
+        }
+        for query, predicate in checks.items():
+            assert index.search(query).tolist() == brute(predicate), query
+        print(f"✅ PASS: {len(checks)} queries match brute-force evaluation")
+
+        # Re-indexing and removal keep posting lists in step
+        index.index_text(ids[0], "project manager")
+        assert ids[0] not in index.search("pytorch").tolist()
+        assert index.remove(ids[1]) and len(index) == len(ids) - 1
+        assert ids[1] not in index.search("NOT sql").tolist()
+        print("✅ PASS: re-index and removal update postings")
+
+def test_latency():
+    """Test that queries stay in milliseconds at 200k resumes"""
+    print("\n⏱️ TESTING QUERY LATENCY AT 200K RESUMES")
+    print("-" * 35)
+
+    with tempfile.TemporaryDirectory() as directory:
+        index = SkillIndex(os.path.join(directory, 'skills.sqlite3'))
+        rng = np.random.default_rng(1)
+        n = 200000
+        conn = index._connect()
+        for skill, share in (('', 1.0), ('pytorch', 0.2), ('aws', 0.3), ('gcp', 0.1), ('python', 0.6)):
+            ids = np.arange(1, n + 1) if share == 1.0 else np.flatnonzero(rng.random(n) < share) + 1
+            conn.execute('INSERT INTO skill_postings VALUES (?, ?, ?, ?)',
+                         (skill, len(ids), int(ids[-1]), encode_postings(ids)))
+        index.taxonomy = type('T', (), {'skills': ('pytorch', 'aws', 'gcp', 'python'), 'semantic_equivalents': {}})()
+
+        start = time.perf_counter()
+        for _ in range(10):
+            result = index.search("pytorch AND (aws OR gcp) NOT python")
+        took_ms = (time.perf_counter() - start) * 100
+        assert len(result) > 0
+        assert took_ms < 250, took_ms
+        print(f"✅ PASS: {len(result)} hits in {took_ms:.1f} ms per query")
+
+def test_endpoints():
+    """Test /extract_skills indexing and /skills/search"""
+    print("\n🌐 TESTING /extract_skills AND /skills/search")
+    print("-" * 35)
+
+    import app as app_module
+    import src.corpus as corpus_module
+    import src.skill_index as index_module
+
+    with tempfile.TemporaryDirectory() as directory:
+        originals = corpus_module._corpus, index_module._index
+        corpus_module._corpus, index_module._index = ResumeCorpus(directory), None
+        try:
+            client = app_module.app.test_client()
+            for text in RESUMES:
+                body = client.post('/extract_skills', data={'resume_text': text}).get_json()
+                assert body['skills'] == extract_skills(text) and 'id' in body
+            preview = client.post('/extract_skills', data={'resume_text': RESUMES[0], 'index': '0'}).get_json()
+            assert 'id' not in preview
+
+            body = client.get('/skills/search', query_string={'q': 'pytorch NOT junior'}).get_json()
+            assert body['count'] == 2, body
+            assert client.get('/skills/search', query_string={'q': 'aws AND'}).status_code == 400
+            print(f"✅ PASS: {len(RESUMES)} resumes indexed, search returned {body['count']} in {body['took_ms']} ms")
+
+            # The same resume sent as a file and as text is one stored document
+            raw = "Senior  ML Engineer\n\nPyTorch,\tAWS and  Kubernetes\x0c"
+            as_text = client.post('/extract_skills', data={'resume_text': raw}).get_json()
+            as_file = client.post('/extract_skills', data={
+                'resume_file': (io.BytesIO(raw.encode('utf-8')), 'resume.txt')}).get_json()
+            assert as_text['id'] == as_file['id'] and as_text['skills'] == as_file['skills'], (as_text, as_file)
+            print("✅ PASS: resume_text and resume_file normalized alike before indexing")
+        finally:
+            corpus_module._corpus, index_module._index = originals
+
+if __name__ == "__main__":
+    test_codec()
+    test_parser()
+    test_search()
+    test_latency()
+    test_endpoints()
+
+    print(f"\n🏁 VALIDATION COMPLETE")
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Test script for the multi-pattern skill matcher
+Validates that one automaton scan agrees with the per-keyword regex checks
+"""
+
+import sys
+import os
+import re
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.matcher import SkillMatcher
+from src.taxonomy import get_taxonomy
+
+def regex_has_word(text, term):
+    """Reference check used by the scorers before the matcher existed"""
+    return re.search(r'\b' + re.escape(term) + r'\b', text) is not None
+
+def test_word_boundaries():
+    """Test that has_word/contains reproduce regex and substring semantics"""
+    print("🧪 TESTING SKILL MATCHER WORD BOUNDARIES")
+    print("=" * 50)
+
+    terms = ['c++', 'c#', 'ml', 'node.js', 'ci/cd', 'git', 'github', 's3', 'ai']
+    matcher = SkillMatcher(terms)
+    texts = [
+        "built ml pipelines with c++ and c# on aws s3",
+        "mlops engineer, github actions, ci/cd, node.js apis",
+        "email me at ai_lab or see legit projects",
+        "",
+        "git",
+    ]
+
+    for text in texts:
+        hits = matcher.scan(text)
+        for term in terms:
+            assert hits.has_word(term) == regex_has_word(text, term), (text, term)
+            assert hits.contains(term) == (term in text), (text, term)
+    print("✅ PASS: matcher agrees with regex word boundaries and substring checks")
+
+def test_taxonomy_scan():
+    """Test the shared matcher over the full scoring taxonomy"""
+    print("\n🔍 TESTING SHARED TAXONOMY MATCHER")
+    print("-" * 35)
+
+    text = ("senior machine learning engineer: python, pytorch, scikit-learn, "
+            "feature engineering, data transformation, rest api design, "
+            "kubernetes, amazon web services (ec2, s3) and power bi dashboards")
+    taxonomy = get_taxonomy()
+    hits = taxonomy.matcher.scan(text)
+
+    terms = set(taxonomy.skills)
+    terms.update(taxonomy.semantic_equivalents)
+    terms.update(e for equivalents in taxonomy.semantic_equivalents.values() for e in equivalents)
+    for term in terms:
+        assert hits.has_word(term) == regex_has_word(text, term), term
+        assert hits.contains(term) == (term in text), term
+
+    # Terms outside the automaton fall back to a direct check
+    assert hits.has_word('dashboards')
+    assert not hits.has_word('dash')
+    print(f"✅ PASS: {len(terms)} taxonomy terms resolved from a single scan")
+
+if __name__ == "__main__":
+    test_word_boundaries()
+    test_taxonomy_scan()
+
+    print(f"\n🏁 VALIDATION COMPLETE")
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Test script for the data-driven skill taxonomy
+Validates CSV loading, version hashing and hot reload
+"""
+
+import sys
+import os
+import shutil
+import tempfile
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from src import taxonomy as taxonomy_module
+from src.taxonomy import SkillTaxonomy, DATASETS_DIR, SKILLS_FILE, CATEGORIES_FILE, EQUIVALENTS_FILE
+from src.ats import ats_score
+from src.skills import category_score
+
+def copy_taxonomy(target):
+    for name in (SKILLS_FILE, CATEGORIES_FILE, EQUIVALENTS_FILE):
+        shutil.copy(DATASETS_DIR / name, os.path.join(target, name))
+
+def test_taxonomy_from_csv():
+    """Test that the shipped CSV files describe the four scoring categories"""
+    print("🧪 TESTING SKILL TAXONOMY LOADING")
+    print("=" * 50)
+
+    taxonomy = SkillTaxonomy.from_csv(DATASETS_DIR)
+    assert taxonomy.categories == ('Core Skills', 'Tools & Frameworks', 'Data & Analytics', 'Bonus Skills')
+    assert taxonomy.bonus_categories == {'Bonus Skills'}
+    assert abs(taxonomy.total_weight - 1.0) < 1e-9
+    assert 'pandas' in taxonomy.category_skills['Core Skills']
+    assert 'pandas' in taxonomy.category_skills['Data & Analytics']
+    assert 'ml' in taxonomy.semantic_equivalents['machine learning']
+    assert taxonomy.version == SkillTaxonomy.from_csv(DATASETS_DIR).version
+    print(f"✅ PASS: taxonomy {taxonomy.version} with {len(taxonomy.skills)} skills")
+
+def test_taxonomy_hot_reload():
+    """Test that edits to the CSV files are picked up without a restart"""
+    print("\n🔄 TESTING SKILL TAXONOMY HOT RELOAD")
+    print("-" * 35)
+
+    resume = "experienced rust developer building services in rust and python"
+    jd = "we need rust experience and python programming"
+
+    tmp = tempfile.mkdtemp()
+    old_dir = os.environ.get('SKILL_TAXONOMY_DIR')
+    try:
+        copy_taxonomy(tmp)
+        os.environ['SKILL_TAXONOMY_DIR'] = tmp
+        first = taxonomy_module.reload_taxonomy()
+        cat_scores, matched, _ = category_score(resume, jd, None)
+        assert 'rust' not in matched
+
+        with open(os.path.join(tmp, SKILLS_FILE), 'a', encoding='utf-8') as f:
+            f.write("rust,Core Skills\n")
+        # Force the next lookup to re-check the files
+        taxonomy_module._last_check = time.monotonic() - taxonomy_module.RELOAD_CHECK_INTERVAL - 1
+        second = taxonomy_module.get_taxonomy()
+        assert second.version != first.version
+        assert 'rust' in second.category_skills['Core Skills']
+
+        cat_scores, matched, _ = category_score(resume, jd, None)
+        assert 'rust' in matched
+        assert ats_score(resume, jd) >= 15.0
+
+        report = taxonomy_module.taxonomy_report()
+        assert report['version'] == second.version
+        assert report['reload']['last_reload_seconds'] is not None
+        assert report['stats']['scans'] > 0
+        print(f"✅ PASS: reloaded {first.version} -> {second.version}")
+    finally:
+        if old_dir is None:
+            os.environ.pop('SKILL_TAXONOMY_DIR', None)
+        else:
+            os.environ['SKILL_TAXONOMY_DIR'] = old_dir
+        taxonomy_module.reload_taxonomy()
+        shutil.rmtree(tmp, ignore_errors=True)
+
+def test_taxonomy_compact_storage():
+    """Test the interned, id-based and read-only taxonomy tables"""
+    print("\n📦 TESTING COMPACT TAXONOMY STORAGE")
+    print("-" * 35)
+
+    taxonomy = SkillTaxonomy.from_csv(DATASETS_DIR)
+    assert len(set(taxonomy.skills)) == len(taxonomy.skills)
+    for cat_id, cat in enumerate(taxonomy.categories):
+        assert taxonomy.category_ids[cat] == cat_id
+        ids = taxonomy.category_skill_ids(cat_id)
+        assert tuple(taxonomy.skills[i] for i in ids) == taxonomy.category_skills[cat]
+    # Shared skills are stored once and the strings are interned
+    core = taxonomy.category_skills['Core Skills']
+    data = taxonomy.category_skills['Data & Analytics']
+    assert core[core.index('pandas')] is data[data.index('pandas')] is sys.intern('pandas')
+    print(f"✅ PASS: {len(taxonomy.skills)} distinct skills, {len(taxonomy.category_members)} category memberships")
+
+    for mapping in (taxonomy.weights, taxonomy.category_skills, taxonomy.semantic_equivalents, taxonomy.category_ids):
+        try:
+            mapping['new'] = 1
+        except TypeError:
+            continue
+        raise AssertionError("taxonomy tables must be read-only")
+    print("✅ PASS: taxonomy tables are read-only")
+
+    resume = "python developer with pandas, sql and docker experience"
+    jd = "hiring a python engineer who knows pandas, sql, docker and kubernetes"
+    assert category_score(resume, jd) == category_score(resume, jd, None, taxonomy)
+    print("✅ PASS: category_score needs no skills DataFrame")
+
+if __name__ == "__main__":
+    test_taxonomy_from_csv()
+    test_taxonomy_hot_reload()
+    test_taxonomy_compact_storage()
+
+    print(f"\n🏁 VALIDATION COMPLETE")
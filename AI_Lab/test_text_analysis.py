@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Test script for the shared single-pass TextAnalysis
+Validates normalization, tokens and terms against the previous pipeline and
+that scorers sharing one analysis scan the resume once
+"""
+
+import sys
+import os
+import re
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer
+from sklearn.preprocessing import normalize
+
+from src.ats import ats_score, ats_score_batch
+from src.idf import IdfModel
+from src.skills import category_score
+from src.taxonomy import get_taxonomy
+from src.text_analysis import TextAnalysis, analyze_text, normalize_text_for_matching
+
+SAMPLES = [
+    "Built APIs in Node . JS and Node.js; NumPy, Num Py and Py Torch models",
+    "C + +x and C # developer,  lots   of\tspaces\nand C++ / C# mentions",
+    "Python   developer with SQL, pandas, machine learning and AWS experience. " * 3,
+    "",
+    "   ",
+]
+JD = "Looking for a python engineer with pytorch, numpy, sql, docker and node.js experience. " * 3
+
+def legacy_normalize(text):
+    """normalize_text_for_matching before the shared analysis"""
+    if not text:
+        return ""
+    text = text.lower()
+    text = re.sub(r'\bnumpy\b', 'numpy', text)
+    text = re.sub(r'\bnum\s*py\b', 'numpy', text)
+    text = re.sub(r'\bpy\s*torch\b', 'pytorch', text)
+    text = re.sub(r'\bnode\s*\.?\s*js\b', 'nodejs', text)
+    text = re.sub(r'\bc\s*\+\s*\+\b', 'c++', text)
+    text = re.sub(r'\bc\s*#\b', 'c#', text)
+    return " ".join(text.split())
+
+def test_analysis_fields():
+    print("🧪 TESTING TEXT ANALYSIS")
+    print("=" * 50)
+
+    analyzer = CountVectorizer(stop_words='english').build_analyzer()
+    for sample in SAMPLES:
+        analysis = analyze_text(sample)
+        assert analysis.norm == legacy_normalize(sample) == normalize_text_for_matching(sample), sample
+        assert analysis.text == sample.lower()
+        assert [analysis.norm[o:o + len(t)] for t, o in zip(analysis.tokens, analysis.offsets)] == list(analysis.tokens)
+        if analysis.norm:
+            assert list(analysis.terms) == analyzer(analysis.norm), sample
+    print("✅ PASS: normalization, token offsets and TF-IDF terms match the previous pipeline")
+
+    # Extracted resumes arrive lowercased with whitespace collapsed
+    analysis = analyze_text(legacy_normalize(SAMPLES[2]))
+    assert analyze_text(analysis) is analysis
+    assert analysis.text == analysis.norm and analysis.hits is analysis.text_hits
+    print("✅ PASS: one matcher scan serves both scorers when text and norm agree")
+
+def test_scorers_share_analysis():
+    print("\n📊 TESTING SCORERS ON A SHARED ANALYSIS")
+    print("-" * 35)
+
+    taxonomy = get_taxonomy()
+    for sample in SAMPLES:
+        analysis = analyze_text(sample, taxonomy)
+        assert ats_score(analysis, JD.lower()) == ats_score(sample, JD.lower())
+        if sample:
+            assert category_score(analysis, JD.lower()) == category_score(sample, JD.lower())
+    analyses = [analyze_text(s, taxonomy) for s in SAMPLES]
+    assert ats_score_batch(analyses, JD.lower()) == ats_score_batch(SAMPLES, JD.lower())
+    print("✅ PASS: scores are identical for texts and analyses")
+
+    analysis = analyze_text(legacy_normalize(SAMPLES[2]), taxonomy)
+    ats_score(JD, JD.lower())  # warm the JD profile
+    scans = taxonomy.stats.scans
+    ats_score(analysis, JD.lower())
+    category_score(analysis, JD.lower())
+    assert taxonomy.stats.scans - scans == 1, taxonomy.stats.scans - scans
+    print("✅ PASS: resume scanned once for ats_score + category_score")
+
+def test_idf_terms_transform():
+    print("\n🔢 TESTING IDF TRANSFORM FROM TERMS")
+    print("-" * 35)
+
+    docs = [legacy_normalize(s) for s in SAMPLES if s.strip()] + [legacy_normalize(JD)]
+    model = IdfModel.fit(docs)
+    counter = CountVectorizer(stop_words='english', vocabulary=model.vocabulary)
+    expected = normalize(counter.transform(docs).astype(np.float64).multiply(model.idf).tocsr())
+    actual = model.transform_terms([analyze_text(d).terms for d in docs])
+    assert (expected != actual).nnz == 0
+    assert np.array_equal(expected.indices, actual.indices) and np.array_equal(expected.data, actual.data)
+    print("✅ PASS: transform_terms is bit-identical to the vocabulary-bound CountVectorizer")
+
+if __name__ == "__main__":
+    test_analysis_fields()
+    test_scorers_share_analysis()
+    test_idf_terms_transform()
+
+    print(f"\n🏁 VALIDATION COMPLETE")
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Test script for the extracted resume text cache
+Validates content addressing, LRU eviction and multi-process access
+"""
+
+import sys
+import os
+import io
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.text_cache import TextCache
+from src import reader
+
+RESUME = b"""
+Experienced Machine Learning Engineer with 5 years in AI development.
+Proficient in Python, TensorFlow, PyTorch, and scikit-learn.
+Expertise in feature engineering, data preprocessing, and model evaluation.
+"""
+
+def _write_entries(args):
+    directory, worker = args
+    cache = TextCache(directory, max_bytes=1024 * 1024)
+    for i in range(25):
+        cache.put(f"{worker}-{i}", f"text {worker} {i}", None)
+        assert cache.get(f"{worker}-{i}") == (f"text {worker} {i}", None)
+    return worker
+
+def test_text_cache_lru_eviction():
+    """Test size-bounded eviction of least recently used entries"""
+    print("🧪 TESTING TEXT CACHE EVICTION")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = TextCache(tmp, max_bytes=250)
+        cache.put('a', 'x' * 100, None)
+        cache.put('b', 'y' * 100, 'warning')
+        assert cache.get('a') == ('x' * 100, None)   # 'a' is now most recent
+        cache.put('c', 'z' * 100, None)              # over budget: evicts 'b'
+        assert cache.get('b') is None
+        assert cache.get('a') is not None and cache.get('c') is not None
+        stats = cache.stats()
+        assert stats['evictions'] == 1 and stats['bytes'] <= 250
+        print(f"✅ PASS: {stats}")
+
+def test_text_cache_running_total():
+    """Test that the running size total matches the stored entries"""
+    print("\n🧮 TESTING TEXT CACHE SIZE TOTAL")
+    print("-" * 35)
+
+    def stored_bytes(cache):
+        return cache._connect().execute('SELECT COALESCE(SUM(size), 0) FROM extracted_text').fetchone()[0]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = TextCache(tmp, max_bytes=250)
+        for key, text in (('a', 'x' * 100), ('b', 'y' * 60), ('a', 'x' * 40), ('c', 'z' * 120), ('d', 'w' * 90)):
+            cache.put(key, text, None)
+            assert cache.stats()['bytes'] == stored_bytes(cache) <= 250
+        print(f"✅ PASS: total follows inserts, replacements and evictions ({cache.stats()['bytes']} bytes)")
+
+        # A cache written before the total existed is seeded from its entries
+        conn = cache._connect()
+        conn.execute('DROP TABLE cache_meta')
+        reopened = TextCache(tmp, max_bytes=250)
+        assert reopened.stats()['bytes'] == stored_bytes(reopened) > 0
+        reopened.clear()
+        assert reopened.stats()['bytes'] == 0
+        print("✅ PASS: existing caches seeded once; clear() resets the total")
+
+def test_text_cache_concurrent_processes():
+    """Test that several worker processes can share one cache file"""
+    print("\n🔀 TESTING TEXT CACHE ACROSS PROCESSES")
+    print("-" * 35)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with ProcessPoolExecutor(max_workers=4) as pool:
+            done = list(pool.map(_write_entries, [(tmp, w) for w in range(4)]))
+        assert sorted(done) == [0, 1, 2, 3]
+        assert TextCache(tmp).stats()['entries'] == 100
+    print("✅ PASS: 4 processes wrote and read 100 entries")
+
+def test_extraction_served_from_cache():
+    """Test that re-uploading the same bytes returns the cached result"""
+    print("\n📄 TESTING CACHED RESUME EXTRACTION")
+    print("-" * 35)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = TextCache(tmp)
+        original = reader.get_text_cache
+        reader.get_text_cache = lambda: cache
+        try:
+            first = io.BytesIO(RESUME)
+            first.name = 'resume.txt'
+            result = reader.extract_text_from_resume(first)
+
+            again = io.BytesIO(RESUME)
+            again.name = 'other_name.txt'
+            assert reader.extract_text_from_resume(again) == result
+            assert cache.stats()['hits'] == 1
+
+            changed = io.BytesIO(RESUME + b" Docker.")
+            changed.name = 'resume.txt'
+            assert reader.extract_text_from_resume(changed)[0].endswith('docker.')
+            assert cache.stats()['misses'] == 2
+        finally:
+            reader.get_text_cache = original
+    print(f"✅ PASS: {result[0][:40]!r}...")
+
+if __name__ == "__main__":
+    test_text_cache_lru_eviction()
+    test_text_cache_running_total()
+    test_text_cache_concurrent_processes()
+    test_extraction_served_from_cache()
+
+    print(f"\n🏁 VALIDATION COMPLETE")
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Test script for spooled, memory-mapped uploads
+Validates spooling, in-place mapping of files on disk and cleanup
+"""
+
+import sys
+import os
+import io
+import tempfile
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+import docx
+from werkzeug.datastructures import FileStorage
+
+from src.reader import extract_text_from_resume
+from src.upload import SpooledUpload
+
+def test_spooling():
+    """Test that streams are spooled once, mapped, and removed on close"""
+    print("🧪 TESTING UPLOAD SPOOLING")
+    print("=" * 50)
+
+    data = b"python sql " * 100000
+    storage = FileStorage(stream=io.BytesIO(data), filename="Resume.TXT")
+    with SpooledUpload(storage) as upload:
+        assert upload.filename == "resume.txt"
+        assert upload.path.endswith(".txt") and os.path.exists(upload.path)
+        assert upload.size == len(data) and upload.buffer == data
+        path = upload.path
+    assert not os.path.exists(path)
+    print("✅ PASS: Werkzeug upload spooled, mapped and cleaned up")
+
+    with SpooledUpload(io.StringIO("plain text resume")) as upload:
+        assert bytes(upload.buffer) == b"plain text resume"
+    with SpooledUpload(io.BytesIO(b"")) as upload:
+        assert upload.size == 0 and bytes(upload.buffer) == b""
+    print("✅ PASS: text streams and empty uploads handled")
+
+    with tempfile.NamedTemporaryFile(suffix=".txt", delete=False) as f:
+        f.write(b"already on disk")
+    try:
+        with open(f.name, 'rb') as handle, SpooledUpload(handle) as upload:
+            assert upload.path == f.name and upload.buffer == b"already on disk"
+        assert os.path.exists(f.name), "files on disk are mapped in place, never deleted"
+    finally:
+        os.unlink(f.name)
+    print("✅ PASS: files on disk mapped in place")
+
+def test_docx_from_spool():
+    """Test DOCX extraction from the spooled path"""
+    print("\n📄 TESTING DOCX FROM SPOOL")
+    print("-" * 35)
+
+    document = docx.Document()
+    document.add_paragraph("Machine learning engineer with PyTorch and Kubernetes")
+    buffer = io.BytesIO()
+    document.save(buffer)
+    buffer.seek(0)
+    buffer.name = "resume.docx"
+
+    text, _ = extract_text_from_resume(buffer)
+    assert text == "machine learning engineer with pytorch and kubernetes", text
+    print("✅ PASS: DOCX read from the spooled upload")
+
+if __name__ == "__main__":
+    test_spooling()
+    test_docx_from_spool()
+
+    print(f"\n🏁 VALIDATION COMPLETE")